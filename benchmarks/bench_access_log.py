@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: bench_access_log.py
+# Project: SSH-Sentinel
+# File Created: Sunday, 18th October 2026 11:48:15 pm
+# Author: Daniel Rodríguez Cabrera (daniel8rc@gmail.com)
+# Version: 1.0.0
+# -----
+# Last Modified: Sunday, 18th October 2026 11:48:15 pm
+# Modified By: Daniel Rodríguez Cabrera
+# -----
+# Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
+###
+"""
+Micro-benchmark de la analítica de logs de acceso.
+
+Mide, por formato, el coste por petición de analizar lotes de líneas en
+columnas (parse_access_lines) y de agregarlas en la ventana deslizante
+(AccessStats), y lo compara con el ritmo que tiene que aguantar, después de
+comprobar el análisis con líneas reales (User-Agent de navegador). Incluye
+como referencia la versión ingenua: un diccionario por línea que se suma a
+mano a los contadores y latencias ordenadas para los percentiles.
+
+Uso: python benchmarks/bench_access_log.py [--rate 10000] [--batch 500]
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.access_log import AccessStats, parse_access_lines  # noqa: E402
+
+BROWSER_UA = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/130.0.0.0 Safari/537.36"
+)
+PATHS = ["/", "/login", "/api/orders/{}", "/api/users/{}/cart", "/static/app.js", "/health"]
+STATUSES = [200] * 40 + [304] * 5 + [404] * 3 + [500, 502]
+
+
+def make_request():
+    path = random.choice(PATHS).format(random.randint(1, 100_000))
+    return path, random.choice(STATUSES), random.randint(0, 50_000), random.expovariate(50)
+
+
+def combined_line(path, status, size, latency):
+    return (
+        f'10.0.3.7 - - [18/Oct/2026:23:48:15 +0200] "GET {path}?page=2 HTTP/1.1" '
+        f'{status} {size} "-" "{BROWSER_UA}" rt={latency * 1.1:.3f} urt="{latency:.3f}"'
+    )
+
+
+def check_parsing():
+    """
+    Comprueba lo básico antes de medir: la latencia sale del campo que toca
+    y nunca de los números de versión del User-Agent, y los estados fuera
+    de rango cuentan como líneas no reconocidas.
+    """
+    stock = f'10.0.3.7 - - [18/Oct/2026:23:48:15 +0200] "GET / HTTP/1.1" 200 612 "-" "{BROWSER_UA}"'
+    columns = parse_access_lines([
+        stock,
+        stock + " 0.250",
+        combined_line("/", 200, 10, 0.042),
+        stock.replace(" 200 ", " 000 "),
+        stock.replace(" 200 ", " 999 "),
+        '{"status": 70000, "request": "GET / HTTP/1.1"}',
+        '{"status": 503, "request": "GET / HTTP/1.1", "request_time": "0.5"}',
+    ])
+    assert list(columns.latencies) == [-1.0, 0.25, 0.042, 0.5], list(columns.latencies)
+    assert list(columns.statuses) == [200, 200, 200, 503], list(columns.statuses)
+    assert columns.unparsed == 3, columns.unparsed
+    named = parse_access_lines([combined_line("/", 200, 10, 0.042)], latency_field="rt")
+    assert list(named.latencies) == [0.046], list(named.latencies)
+
+
+def json_line(path, status, size, latency):
+    return json.dumps({
+        "time": "2026-10-18T23:48:15+02:00", "request": f"GET {path} HTTP/1.1",
+        "status": status, "body_bytes_sent": size, "upstream_response_time": f"{latency:.3f}",
+    })
+
+
+NAIVE = re.compile(r'^\S+ \S+ \S+ \[([^\]]*)\] "(\S+) (\S+)[^"]*" (\d{3}) (\d+|-).*?urt="?([\d.]+)')
+
+
+def naive(lines):
+    """
+    Referencia: cada línea a un diccionario y sumada a mano a los contadores.
+    """
+    statuses, paths, latencies = {}, {}, []
+    for line in lines:
+        match = NAIVE.match(line)
+        if match:
+            record = {
+                "path": match.group(3).split("?")[0], "status": int(match.group(4)),
+                "bytes": int(match.group(5)), "latency": float(match.group(6)),
+            }
+            statuses[record["status"]] = statuses.get(record["status"], 0) + 1
+            paths[record["path"]] = paths.get(record["path"], 0) + 1
+            latencies.append(record["latency"])
+    latencies.sort()
+
+
+def measure(run, batches, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        run(batches)
+        best = min(best, time.perf_counter() - begin)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rate", type=float, default=10_000, help="peticiones/s a soportar")
+    parser.add_argument("--batch", type=int, default=500, help="líneas por trozo leído")
+    parser.add_argument("--requests", type=int, default=200_000)
+    args = parser.parse_args()
+
+    check_parsing()
+    requests = [make_request() for _ in range(args.requests)]
+    print(f"{args.requests:,} peticiones en trozos de {args.batch}\n")
+    print(f"{'Proceso':<40}{'µs/petición':>12}{'peticiones/s':>15}{'% núcleo':>10}")
+
+    for name, make in (("combined", combined_line), ("JSON", json_line)):
+        lines = [make(*request) for request in requests]
+        batches = [lines[i:i + args.batch] for i in range(0, len(lines), args.batch)]
+
+        def parse_only(batches):
+            for batch in batches:
+                parse_access_lines(batch)
+
+        def parse_and_aggregate(batches):
+            stats = AccessStats()
+            # Unos 20 trozos por segundo simulado: la ventana va expirando
+            for second, batch in enumerate(batches):
+                stats.add(parse_access_lines(batch), now=1_000_000 + second / 20)
+            stats.snapshot(now=1_000_000 + len(batches) / 20)
+
+        runs = [(f"{name}: análisis en columnas", parse_only),
+                (f"{name}: análisis + ventana", parse_and_aggregate)]
+        if name == "combined":
+            runs.insert(0, (f"{name}: dict por línea + agregación", lambda b: naive(lines)))
+        for label, run in runs:
+            per_request = measure(run, batches) / len(lines)
+            print(
+                f"{label:<40}{per_request * 1e6:>12.2f}{1 / per_request:>15,.0f}"
+                f"{args.rate * per_request * 100:>9.1f}%"
+            )
+
+    stats = AccessStats()
+    stats.add(parse_access_lines([combined_line(*request) for request in requests[:10_000]]))
+    timer = time.perf_counter()
+    for _ in range(100):
+        stats.snapshot()
+    print(f"\nsnapshot() con la ventana llena: {(time.perf_counter() - timer) * 10:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
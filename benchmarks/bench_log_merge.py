@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: bench_log_merge.py
+# Project: SSH-Sentinel
+# File Created: Sunday, 18th October 2026 10:05:33 pm
+# Author: Daniel Rodríguez Cabrera (daniel8rc@gmail.com)
+# Version: 1.0.0
+# -----
+# Last Modified: Sunday, 18th October 2026 10:05:33 pm
+# Modified By: Daniel Rodríguez Cabrera
+# -----
+# Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
+###
+"""
+Micro-benchmark de la vista combinada de logs.
+
+Mide el coste por línea de extraer la marca de tiempo en cada formato
+soportado y de mezclar varios orígenes con LogMerger, y lo compara con el
+ritmo conjunto de líneas que tendría que aguantar.
+
+Uso: python benchmarks/bench_log_merge.py [--sources 4] [--rate 5000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.log_merge import LogMerger, TimestampParser  # noqa: E402
+
+SAMPLES = {
+    "ISO 8601 (journal)": "2026-10-18T21:12:40.123456+0200 web1 app[812]: GET /api/orders 200",
+    "syslog": "Oct 18 21:12:40 web1 sshd[1021]: Accepted publickey for deploy",
+    "nginx error": "2026/10/18 21:12:40 [error] 31#31: *7 upstream timed out",
+    "combined": '10.0.3.7 - - [18/Oct/2026:21:12:40 +0200] "GET / HTTP/1.1" 200 612 "-" "curl"',
+    "JSON": '{"time":"2026-10-18T19:12:40.5Z","level":"info","msg":"request done"}',
+}
+
+
+def make_lines(count, source):
+    """
+    Líneas ISO con marcas crecientes y algo de desorden, como un log real.
+    """
+    start = time.time()
+    lines = []
+    for i in range(count):
+        stamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(start + i / 1000))
+        micros = random.randint(0, 999_999)
+        lines.append((f"{stamp}.{micros:06d}Z host svc{source}: mensaje {i}", i))
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sources", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=5000, help="líneas/s de cada origen")
+    parser.add_argument("--lines", type=int, default=50_000, help="líneas por origen")
+    parser.add_argument("--number", type=int, default=50_000)
+    args = parser.parse_args()
+
+    print(f"{'Formato':<28}{'µs/línea':>12}{'líneas/s':>14}")
+    for name, line in SAMPLES.items():
+        timestamp = TimestampParser()
+        timer = timeit.Timer(lambda: timestamp.parse(line))
+        best = min(timer.repeat(repeat=5, number=args.number)) / args.number
+        print(f"{name:<28}{best * 1e6:>12.2f}{1 / best:>14,.0f}")
+
+    streams = [make_lines(args.lines, source) for source in range(args.sources)]
+    best = float("inf")
+    for _ in range(3):
+        merger = LogMerger(args.sources)
+        begin = time.perf_counter()
+        # Lotes pequeños intercalados, como llegan de los lectores
+        for offset in range(0, args.lines, 200):
+            for source, lines in enumerate(streams):
+                merger.push(source, lines[offset:offset + 200])
+            merger.pop_ready()
+        merger.pop_ready(flush=True)
+        best = min(best, time.perf_counter() - begin)
+    per_line = best / (args.lines * args.sources)
+    print(f"\n{'push + pop_ready':<28}{per_line * 1e6:>12.2f}{1 / per_line:>14,.0f}")
+
+    rate = args.sources * args.rate
+    print(
+        f"{args.sources} orígenes a {args.rate:,.0f} líneas/s = {rate:,.0f} líneas/s "
+        f"-> {rate * per_line * 100:.1f} % de un núcleo"
+    )
+
+
+if __name__ == "__main__":
+    main()
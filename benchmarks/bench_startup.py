@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: bench_startup.py
+# Project: SSH-Sentinel
+# File Created: Sunday, 18th October 2026 3:02:48 pm
+# Author: Daniel Rodríguez Cabrera (daniel8rc@gmail.com)
+# Version: 1.0.0
+# -----
+# Last Modified: Sunday, 18th October 2026 3:02:48 pm
+# Modified By: Daniel Rodríguez Cabrera
+# -----
+# Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
+###
+"""
+Benchmark del arranque de la aplicación.
+
+Cada medida se hace en un proceso nuevo: el perfil de importación de main
+(python -X importtime) con los módulos más costosos y, si hay pantalla, el
+tiempo hasta que se dibuja la primera ventana. Con --budget-ms el script
+termina con error si la importación supera el presupuesto.
+
+Uso: python benchmarks/bench_startup.py [--runs 5] [--top 15] [--budget-ms 400]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Módulos que no deberían cargarse al arrancar
+LAZY_MODULES = ("paramiko", "sqlite3", "watchdog", "curses", "screens.log_viewer")
+
+# Arranca MainApp y termina en cuanto la primera ventana se ha dibujado
+_FIRST_WINDOW = """
+import os
+import time
+start = time.perf_counter()
+import customtkinter
+def mainloop(self, *args, **kwargs):
+    self.update()
+    print(time.perf_counter() - start)
+    self.destroy()
+customtkinter.CTk.mainloop = mainloop
+import main
+if not os.path.exists(os.path.join(os.path.dirname(main.__file__), "config.json")):
+    main.MainApp.load_config = lambda self, file_name: {"servers": []}
+main.MainApp()
+"""
+
+
+def python(*args):
+    return subprocess.run(
+        [sys.executable, *args], cwd=ROOT, capture_output=True, text=True
+    )
+
+
+def import_profile():
+    """
+    [(acumulado en µs, módulo)] de una importación de main en un proceso limpio.
+    """
+    result = python("-X", "importtime", "-c", "import main")
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    profile = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            profile.append((int(cumulative), name.strip()))
+    return profile
+
+
+def first_window_time():
+    result = python("-c", _FIRST_WINDOW)
+    if result.returncode != 0:
+        return None
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    profiles = [import_profile() for _ in range(args.runs)]
+    totals = [dict((name, us) for us, name in profile)["main"] for profile in profiles]
+    total_ms = statistics.median(totals) / 1000
+
+    print(f"Importación de main (mediana de {args.runs}): {total_ms:.1f} ms\n")
+    print(f"{'Módulo':<50}{'ms acumulados':>14}")
+    for us, name in sorted(profiles[-1], reverse=True)[1 : args.top + 1]:
+        print(f"{name:<50}{us / 1000:>14.1f}")
+
+    loaded = {name for _, name in profiles[-1]}
+    eager = [name for name in LAZY_MODULES if name in loaded]
+    print(f"\nMódulos diferidos cargados al arrancar: {', '.join(eager) or 'ninguno'}")
+
+    if os.environ.get("DISPLAY") or sys.platform in ("win32", "darwin"):
+        times = [t for t in (first_window_time() for _ in range(args.runs)) if t is not None]
+        if times:
+            print(f"Tiempo hasta la primera ventana (mediana): {statistics.median(times) * 1000:.1f} ms")
+        else:
+            print("No se pudo abrir la ventana")
+    else:
+        print("Sin pantalla: se omite el tiempo hasta la primera ventana")
+
+    if args.budget_ms is not None and (total_ms > args.budget_ms or eager):
+        print(f"\nPresupuesto de arranque superado ({args.budget_ms:.0f} ms)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: bench_stream_reader.py
+# Project: SSH-Sentinel
+# File Created: Sunday, 18th October 2026 10:58:06 pm
+# Author: Daniel Rodríguez Cabrera (daniel8rc@gmail.com)
+# Version: 1.0.0
+# -----
+# Last Modified: Sunday, 18th October 2026 10:58:06 pm
+# Modified By: Daniel Rodríguez Cabrera
+# -----
+# Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
+###
+"""
+Micro-benchmark de la lectura de streams de log.
+
+Compara, sobre un par de sockets locales que hacen de canal SSH, la lectura
+línea a línea con readline() y la del StreamReader (recv por trozos y
+partición en bloque), con y sin clasificar las líneas por severidad. Mide
+las líneas por segundo y la CPU consumida por línea. El readline de un
+fichero de socket está escrito en C: el de paramiko (ChannelFile), en
+Python, es bastante más lento, así que la diferencia real es mayor.
+
+Uso: python benchmarks/bench_stream_reader.py [--lines 500000] [--streams 4]
+"""
+import argparse
+import os
+import socket
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.log_severity import SeverityClassifier  # noqa: E402
+from utils.stream_reader import StreamReader  # noqa: E402
+
+LINE = (
+    b"2026-10-18T22:58:06.123456+0200 web1 app[812]: "
+    b"GET /api/v1/orders?id=12345 200 0.012s request_id=9f2c1ab7\n"
+)
+
+
+class SocketChannel:
+    """
+    Lo mínimo de un canal de paramiko sobre un socket local.
+    """
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.closed = False
+
+    def fileno(self):
+        return self.sock.fileno()
+
+    def settimeout(self, timeout):
+        self.sock.setblocking(False)
+
+    def recv_stderr_ready(self):
+        return False
+
+    def recv(self, nbytes):
+        try:
+            return self.sock.recv(nbytes)
+        except BlockingIOError:
+            raise socket.timeout()
+
+    def close(self):
+        self.closed = True
+        self.sock.close()
+
+
+def feed(sock, lines):
+    data = LINE * lines
+    sock.sendall(data)
+    sock.close()
+
+
+def run_readline(streams, lines, classify):
+    def read(sock):
+        with sock.makefile("r", encoding="utf-8", errors="replace") as stdout:
+            for line in iter(stdout.readline, ""):
+                line = line.rstrip("\n")
+                if classify is not None:
+                    classify(line)
+
+    threads = []
+    for _ in range(streams):
+        reader_side, writer_side = socket.socketpair()
+        threads.append(threading.Thread(target=read, args=(reader_side,)))
+        threads.append(threading.Thread(target=feed, args=(writer_side, lines)))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def run_stream_reader(streams, lines, classify):
+    reader = StreamReader()
+    done = threading.Semaphore(0)
+    writers = []
+
+    def on_lines(chunk, size):
+        if classify is not None:
+            for line in chunk:
+                classify(line)
+
+    for _ in range(streams):
+        reader_side, writer_side = socket.socketpair()
+        reader.add(SocketChannel(reader_side), on_lines, done.release)
+        writers.append(threading.Thread(target=feed, args=(writer_side, lines)))
+    for thread in writers:
+        thread.start()
+    for _ in range(streams):
+        done.acquire()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, default=500_000, help="líneas por stream")
+    parser.add_argument("--streams", type=int, default=4)
+    args = parser.parse_args()
+
+    classifier = SeverityClassifier()
+    total = args.lines * args.streams
+    print(f"{args.streams} streams x {args.lines:,} líneas de {len(LINE)} bytes\n")
+    print(f"{'Lectura':<34}{'líneas/s/stream':>16}{'µs CPU/línea':>14}")
+    for name, run, classify in (
+        ("readline", run_readline, None),
+        ("StreamReader", run_stream_reader, None),
+        ("readline + severidad", run_readline, classifier.classify),
+        ("StreamReader + severidad", run_stream_reader, classifier.classify),
+    ):
+        wall, cpu = time.perf_counter(), time.process_time()
+        run(args.streams, args.lines, classify)
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        print(f"{name:<34}{args.lines / wall:>16,.0f}{cpu / total * 1e6:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
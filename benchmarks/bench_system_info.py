@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: bench_system_info.py
+# Project: SSH-Sentinel
+# File Created: Sunday, 18th October 2026 12:14:51 pm
+# Author: Daniel Rodríguez Cabrera (daniel8rc@gmail.com)
+# Version: 1.0.0
+# -----
+# Last Modified: Sunday, 18th October 2026 12:14:51 pm
+# Modified By: Daniel Rodríguez Cabrera
+# -----
+# Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
+###
+"""
+Micro-benchmark del análisis de SystemInfo.
+
+Mide el coste por muestra de parse_system_info (y del cálculo de CPU) sobre
+una salida real de SYSTEM_INFO_COMMAND y estima la CPU local necesaria para
+sondear una flota.
+
+Uso: python benchmarks/bench_system_info.py [--hosts 500] [--interval 5]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.system_info import SystemInfo  # noqa: E402
+
+SAMPLE = """\
+350735.47 1376032.12
+MemTotal:       16303460 kB
+MemFree:          782956 kB
+MemAvailable:    9874512 kB
+Buffers:          402248 kB
+Cached:          8262212 kB
+SwapCached:         1804 kB
+Active:          7417332 kB
+Inactive:        6669384 kB
+Active(anon):    4990864 kB
+Inactive(anon):   592180 kB
+Active(file):    2426468 kB
+Inactive(file):  6077204 kB
+Unevictable:       32060 kB
+Mlocked:              16 kB
+SwapTotal:       2097148 kB
+SwapFree:        2071804 kB
+Zswap:                 0 kB
+Zswapped:              0 kB
+Dirty:               664 kB
+Writeback:             0 kB
+AnonPages:       5434828 kB
+Mapped:           863420 kB
+Shmem:            175000 kB
+KReclaimable:     504872 kB
+Slab:             775636 kB
+SReclaimable:     504872 kB
+SUnreclaim:       270764 kB
+KernelStack:       20928 kB
+PageTables:        48632 kB
+SecPageTables:         0 kB
+NFS_Unstable:          0 kB
+Bounce:                0 kB
+WritebackTmp:          0 kB
+CommitLimit:    10248876 kB
+Committed_AS:   14383004 kB
+VmallocTotal:   34359738367 kB
+VmallocUsed:       96020 kB
+VmallocChunk:          0 kB
+Percpu:             8960 kB
+HardwareCorrupted:     0 kB
+AnonHugePages:         0 kB
+ShmemHugePages:        0 kB
+ShmemPmdMapped:        0 kB
+FileHugePages:         0 kB
+FilePmdMapped:         0 kB
+HugePages_Total:       0
+HugePages_Free:        0
+HugePages_Rsvd:        0
+HugePages_Surp:        0
+Hugepagesize:       2048 kB
+Hugetlb:               0 kB
+DirectMap4k:      628540 kB
+DirectMap2M:    14024704 kB
+DirectMap1G:     2097152 kB
+0.42 0.57 0.61 2/1187 412873
+cpu  2255360 3410 1077016 27844311 62853 0 17430 0 0 0
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--hosts", type=int, default=500)
+    parser.add_argument("--interval", type=float, default=5.0)
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    system_info = SystemInfo()
+    parse = timeit.Timer(lambda: SystemInfo.parse_system_info(SAMPLE))
+    sample = timeit.Timer(lambda: system_info.sample(SAMPLE))
+    display = timeit.Timer(
+        lambda: SystemInfo.format_system_info(system_info.sample(SAMPLE))
+    )
+
+    print(f"{'Etapa':<28}{'µs/muestra':>12}{'muestras/s':>14}")
+    for name, timer in (
+        ("parse_system_info", parse),
+        ("sample (+ CPU)", sample),
+        ("sample + format", display),
+    ):
+        best = min(timer.repeat(repeat=5, number=args.number)) / args.number
+        print(f"{name:<28}{best * 1e6:>12.2f}{1 / best:>14,.0f}")
+
+    per_sample = min(sample.repeat(repeat=5, number=args.number)) / args.number
+    rate = args.hosts / args.interval
+    print(
+        f"\n{args.hosts} hosts cada {args.interval:g}s = {rate:,.0f} muestras/s "
+        f"-> {rate * per_sample * 100:.3f} % de un núcleo"
+    )
+
+
+if __name__ == "__main__":
+    main()
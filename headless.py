@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: headless.py
+# Project: SSH-Sentinel
+# File Created: Sunday, 18th October 2026 2:31:17 pm
+# Author: Daniel Rodríguez Cabrera (daniel8rc@gmail.com)
+# Version: 1.0.0
+# -----
+# Last Modified: Sunday, 18th October 2026 2:31:17 pm
+# Modified By: Daniel Rodríguez Cabrera
+# -----
+# Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
+###
+"""
+Recolector sin interfaz gráfica.
+
+Consulta todos los servidores de config.json en paralelo y escribe una línea
+JSON por servidor y ronda (NDJSON) en la salida estándar o en un archivo.
+No importa Tk, PIL ni customtkinter, así que puede ejecutarse desde cron en
+una máquina sin pantalla.
+
+Uso: python headless.py [--config config.json] [--output salida.ndjson]
+                        [--interval 0] [--count 0] [--services] [--workers 16]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from loguru import logger
+from services.fleet_status import FleetStatusCollector
+from services.unit_status import UnitStatusCollector
+from utils.ssh_manager import SSHConnectionManager
+
+
+def load_config(path):
+    """
+    Carga la configuración; las rutas relativas se buscan junto al script.
+    """
+    if not os.path.isabs(path) and not os.path.exists(path):
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+    with open(path, "r") as file:
+        return json.load(file)
+
+
+class HeadlessCollector:
+    """
+    Recorre la flota en rondas y emite una instantánea JSON por servidor.
+    """
+
+    def __init__(self, config, output, workers=16, include_services=False):
+        self.servers = config["servers"]
+        self.output = output
+        self.workers = workers
+        self.ssh_manager = SSHConnectionManager(**config.get("ssh", {}))
+        self.fleet = FleetStatusCollector(self.ssh_manager)
+        self.unit_collectors = {}
+        if include_services:
+            for server in self.servers:
+                units = [service["name"] for service in server.get("services", [])]
+                if units:
+                    self.unit_collectors[server["name"]] = UnitStatusCollector(
+                        self.ssh_manager, server, units
+                    )
+
+    def collect(self, server):
+        snapshot = self.fleet.collect(server)
+        collector = self.unit_collectors.get(server["name"])
+        if collector is not None and snapshot["reachable"]:
+            try:
+                snapshot["services"] = collector.poll()
+            except Exception as e:
+                snapshot["services_error"] = str(e)
+        return snapshot
+
+    def run_round(self, executor):
+        """
+        Consulta todos los servidores y escribe cada resultado según llega.
+        """
+        futures = [executor.submit(self.collect, server) for server in self.servers]
+        for future in as_completed(futures):
+            self.output.write(json.dumps(future.result(), separators=(",", ":")) + "\n")
+            self.output.flush()
+
+    def run(self, interval=0, count=0):
+        """
+        Una sola ronda con interval=0; si no, una cada `interval` segundos
+        (indefinidamente, o `count` rondas).
+        """
+        rounds = 0
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            try:
+                while True:
+                    started = time.monotonic()
+                    self.run_round(executor)
+                    rounds += 1
+                    if interval <= 0 or (count and rounds >= count):
+                        break
+                    time.sleep(max(interval - (time.monotonic() - started), 0))
+            finally:
+                self.ssh_manager.close_all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--config", default="config.json")
+    parser.add_argument("--output", help="Archivo NDJSON (se añade al final); por defecto stdout")
+    parser.add_argument("--interval", type=float, default=0, help="Segundos entre rondas (0 = una sola)")
+    parser.add_argument("--count", type=int, default=0, help="Número de rondas (0 = sin límite)")
+    parser.add_argument("--services", action="store_true", help="Incluye el estado de los servicios")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args()
+
+    # Los registros van a stderr para no mezclarse con la salida JSON
+    logger.remove()
+    logger.add(sys.stderr, level=args.log_level)
+
+    config = load_config(args.config)
+    output = open(args.output, "a") if args.output else sys.stdout
+    try:
+        HeadlessCollector(
+            config, output, workers=args.workers, include_services=args.services
+        ).run(args.interval, args.count)
+    except KeyboardInterrupt:
+        pass
+    except BrokenPipeError:
+        # El lector cerró la tubería (p. ej. `| head`): se termina sin traza
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
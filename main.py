@@ -12,16 +12,18 @@
 # -----
 # Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
 ###
+import inspect
 import json
 import os
 import customtkinter as ctk
 from loguru import logger
 from screens.server_selection import ServerSelectionScreen
-from screens.server_status import ServerStatusScreen
-from screens.services_menu import ServicesMenuScreen
-from screens.service_submenu import ServiceSubmenuScreen
 from utils.ssh_manager import SSHConnectionManager
-from PIL import Image, ImageTk
+from utils.metrics_store import MetricsStore
+from utils.scheduler import PollScheduler
+
+# El resto de pantallas, PIL y paramiko se importan la primera vez que se
+# usan para que la ventana aparezca cuanto antes (ver benchmarks/bench_startup.py)
 
 
 class MainApp:
@@ -34,25 +36,15 @@ class MainApp:
         self.root.geometry("800x600")
         self.root.title("SSH Server Manager")
 
-        # Ruta absoluta al archivo PNG
-        script_dir = os.path.dirname(os.path.abspath(__file__))  # Directorio del script
-        icon_path = os.path.join(
-            script_dir, "images/icon.png"
-        )  # Ruta completa al icono
-
-        # Establecer el icono
-        if os.path.exists(icon_path):
-            try:
-                icon_image = Image.open(icon_path)
-                icon_photo = ImageTk.PhotoImage(icon_image)
-                self.root.iconphoto(False, icon_photo)
-            except Exception as e:
-                print(f"Error al cargar el icono: {e}")
-        else:
-            print(f"Icono no encontrado en: {icon_path}")
+        # El icono se carga cuando el bucle de Tk ya está en marcha
+        self.root.after_idle(self.set_icon)
 
         self.config = self.load_config("config.json")
-        self.ssh_manager = SSHConnectionManager()
+        self.ssh_manager = SSHConnectionManager(**self.config.get("ssh", {}))
+        self.scheduler = PollScheduler(**self.config.get("scheduler", {}))
+        self.metrics_history = self.create_metrics_history(self.config.get("history"))
+        self.metrics_store = MetricsStore(history=self.metrics_history)
+        self.log_spool = self.create_log_spool(self.config.get("spool"))
         self.current_screen = None
         self.current_server = None  # Inicializar current_server
 
@@ -76,6 +68,11 @@ class MainApp:
         self.tab_buttons_frame = ctk.CTkFrame(self.top_frame)
         self.tab_buttons_frame.pack(side="left", padx=10)
 
+        # Trabajos periódicos e hilos activos
+        self.scheduler_label = ctk.CTkLabel(self.top_frame, text="")
+        self.scheduler_label.pack(side="right", padx=10)
+        self.update_scheduler_stats()
+
         # Contenedor para las pestañas
         self.tabs_frame = ctk.CTkFrame(self.root)
         self.tabs_frame.pack(fill="both", expand=True)
@@ -88,6 +85,95 @@ class MainApp:
         self.add_new_tab()
 
         self.root.mainloop()
+        if self.metrics_history is not None:
+            self.metrics_history.close()
+        if self.log_spool is not None:
+            self.log_spool.close()
+
+    def set_icon(self):
+        """
+        Establece el icono de la ventana (PIL solo se importa aquí).
+        """
+        # Ruta absoluta al archivo PNG
+        script_dir = os.path.dirname(os.path.abspath(__file__))  # Directorio del script
+        icon_path = os.path.join(
+            script_dir, "images/icon.png"
+        )  # Ruta completa al icono
+
+        # Establecer el icono
+        if os.path.exists(icon_path):
+            try:
+                from PIL import Image, ImageTk
+
+                icon_image = Image.open(icon_path)
+                icon_photo = ImageTk.PhotoImage(icon_image)
+                self.root.iconphoto(False, icon_photo)
+            except Exception as e:
+                print(f"Error al cargar el icono: {e}")
+        else:
+            print(f"Icono no encontrado en: {icon_path}")
+
+    @staticmethod
+    def feature_settings(section, settings, cls):
+        """
+        Argumentos para `cls` tomados de una sección opcional de la configuración.
+
+        Las claves que `cls` no admite se ignoran con un aviso, y `path`, si
+        es relativo, se resuelve desde el directorio del script, como
+        config.json, y no desde el directorio de trabajo.
+        """
+        parameters = inspect.signature(cls).parameters
+        kwargs = {}
+        for key, value in settings.items():
+            if key == "enabled":
+                continue
+            if key not in parameters:
+                logger.warning(f"Clave desconocida en la sección '{section}' de la configuración: {key}")
+                continue
+            kwargs[key] = value
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        kwargs["path"] = os.path.join(script_dir, kwargs.get("path", parameters["path"].default))
+        return kwargs
+
+    @classmethod
+    def create_metrics_history(cls, settings):
+        """
+        Historial de métricas en disco, solo si está activado en la configuración.
+        """
+        if not settings or not settings.get("enabled", False):
+            return None
+        from utils.metrics_history import MetricsHistory
+
+        try:
+            return MetricsHistory(**cls.feature_settings("history", settings, MetricsHistory))
+        except Exception as e:
+            logger.error(f"No se pudo abrir el historial de métricas; queda desactivado: {e}")
+            return None
+
+    @classmethod
+    def create_log_spool(cls, settings):
+        """
+        Spool en disco de los logs vistos, solo si está activado en la configuración.
+        """
+        if not settings or not settings.get("enabled", False):
+            return None
+        from utils.log_spool import LogSpool
+
+        try:
+            return LogSpool(**cls.feature_settings("spool", settings, LogSpool))
+        except Exception as e:
+            logger.error(f"No se pudo abrir el spool de logs; queda desactivado: {e}")
+            return None
+
+    def update_scheduler_stats(self):
+        """
+        Muestra el número de trabajos periódicos e hilos activos.
+        """
+        stats = self.scheduler.stats()
+        self.scheduler_label.configure(
+            text=f"Trabajos: {stats['jobs']} · Hilos: {stats['threads']}"
+        )
+        self.root.after(2000, self.update_scheduler_stats)
 
     def add_new_tab(self):
         """
@@ -167,9 +253,97 @@ class MainApp:
         main_frame.pack(fill="both", expand=True)
 
         self.current_screen = ServerSelectionScreen(
-            main_frame, self.config["servers"], self.on_server_selected
+            main_frame,
+            self.config["servers"],
+            self.on_server_selected,
+            self.on_fleet_selected,
+            self.on_merged_selected,
+        )
+
+    def on_fleet_selected(self):
+        """
+        Callback cuando se abre la vista de flota.
+        """
+        if self.current_tab:
+            content_frame = self.tabs[self.current_tab]["content_frame"]
+            toolbar_frame = self.tabs[self.current_tab]["toolbar_frame"]
+            toolbar_children = toolbar_frame.winfo_children()
+
+            for widget in content_frame.winfo_children():
+                if widget == toolbar_frame or widget in toolbar_children:
+                    continue
+                widget.destroy()
+
+            self.show_fleet_dashboard(content_frame)
+
+    def show_fleet_dashboard(self, frame):
+        """
+        Muestra la vista de flota con todos los servidores configurados.
+        """
+        from screens.fleet_dashboard import FleetDashboardScreen
+
+        main_frame = ctk.CTkFrame(frame)
+        main_frame.pack(fill="both", expand=True)
+
+        self.current_screen = FleetDashboardScreen(
+            main_frame,
+            self.config["servers"],
+            self.ssh_manager,
+            self.scheduler,
+            self.metrics_store,
+            self.on_server_selected,
+            self.on_fleet_back,
         )
 
+    def on_merged_selected(self):
+        """
+        Callback cuando se abre la vista combinada de logs.
+        """
+        if self.current_tab:
+            content_frame = self.tabs[self.current_tab]["content_frame"]
+            toolbar_frame = self.tabs[self.current_tab]["toolbar_frame"]
+            toolbar_children = toolbar_frame.winfo_children()
+
+            for widget in content_frame.winfo_children():
+                if widget == toolbar_frame or widget in toolbar_children:
+                    continue
+                widget.destroy()
+
+            self.show_merged_sources(content_frame)
+
+    def show_merged_sources(self, frame):
+        """
+        Muestra la selección de logs para la vista combinada.
+        """
+        from screens.merged_viewer import MergedSourcesScreen
+
+        main_frame = ctk.CTkFrame(frame)
+        main_frame.pack(fill="both", expand=True)
+
+        self.current_screen = MergedSourcesScreen(
+            main_frame,
+            self.config["servers"],
+            self.ssh_manager,
+            self.on_fleet_back,
+            self.config.get("merged_view"),
+        )
+
+    def on_fleet_back(self):
+        """
+        Vuelve de la vista de flota (o de la combinada) a la selección de servidor.
+        """
+        if self.current_tab:
+            content_frame = self.tabs[self.current_tab]["content_frame"]
+            toolbar_frame = self.tabs[self.current_tab]["toolbar_frame"]
+            toolbar_children = toolbar_frame.winfo_children()
+
+            for widget in content_frame.winfo_children():
+                if widget == toolbar_frame or widget in toolbar_children:
+                    continue
+                widget.destroy()
+
+            self.show_server_selection_screen(content_frame)
+
     def switch_tab(self, tab_id):
         """
         Cambia a la pestaña seleccionada.
@@ -235,6 +409,8 @@ class MainApp:
             logger.error("No hay servidor seleccionado.")
             return
 
+        from screens.services_menu import ServicesMenuScreen
+
         main_frame = ctk.CTkFrame(frame)
         main_frame.pack(fill="both", expand=True)
 
@@ -242,6 +418,7 @@ class MainApp:
             main_frame,
             self.current_server,
             self.ssh_manager,
+            self.scheduler,
             self.on_service_selected,
             lambda: self.on_server_selected(self.current_server),
         )
@@ -250,11 +427,18 @@ class MainApp:
         """
         Muestra la pantalla de estado del servidor.
         """
+        from screens.server_status import ServerStatusScreen
+
         main_frame = ctk.CTkFrame(frame)
         main_frame.pack(fill="both", expand=True)
 
         self.current_screen = ServerStatusScreen(
-            main_frame, server, self.ssh_manager, self.on_services_button_clicked
+            main_frame,
+            server,
+            self.ssh_manager,
+            self.scheduler,
+            self.metrics_store,
+            self.on_services_button_clicked,
         )
 
     def on_services_button_clicked(self):
@@ -295,14 +479,18 @@ class MainApp:
         """
         Muestra la pantalla del submenú del servicio seleccionado.
         """
+        from screens.service_submenu import ServiceSubmenuScreen
+
         main_frame = ctk.CTkFrame(frame)
         main_frame.pack(fill="both", expand=True)
 
         self.current_screen = ServiceSubmenuScreen(
             main_frame,
+            self.current_server,
             service,
             self.ssh_manager,
             lambda: self.show_services_menu(frame),
+            self.log_spool,
         )
 
 
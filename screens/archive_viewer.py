@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: archive_viewer.py
+# Project: SSH-Sentinel
+# File Created: Sunday, 18th October 2026 7:52:26 pm
+# Author: Daniel Rodríguez Cabrera (daniel8rc@gmail.com)
+# Version: 1.0.0
+# -----
+# Last Modified: Sunday, 18th October 2026 7:52:26 pm
+# Modified By: Daniel Rodríguez Cabrera
+# -----
+# Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
+###
+from screens.stream_viewer import StreamViewer
+from utils.log_rotation import archive_command, parse_file_marker
+
+
+class ArchiveLogViewer(StreamViewer):
+    """
+    Pantalla para consultar el histórico de un log: sus rotaciones
+    (comprimidas o no) y el fichero actual, en orden cronológico.
+
+    Todo se descomprime en el servidor y llega como un único stream, así que
+    las primeras líneas se ven enseguida aunque el histórico ocupe gigas.
+    Conviene combinarlo con los filtros en el servidor.
+    """
+
+    title_prefix = "Histórico de"
+
+    def __init__(self, root, server, service, ssh_manager, on_back, spool=None):
+        self.current_file = None  # (posición, total, fichero) que se está leyendo
+        # El histórico se lee entero cada vez: no se guarda en el spool
+        super().__init__(root, server, service, ssh_manager, on_back)
+
+    def source_command(self, initial):
+        return archive_command(self.service['log_path'])
+
+    def start_stream(self, initial):
+        # Cada lectura recorre el histórico desde el principio
+        if not initial:
+            self.clear_lines()
+            self.current_file = None
+        super().start_stream(initial)
+
+    def control_line(self, line):
+        marker = parse_file_marker(line)
+        if marker is not None:
+            self.current_file = marker
+            self.queue.put((f"==> {marker[2]} <==", "debug"))
+
+    def status_details(self):
+        if self.stream_ended:
+            return ["Histórico completo"]
+        if self.current_file is None:
+            return ["Buscando rotaciones..."]
+        index, total, path = self.current_file
+        return [f"Leyendo {index} de {total}: {path}"]
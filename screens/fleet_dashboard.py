@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: fleet_dashboard.py
+# Project: SSH-Sentinel
+# File Created: Sunday, 18th October 2026 2:05:33 pm
+# Author: Daniel Rodríguez Cabrera (daniel8rc@gmail.com)
+# Version: 1.0.0
+# -----
+# Last Modified: Sunday, 18th October 2026 2:05:33 pm
+# Modified By: Daniel Rodríguez Cabrera
+# -----
+# Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
+###
+import threading
+from tkinter import ttk
+import customtkinter as ctk
+from screens.base_screen import BaseScreen
+from loguru import logger
+from services.fleet_status import FleetStatusCollector
+from utils.system_info import SystemInfo
+
+COLUMNS = (
+    ("state", "Estado", 110),
+    ("load", "Carga (1/5/15)", 150),
+    ("cpu", "CPU", 70),
+    ("memory", "Memoria", 170),
+    ("failed", "Unidades fallidas", 120),
+    ("latency", "Latencia", 80),
+)
+
+
+class FleetDashboardScreen(BaseScreen):
+    """
+    Pantalla con el estado de todos los servidores configurados.
+
+    Cada servidor es un trabajo del planificador en el grupo de hilos "fleet",
+    de modo que el número de consultas simultáneas está acotado. Los
+    resultados se acumulan desde los hilos de trabajo y la tabla se actualiza
+    por lotes desde el bucle de Tk.
+    """
+
+    def __init__(
+        self,
+        root,
+        servers,
+        ssh_manager,
+        scheduler,
+        metrics_store,
+        on_server_selected,
+        on_back,
+        refresh_ms=500,
+    ):
+        super().__init__(root)
+        self.servers = {server["name"]: server for server in servers}
+        self.ssh_manager = ssh_manager
+        self.scheduler = scheduler
+        self.on_server_selected = on_server_selected
+        self.on_back = on_back
+        self.refresh_ms = refresh_ms
+
+        self.collector = FleetStatusCollector(ssh_manager, metrics_store)
+        self.snapshots = {}
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+
+        self.setup_ui()
+        self.start_fleet_jobs()
+        self.root.after(self.refresh_ms, self.apply_pending)
+
+    def setup_ui(self):
+        """
+        Configura los elementos de la interfaz de usuario.
+        """
+        self.frame = ctk.CTkFrame(self.root)
+        self.frame.pack(fill="both", expand=True, padx=20, pady=20)
+
+        title = ctk.CTkLabel(
+            self.frame,
+            text="Estado de la flota",
+            font=("Helvetica", 18, "bold"),
+        )
+        title.pack(pady=10)
+
+        self.summary_label = ctk.CTkLabel(
+            self.frame,
+            text=f"Consultando {len(self.servers)} servidores...",
+            font=("Helvetica", 14),
+        )
+        self.summary_label.pack(pady=5)
+
+        table_frame = ctk.CTkFrame(self.frame)
+        table_frame.pack(fill="both", expand=True, pady=10)
+
+        # Un Treeview solo dibuja las filas visibles: admite cientos de servidores
+        self.table = ttk.Treeview(
+            table_frame, columns=[key for key, _, _ in COLUMNS], selectmode="browse"
+        )
+        self.table.heading("#0", text="Servidor")
+        self.table.column("#0", width=160)
+        for key, heading, width in COLUMNS:
+            self.table.heading(key, text=heading)
+            self.table.column(key, width=width, anchor="center")
+        self.table.tag_configure("unreachable", foreground="#d9534f")
+        self.table.tag_configure("failed", foreground="#f0ad4e")
+
+        scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self.table.yview)
+        self.table.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y")
+        self.table.pack(side="left", fill="both", expand=True)
+
+        for name in self.servers:
+            self.table.insert("", "end", iid=name, text=name, values=("...",))
+        self.table.bind("<Double-1>", self.on_row_activated)
+
+        back_btn = ctk.CTkButton(
+            self.frame,
+            text="Volver",
+            command=self.on_back,
+            font=("Helvetica", 14),
+        )
+        back_btn.pack(pady=10)
+
+    def start_fleet_jobs(self):
+        """
+        Programa la consulta periódica de cada servidor en el grupo "fleet".
+        """
+        for name, server in self.servers.items():
+            self.scheduler.schedule(
+                ("fleet_status", name),
+                lambda s=server: self.collector.collect(s),
+                self.queue_snapshot,
+                metric="fleet_status",
+                owner=self.frame,
+                pool="fleet",
+            )
+
+    def queue_snapshot(self, snapshot):
+        """
+        Guarda una instantánea para el próximo lote (se llama desde un hilo de trabajo).
+        """
+        with self._pending_lock:
+            self._pending[snapshot["server"]] = snapshot
+
+    def apply_pending(self):
+        """
+        Aplica a la tabla las instantáneas recibidas desde el último lote.
+        """
+        if not self.frame.winfo_exists():
+            return
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        for name, snapshot in pending.items():
+            self.snapshots[name] = snapshot
+            text, tags = self.format_row(snapshot)
+            self.table.item(name, values=text, tags=tags)
+        if pending:
+            self.update_summary()
+        self.root.after(self.refresh_ms, self.apply_pending)
+
+    @staticmethod
+    def format_row(snapshot):
+        """
+        Valores de la fila de un servidor y sus etiquetas de color.
+        """
+        if not snapshot["reachable"]:
+            return ("Inaccesible", "-", "-", "-", "-", "-"), ("unreachable",)
+        cpu = snapshot["cpu_percent"]
+        failed = snapshot["failed_units"]
+        memory = "-"
+        if snapshot["mem_percent"] is not None:
+            memory = (
+                f"{SystemInfo.format_bytes(snapshot['mem_used'])} "
+                f"({snapshot['mem_percent']:.0f} %)"
+            )
+        values = (
+            "Accesible",
+            f"{snapshot['load_1']:.2f} / {snapshot['load_5']:.2f} / {snapshot['load_15']:.2f}",
+            "N/D" if cpu is None else f"{cpu:.0f} %",
+            memory,
+            "N/D" if failed is None else failed,
+            f"{snapshot['latency_ms']:.0f} ms",
+        )
+        return values, ("failed",) if failed else ()
+
+    def update_summary(self):
+        reachable = sum(1 for s in self.snapshots.values() if s["reachable"])
+        failed = sum(s.get("failed_units") or 0 for s in self.snapshots.values())
+        self.summary_label.configure(
+            text=(
+                f"{reachable}/{len(self.servers)} accesibles · "
+                f"{failed} unidades fallidas · "
+                f"{len(self.servers) - len(self.snapshots)} pendientes"
+            )
+        )
+
+    def on_row_activated(self, event):
+        """
+        Abre la pantalla de estado del servidor seleccionado.
+        """
+        name = self.table.focus()
+        if name in self.servers:
+            logger.info(f"Abriendo {name} desde la vista de flota")
+            self.on_server_selected(self.servers[name])
@@ -12,65 +12,82 @@
 # -----
 # Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
 ###
-import threading
+import json
+import shlex
 import time
-import customtkinter as ctk
-from screens.base_screen import BaseScreen
-from loguru import logger
+from screens.stream_viewer import StreamViewer
 
 
-class JournalViewer(BaseScreen):
+def format_entry(entry):
     """
-    Pantalla para mostrar los logs de journalctl de un servicio.
+    Línea con el formato de `journalctl -o short` de una entrada de `-o json`.
+    """
+    try:
+        stamp = time.strftime(
+            "%b %d %H:%M:%S",
+            time.localtime(int(entry["__REALTIME_TIMESTAMP"]) / 1_000_000),
+        )
+    except (KeyError, ValueError):
+        stamp = ""
+    message = entry.get("MESSAGE", "")
+    if isinstance(message, list):
+        # Los mensajes que no son UTF-8 válido llegan como lista de bytes
+        message = bytes(message).decode("utf-8", errors="replace")
+    # Una entrada es una línea del visor (y del spool)
+    message = message.replace("\n", " ")
+    identifier = entry.get("SYSLOG_IDENTIFIER") or entry.get("_COMM", "")
+    pid = entry.get("_PID")
+    if pid:
+        identifier += f"[{pid}]"
+    return f"{stamp} {entry.get('_HOSTNAME', '')} {identifier}: {message}"
+
+
+class JournalViewer(StreamViewer):
     """
+    Pantalla para mostrar los logs de journalctl de un servicio.
 
-    def __init__(self, root, service, ssh_manager, on_back):
-        super().__init__(root)
-        self.service = service
-        self.ssh_manager = ssh_manager
-        self.on_back = on_back
+    Con el spool activo se pide la salida en JSON para conocer el cursor de
+    cada entrada y reanudar justo después de la última guardada; las líneas
+    se muestran con el mismo formato que la salida normal.
+    """
 
-        self.setup_ui()
-        threading.Thread(target=self.fetch_journalctl, daemon=True).start()
+    title_prefix = "Journalctl de"
 
-    def setup_ui(self):
-        """
-        Configura los elementos de la interfaz de usuario.
-        """
-        self.frame = ctk.CTkFrame(self.root)
-        self.frame.pack(fill="both", expand=True, padx=20, pady=20)
+    def __init__(self, root, server, service, ssh_manager, on_back, spool=None):
+        self._cursor = None  # Cursor de la última entrada recibida
+        super().__init__(root, server, service, ssh_manager, on_back, spool)
 
-        title = ctk.CTkLabel(
-            self.frame,
-            text=f"Journalctl de {self.service['name']}",
-            font=("Helvetica", 18, "bold"),
-        )
-        title.pack(pady=10)
+    def spool_key(self):
+        return f"journal:{self.service['name']}"
 
-        self.journal_text = ctk.CTkTextbox(self.frame, width=800, height=800)
-        self.journal_text.pack(fill="both", expand=True)
+    def source_command(self, initial):
+        name = self.service['name']
+        if self.spool_stream is None:
+            lines = "" if initial else "-n 0 "
+            return f"journalctl {lines}-fu {name}"
+        self.transform = self.parse_entry
+        cursor = self._cursor or (self.resume_state or {}).get("cursor")
+        if cursor:
+            return f"journalctl -fu {name} -o json --no-tail --after-cursor={shlex.quote(cursor)}"
+        lines = "" if initial else "-n 0 "
+        return f"journalctl {lines}-fu {name} -o json"
 
-        back_btn = ctk.CTkButton(
-            self.frame,
-            text="Volver",
-            command=self.on_back,
-            font=("Helvetica", 14),
-        )
-        back_btn.pack(pady=20)
+    def build_command(self, initial=True):
+        if self.spool_stream is None:
+            return super().build_command(initial)
+        # El filtro remoto trabaja sobre el texto y aquí llega JSON
+        self.stream_filtered = False
+        return self.source_command(initial)
 
-    def fetch_journalctl(self):
-        """
-        Obtiene los logs de journalctl del servidor.
-        """
+    def parse_entry(self, line):
         try:
-            command = f"journalctl -fu {self.service['name']}"
-            stdin, stdout, stderr = self.ssh_manager.execute_command(command)
-            while True:
-                line = stdout.readline()
-                if line:
-                    self.journal_text.insert("end", line)
-                    self.journal_text.see("end")
-                else:
-                    time.sleep(0.1)
-        except Exception as e:
-            logger.error(f"No se pudieron obtener los logs de journalctl: {e}")
+            entry = json.loads(line)
+        except ValueError:
+            return line  # Avisos de journalctl, no entradas
+        if not isinstance(entry, dict):
+            return line
+        self._cursor = entry.get("__CURSOR", self._cursor)
+        return format_entry(entry)
+
+    def resume_point(self):
+        return {"cursor": self._cursor} if self._cursor else None
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: log_view.py
+# Project: SSH-Sentinel
+# File Created: Sunday, 18th October 2026 3:41:52 pm
+# Author: Daniel Rodríguez Cabrera (daniel8rc@gmail.com)
+# Version: 1.0.0
+# -----
+# Last Modified: Sunday, 18th October 2026 3:41:52 pm
+# Modified By: Daniel Rodríguez Cabrera
+# -----
+# Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
+###
+import bisect
+import tkinter.font as tkfont
+import customtkinter as ctk
+
+
+class VirtualLogView:
+    """
+    Vista de un LogBuffer que solo dibuja las líneas visibles.
+
+    El cuadro de texto nunca contiene más de una pantalla de líneas: al
+    desplazarse se sustituye su contenido por el tramo correspondiente del
+    búfer, así que el coste de dibujar no depende del tamaño del historial.
+    La posición se guarda como número de secuencia para que no salte cuando
+    se desalojan líneas antiguas. Mientras se está al final, la vista sigue
+    las líneas nuevas.
+    """
+
+    # Etiqueta de la línea marcada (p. ej. el resultado de búsqueda actual)
+    MARK_TAG = "marked"
+
+    def __init__(self, parent, buffer, font_size=14, on_top=None):
+        self.buffer = buffer
+        self.on_top = on_top  # Se llama al intentar subir más allá de la primera línea
+        self.rows = None  # Secuencias visibles (ordenadas); None = todo el búfer
+        self.follow = True
+        self.top_seq = 0
+        self.marked = None  # Secuencia resaltada
+        self.font_size = font_size
+
+        self.frame = ctk.CTkFrame(parent)
+        self.textbox = ctk.CTkTextbox(
+            self.frame, wrap="none", activate_scrollbars=False
+        )
+        self.scrollbar = ctk.CTkScrollbar(self.frame, command=self.yview)
+        self.scrollbar.pack(side="right", fill="y")
+        self.textbox.pack(side="left", fill="both", expand=True)
+
+        self.text = self.textbox._textbox
+        self.set_font_size(font_size)
+        self.text.bind("<Configure>", lambda event: self.render())
+        self.text.bind("<MouseWheel>", self.on_mouse_wheel)
+        self.text.bind("<Button-4>", lambda event: self.scroll(-3) or "break")
+        self.text.bind("<Button-5>", lambda event: self.scroll(3) or "break")
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def tag_config(self, tag, **kwargs):
+        self.textbox.tag_config(tag, **kwargs)
+
+    def set_font_size(self, size):
+        self.font_size = size
+        self.font = tkfont.Font(family="Courier", size=size)
+        self.text.configure(font=self.font)
+        self.render()
+
+    def set_rows(self, rows):
+        """
+        Limita la vista a las secuencias indicadas (p. ej. las que pasan un filtro).
+        """
+        self.rows = rows
+        self.render()
+
+    def mark(self, seq):
+        """
+        Resalta la línea con la secuencia indicada (None para quitar la marca).
+        """
+        self.marked = seq
+        self.render()
+
+    def row_count(self):
+        return len(self.buffer) if self.rows is None else len(self.rows)
+
+    def index_of(self, seq):
+        """
+        Posición de la primera fila con secuencia >= `seq`.
+        """
+        if self.rows is None:
+            return max(seq - self.buffer.first_seq, 0)
+        return bisect.bisect_left(self.rows, seq)
+
+    def seq_at(self, index):
+        if self.rows is None:
+            return self.buffer.first_seq + index
+        return self.rows[index]
+
+    def visible_rows(self):
+        height = self.text.winfo_height()
+        return max(height // max(self.font.metrics("linespace"), 1), 1)
+
+    def render(self):
+        """
+        Dibuja las líneas visibles en una sola inserción.
+        """
+        count = self.row_count()
+        visible = self.visible_rows()
+        if self.follow:
+            top = max(count - visible, 0)
+        else:
+            top = min(self.index_of(self.top_seq), max(count - visible, 0))
+        end = min(top + visible, count)
+        if top < end:
+            self.top_seq = self.seq_at(top)
+
+        chunks = []
+        for index in range(top, end):
+            seq = self.seq_at(index)
+            entry = self.buffer.get(seq)
+            if entry is not None:
+                line, tag = entry
+                tags = (tag,) if tag else ()
+                if seq == self.marked:
+                    tags += (self.MARK_TAG,)
+                chunks.extend(self.line_chunks(line, tags, seq))
+        self.text.delete("1.0", "end")
+        if chunks:
+            self.text.insert("end", *chunks)
+        if count:
+            self.scrollbar.set(top / count, end / count)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def line_chunks(self, line, tags, seq):
+        """
+        Pares (texto, etiquetas) con los que se dibuja la línea de la
+        secuencia `seq`; las subclases pueden resaltar partes de ella o
+        añadirle texto que no forma parte del búfer.
+        """
+        return line + "\n", tags
+
+    def scroll(self, rows):
+        """
+        Desplaza la vista `rows` filas (negativo = hacia arriba).
+        """
+        count = self.row_count()
+        visible = self.visible_rows()
+        top = self.index_of(self.top_seq) if not self.follow else max(count - visible, 0)
+        top = max(min(top + rows, count - visible), 0)
+        self.follow = top + visible >= count
+        if top < count:
+            self.top_seq = self.seq_at(top)
+        self.render()
+        if rows < 0 and top == 0 and self.on_top is not None:
+            self.on_top()
+
+    def scroll_to(self, seq):
+        """
+        Muestra la línea con la secuencia indicada en la parte superior.
+        """
+        self.follow = False
+        self.top_seq = seq
+        self.render()
+        self.follow = self.index_of(self.top_seq) + self.visible_rows() >= self.row_count()
+
+    def yview(self, *args):
+        """
+        Comando de la barra de desplazamiento (moveto / scroll).
+        """
+        count = self.row_count()
+        visible = self.visible_rows()
+        if args[0] == "moveto":
+            top = min(max(int(float(args[1]) * count), 0), max(count - 1, 0))
+            self.follow = top + visible >= count
+            if not self.follow:
+                self.top_seq = self.seq_at(top)
+            self.render()
+            if top == 0 and self.on_top is not None:
+                self.on_top()
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            self.scroll(amount * visible if args[2] == "pages" else amount)
+
+    def on_mouse_wheel(self, event):
+        self.scroll(-3 if event.delta > 0 else 3)
+        return "break"
@@ -13,77 +13,67 @@
 # Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
 ###
 import threading
-import time
 import customtkinter as ctk
-from screens.base_screen import BaseScreen
 from loguru import logger
-import tkinter as tk  # Importamos tkinter para usar Listbox
+from screens.stream_viewer import StreamViewer
+from utils.access_log import RATE_WINDOW, WINDOW, AccessStats, parse_access_lines
+from utils.log_filter import CONTROL_PREFIX
+from utils.log_pager import PAGE_SIZE, RemoteLogPager
+from utils.log_rotation import parse_stat, stat_command
+from utils.system_info import SystemInfo
 
+# Cada cuánto se comprueba si el fichero ha rotado (ms)
+ROTATION_CHECK_MS = 10_000
 
-class LogViewer(BaseScreen):
-    """
-    Pantalla para mostrar los logs de un servicio.
-    """
+# Si desde el punto de reanudación se han escrito más bytes, se empieza al final
+RESUME_MAX_BYTES = 8 * 1024 * 1024
 
-    def __init__(self, root, service, ssh_manager, on_back):
-        super().__init__(root)
-        self.service = service
-        self.ssh_manager = ssh_manager
-        self.on_back = on_back
+# Cada cuánto se refresca el panel de analítica (ms)
+ANALYTICS_REFRESH_MS = 1000
 
-        self.log_font_size = 14
-        self.current_filters = []  # Lista para almacenar múltiples filtros
 
-        self.setup_ui()
-        threading.Thread(target=self.fetch_logs, daemon=True).start()
-
-    def setup_ui(self):
-        """
-        Configura los elementos de la interfaz de usuario.
-        """
-        self.frame = ctk.CTkFrame(self.root)
-        self.frame.pack(fill="both", expand=True, padx=20, pady=20)
-
-        title = ctk.CTkLabel(
-            self.frame,
-            text=f"Logs de {self.service['name']}",
-            font=("Helvetica", 18, "bold"),
-        )
-        title.pack(pady=10)
-
-        # Área de texto para los logs
-        log_text_frame = ctk.CTkFrame(self.frame)
-        log_text_frame.pack(fill="both", expand=True, padx=10, pady=10)
-
-        self.log_text = ctk.CTkTextbox(log_text_frame, width=800, height=800)
-        self.log_text.pack(fill="both", expand=True)
-
-        # Configuración inicial del tamaño de fuente
-        self.log_text._textbox.configure(font=("Courier", self.log_font_size))
+class LogViewer(StreamViewer):
+    """
+    Pantalla para mostrar los logs de un servicio.
 
-        # Frame para los filtros
-        filter_frame = ctk.CTkFrame(self.frame)
-        filter_frame.pack(pady=10)
+    El tail empieza donde acababa el fichero al abrir el visor; lo anterior
+    se pagina bajo demanda al subir más allá de la primera línea cargada.
 
-        filter_label = ctk.CTkLabel(filter_frame, text="Agregar filtro:")
-        filter_label.pack(side="left", padx=5)
+    tail -F ya sigue al fichero nuevo tras una rotación, pero no siempre
+    (tail de busybox, sistemas de ficheros sin inotify...). Por eso se
+    vigila el inodo y el tamaño del fichero: si cambian y el stream no
+    entrega nada del fichero nuevo mientras este crece, o si el stream
+    termina, se vuelve a abrir.
 
-        self.filter_entry = ctk.CTkEntry(filter_frame, width=200)
-        self.filter_entry.pack(side="left", padx=5)
+    En modo analítica (botón "Analítica", o `"access_log": true` en el
+    servicio) las líneas de un log de acceso se analizan además en columnas
+    según llegan, y un panel muestra peticiones/s, códigos de estado, rutas
+    más pedidas y percentiles de latencia de la última ventana.
+    """
 
-        add_filter_button = ctk.CTkButton(
-            filter_frame, text="Agregar", command=self.add_filter
-        )
-        add_filter_button.pack(side="left", padx=5)
+    title_prefix = "Logs de"
 
-        # Listbox para mostrar los filtros actuales
-        self.filter_listbox = tk.Listbox(filter_frame, height=5)
-        self.filter_listbox.pack(side="left", padx=5)
+    def __init__(self, root, server, service, ssh_manager, on_back, spool=None):
+        self.pager = None  # Historial anterior al tail, paginado bajo demanda
+        self._loading_older = False
+        self._loading_pages = set()
+        self._file_id = None  # (inodo, tamaño) en la última comprobación
+        self._rotation = None  # (actividad, tamaño) al detectar una rotación
+        self._from_start = False
+        # Desplazamiento e inodo donde empezó el stream actual (None = desconocido)
+        self._stream_start = self._stream_inode = None
+        self.analytics = None  # AccessStats mientras el modo analítica está activo
+        super().__init__(root, server, service, ssh_manager, on_back, spool)
+        self.root.after(ROTATION_CHECK_MS, self.check_rotation)
+        if service.get("access_log", False):
+            self.toggle_analytics()
 
-        remove_filter_button = ctk.CTkButton(
-            filter_frame, text="Eliminar Seleccionado", command=self.remove_filter
-        )
-        remove_filter_button.pack(side="left", padx=5)
+    def setup_controls(self):
+        """
+        Búsqueda, filtros, botón de volver y tamaño de letra.
+        """
+        self.setup_search_controls()
+        self.setup_filter_controls()
 
         back_btn = ctk.CTkButton(
             self.frame,
@@ -107,79 +97,302 @@ class LogViewer(BaseScreen):
         )
         decrease_font_button.pack(side="left", padx=10)
 
-        # Configuración de resaltado de texto
-        self.log_text.tag_config("error", foreground="red")
-        self.log_text.tag_config("warning", foreground="orange")
-        self.log_text.tag_config("info", foreground="blue")
-
-    def add_filter(self):
-        """
-        Agrega un filtro a la lista de filtros actuales.
-        """
-        filter_text = self.filter_entry.get().strip()
-        if filter_text:
-            self.current_filters.append(filter_text)
-            self.filter_listbox.insert('end', filter_text)
-            self.filter_entry.delete(0, 'end')
+        self.analytics_button = ctk.CTkButton(
+            button_frame, text="Analítica", command=self.toggle_analytics
+        )
+        self.analytics_button.pack(side="left", padx=10)
 
-    def remove_filter(self):
-        """
-        Elimina el filtro seleccionado de la lista.
-        """
-        selected_indices = self.filter_listbox.curselection()
-        for index in reversed(selected_indices):
-            self.current_filters.pop(index)
-            self.filter_listbox.delete(index)
+        # Panel de analítica, encima de los logs mientras el modo está activo
+        self.analytics_label = ctk.CTkLabel(
+            self.frame, text="", font=("Courier", 12), justify="left", anchor="w"
+        )
 
     def increase_font(self):
         """
         Aumenta el tamaño de letra de los logs.
         """
-        self.log_font_size += 2
-        self.log_text._textbox.configure(font=("Courier", self.log_font_size))
+        self.font_size += 2
+        self.log_text.set_font_size(self.font_size)
 
     def decrease_font(self):
         """
         Disminuye el tamaño de letra de los logs.
         """
-        if self.log_font_size > 8:  # Tamaño mínimo
-            self.log_font_size -= 2
-            self.log_text._textbox.configure(font=("Courier", self.log_font_size))
+        if self.font_size > 8:  # Tamaño mínimo
+            self.font_size -= 2
+            self.log_text.set_font_size(self.font_size)
 
-    def highlight_logs(self, line):
+    def toggle_analytics(self):
         """
-        Resalta las líneas de logs según la severidad.
+        Activa o desactiva el modo analítica del log de acceso.
         """
-        if "error" in line.lower() or "critical" in line.lower():
-            self.log_text.insert("end", line, "error")
-        elif "warning" in line.lower():
-            self.log_text.insert("end", line, "warning")
-        elif "info" in line.lower():
-            self.log_text.insert("end", line, "info")
+        if self.analytics is None:
+            self.analytics = AccessStats(
+                self.service.get("analytics_window", WINDOW),
+                self.service.get("analytics_rate_window", RATE_WINDOW),
+            )
+            self.analytics_label.pack(fill="x", padx=10, before=self.log_text.frame.master)
+            self.analytics_button.configure(text="Ocultar analítica")
+            self.update_analytics(self.analytics)
         else:
-            self.log_text.insert("end", line)
+            self.analytics = None
+            self.analytics_label.pack_forget()
+            self.analytics_button.configure(text="Analítica")
 
-    def display_line(self, line):
+    def receive_lines(self, generation, lines, size):
+        super().receive_lines(generation, lines, size)
+        analytics = self.analytics
+        if analytics is not None and generation == self._stream_generation:
+            # Todo el trozo de una vez: se analiza y agrega en bloque
+            analytics.add(parse_access_lines(
+                [line for line in lines if not line.startswith(CONTROL_PREFIX)],
+                self.service.get("latency_field"),
+            ))
+
+    def update_analytics(self, analytics):
         """
-        Muestra una línea de log en la interfaz, aplicando filtros.
+        Refresca el panel de analítica con la ventana actual.
         """
-        if not self.current_filters or any(f.lower() in line.lower() for f in self.current_filters):
-            self.highlight_logs(line)
-            self.log_text.see("end")
+        # Un modo desactivado (o reactivado después) deja de refrescarse aquí
+        if analytics is not self.analytics or self.closed or not self.frame.winfo_exists():
+            return
+        self.analytics_label.configure(text=format_analytics(analytics.snapshot(), analytics))
+        self.root.after(ANALYTICS_REFRESH_MS, self.update_analytics, analytics)
+
+    def spool_key(self):
+        return f"file:{self.service['log_path']}"
+
+    def source_command(self, initial):
+        path = self.service['log_path']
+        if self._from_start:
+            # Fichero nuevo tras una rotación que tail no siguió
+            self._from_start = False
+            if self._file_id is not None:
+                self._stream_start, self._stream_inode = 0, self._file_id[0]
+            return f"tail -n +1 -F {path}"
+        file_id = self.stat_file() if initial else None
+        if file_id is not None:
+            inode, size = file_id
+            resume = self.resume_state or {}
+            offset = resume.get("offset", -1) if resume.get("inode") == inode else -1
+            if 0 <= offset <= size and size - offset <= self.service.get(
+                "resume_max_bytes", RESUME_MAX_BYTES
+            ):
+                # Continúa justo después de lo que ya está en el spool
+                start = offset
+            elif self.service.get("scrollback", True):
+                start = size
+                if not self.restored_lines:
+                    self.start_history(size)
+            else:
+                start = None
+            if start is not None:
+                self._stream_start, self._stream_inode = start, inode
+                return f"tail -c +{start + 1} -F {path}"
+        # -F sigue al fichero por nombre, así que sobrevive a la rotación
+        lines = 10 if initial else 0
+        return f"tail -n {lines} -F {path}"
+
+    def start_stream(self, initial):
+        # Hasta que fetch_stream construya el comando no se sabe dónde empieza
+        self._stream_start = None
+        super().start_stream(initial)
 
-    def fetch_logs(self):
+    def resume_point(self):
+        if self._stream_start is None or self.stream_filtered:
+            return None
+        return {"inode": self._stream_inode, "offset": self._stream_start + self.stream_bytes}
+
+    def stat_file(self):
         """
-        Obtiene los logs del servidor.
+        (inodo, tamaño) actuales del fichero de log, o None si no se pueden obtener.
         """
+        path = self.service['log_path']
         try:
-            command = f"tail -f {self.service['log_path']}"
-            stdin, stdout, stderr = self.ssh_manager.execute_command(command)
-            while True:
-                line = stdout.readline()
-                if line:
-                    # Programar la actualización en el hilo principal
-                    self.root.after(0, self.display_line, line)
-                else:
-                    time.sleep(0.1)
+            exit_status, output, error = self.ssh_manager.run_command(
+                self.server, stat_command(path)
+            )
+            if exit_status == 0:
+                self._file_id = parse_stat(output)
+                return self._file_id
+            logger.warning(f"No se pudo consultar {path}: {error.strip()}")
         except Exception as e:
-            logger.error(f"No se pudieron obtener los logs: {e}")
+            logger.warning(f"No se pudo consultar {path}: {e}")
+        return None
+
+    def start_history(self, end_offset):
+        """
+        Prepara el historial anterior a `end_offset` y carga su última página.
+        """
+        self.pager = RemoteLogPager(
+            self.ssh_manager,
+            self.server,
+            self.service['log_path'],
+            end_offset,
+            classify=self.classify,
+            page_size=self.service.get("scrollback_page_size", PAGE_SIZE),
+        )
+        self.scrollback.pager = self.pager
+        self.scrollback.on_missing = self.load_history_page
+        self.load_older_history()
+
+    def detach_history(self):
+        """
+        Quita el historial: tras una rotación la ruta es otro fichero y los
+        desplazamientos de sus páginas ya no corresponden a nada.
+        """
+        if self.pager is None:
+            return
+        logger.info(f"Historial de {self.service['log_path']} descartado por la rotación")
+        self.pager = self.scrollback.pager = self.scrollback.on_missing = None
+        self._loading_pages.clear()
+        self.log_text.render()
+        self.update_status()
+
+    def stream_activity(self):
+        """
+        Medida de lo que ha entregado el stream (incluye lo filtrado en el servidor).
+        """
+        return self.queue.received + self._stream_remote_bytes
+
+    def check_rotation(self):
+        """
+        Consulta en segundo plano el inodo y el tamaño del fichero.
+        """
+        if self.closed or not self.frame.winfo_exists():
+            return
+
+        def fetch():
+            file_id = None
+            try:
+                exit_status, output, error = self.ssh_manager.run_command(
+                    self.server, stat_command(self.service['log_path'])
+                )
+                if exit_status == 0:
+                    file_id = parse_stat(output)
+            except Exception as e:
+                logger.warning(f"No se pudo comprobar {self.service['log_path']}: {e}")
+            self.root.after(0, self.rotation_checked, file_id)
+
+        threading.Thread(target=fetch, daemon=True).start()
+
+    def rotation_checked(self, file_id):
+        if self.closed or not self.frame.winfo_exists():
+            return
+        activity = self.stream_activity()
+        previous = self._file_id
+        if file_id is not None:
+            self._file_id = file_id
+            inode, size = file_id
+            if previous is not None and (inode != previous[0] or size < previous[1]):
+                logger.info(f"{self.service['log_path']} ha rotado")
+                self._rotation = (activity, size)
+                # tail -F pudo pasar al fichero nuevo: el desplazamiento ya no vale
+                self._stream_start = None
+                self.detach_history()
+            elif self._rotation is not None:
+                if activity != self._rotation[0]:
+                    self._rotation = None  # tail ya sigue al fichero nuevo
+                elif size > self._rotation[1]:
+                    # El fichero nuevo crece y no llega nada: tail se quedó atrás
+                    logger.warning(
+                        f"El stream de {self.service['log_path']} no siguió la rotación; reabriendo"
+                    )
+                    self._rotation = None
+                    self._from_start = True
+        if self.stream_ended and not self._from_start:
+            logger.warning(f"El stream de {self.service['log_path']} terminó; reabriendo")
+        if self.stream_ended or self._from_start:
+            self.start_stream(initial=False)
+        self.root.after(ROTATION_CHECK_MS, self.check_rotation)
+
+    def on_view_top(self):
+        self.load_older_history()
+
+    def load_older_history(self):
+        """
+        Pide en segundo plano la página anterior del historial.
+        """
+        pager = self.pager
+        if pager is None or pager.exhausted or self._loading_older:
+            return
+        self._loading_older = True
+
+        def fetch():
+            try:
+                pager.fetch_older()
+            except Exception as e:
+                logger.error(f"No se pudo leer el historial de {self.service['log_path']}: {e}")
+            self.root.after(0, self.history_loaded)
+
+        threading.Thread(target=fetch, daemon=True).start()
+
+    def load_history_page(self, page):
+        """
+        Vuelve a pedir una página desalojada de la caché al mostrarla.
+        """
+        pager = self.pager
+        if pager is None or page in self._loading_pages:
+            return
+        self._loading_pages.add(page)
+
+        def fetch():
+            try:
+                pager.load_page(page)
+            except Exception as e:
+                # La página queda marcada para no reintentarlo en cada redibujado
+                logger.error(f"No se pudo releer el historial de {self.service['log_path']}: {e}")
+                return
+            self.root.after(0, self.history_loaded, page)
+
+        threading.Thread(target=fetch, daemon=True).start()
+
+    def history_loaded(self, page=None):
+        if page is None:
+            self._loading_older = False
+        else:
+            self._loading_pages.discard(page)
+        if self.frame.winfo_exists():
+            self.log_text.render()
+            self.update_status()
+
+    def status_details(self):
+        if self.pager is None or not self.scrollback.history_visible:
+            return []
+        loaded = self.pager.end_offset - self.pager.start_offset
+        details = [
+            f"Historial: {self.pager.line_count} líneas "
+            f"({SystemInfo.format_bytes(loaded)} de {SystemInfo.format_bytes(self.pager.end_offset)})"
+        ]
+        if self._loading_older:
+            details.append("Cargando historial...")
+        return details
+
+
+def format_latency(seconds):
+    if seconds is None:
+        return "-"
+    return f"{seconds * 1000:.0f} ms" if seconds < 1 else f"{seconds:.2f} s"
+
+
+def format_analytics(stats, analytics):
+    """
+    Texto del panel de analítica a partir de AccessStats.snapshot().
+    """
+    classes = " · ".join(f"{name}: {share:.1f} %" for name, share in stats["classes"].items())
+    statuses = " · ".join(f"{status}: {count:,}" for status, count in stats["statuses"])
+    percentiles = stats["percentiles"]
+    lines = [
+        f"Peticiones/s ({analytics.rate_window} s): {stats['rate']:,.1f}   "
+        f"Peticiones ({analytics.window} s): {stats['requests']:,}   "
+        f"Tráfico: {SystemInfo.format_bytes(stats['bytes_rate'])}/s",
+        f"Latencia: p50 {format_latency(percentiles[0.5])} · "
+        f"p95 {format_latency(percentiles[0.95])} · p99 {format_latency(percentiles[0.99])}",
+        f"Clases: {classes or '-'}",
+        f"Estados: {statuses or '-'}",
+        "Rutas más pedidas:",
+    ]
+    lines.extend(f"  {count:>8,}  {path}" for path, count in stats["top_paths"])
+    if stats["unparsed"]:
+        lines.append(f"Líneas no reconocidas: {stats['unparsed']:,}")
+    return "\n".join(lines)
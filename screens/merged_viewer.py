@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: merged_viewer.py
+# Project: SSH-Sentinel
+# File Created: Sunday, 18th October 2026 9:40:18 pm
+# Author: Daniel Rodríguez Cabrera (daniel8rc@gmail.com)
+# Version: 1.0.0
+# -----
+# Last Modified: Sunday, 18th October 2026 9:40:18 pm
+# Modified By: Daniel Rodríguez Cabrera
+# -----
+# Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
+###
+import shlex
+import threading
+import tkinter as tk
+from array import array
+import customtkinter as ctk
+from loguru import logger
+from screens.base_screen import BaseScreen
+from screens.log_view import VirtualLogView
+from screens.stream_viewer import StreamViewer
+from utils.log_buffer import DEFAULT_MAX_LINES
+from utils.log_filter import CONTROL_PREFIX, REMOTE_STATS_PREFIX
+from utils.log_merge import REORDER_WINDOW, LogMerger
+from utils.log_severity import SeverityClassifier
+
+# Colores del prefijo de cada origen, por turnos
+SOURCE_COLORS = (
+    "#1f9ede", "#2ca02c", "#d62fb4", "#e07b00",
+    "#8c6bd6", "#17a69a", "#b5a300", "#c0504d",
+)
+
+# Origen de las líneas que no vienen de ninguno
+NO_SOURCE = 0xFFFF
+
+
+def source_label(source):
+    """
+    Nombre corto de un origen ("servidor/servicio"), que precede a sus líneas.
+    """
+    label = f"{source['server']['name']}/{source['service']['name']}"
+    return f"{label} (journal)" if source["kind"] == "journal" else label
+
+
+def source_command(source, initial):
+    """
+    Comando remoto que sigue el log de un origen.
+    """
+    lines = 10 if initial else 0
+    if source["kind"] == "journal":
+        # Marcas ISO con año, zona y microsegundos para ordenar bien
+        name = shlex.quote(source["service"]["name"])
+        return f"journalctl -n {lines} -fu {name} -o short-iso-precise"
+    return f"tail -n {lines} -F {shlex.quote(source['service']['log_path'])}"
+
+
+class MergedLogView(VirtualLogView):
+    """
+    Vista que antepone a cada línea `[origen]` con el color de su origen.
+
+    El prefijo no está en el texto del búfer, sobre el que se busca y se
+    filtra igual que en el servidor: se dibuja a partir del origen de cada
+    secuencia.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.prefixes = []  # (prefijo, etiqueta de color) de cada origen
+        self.sources = None  # Origen de cada secuencia, en la posición seq % capacidad
+        super().__init__(*args, **kwargs)
+
+    def line_chunks(self, line, tags, seq):
+        source = self.sources[seq % len(self.sources)] if self.sources else NO_SOURCE
+        if source >= len(self.prefixes):
+            return super().line_chunks(line, tags, seq)
+        prefix, tag = self.prefixes[source]
+        return prefix, tags + (tag,), f" {line}\n", tags
+
+
+class MergedLogViewer(StreamViewer):
+    """
+    Visor que sigue a la vez varios logs, de uno o varios servidores, y
+    muestra sus líneas intercaladas por marca de tiempo.
+
+    Cada origen tiene su propio canal y su clasificador de severidad;
+    las líneas pasan por un LogMerger, que las retiene como mucho
+    `reorder_window` segundos para colocarlas en orden, y de ahí al búfer
+    del visor, con su origen al lado. Búsqueda, filtros y contadores
+    funcionan como en un visor normal sobre el texto de las líneas, sin el
+    prefijo del origen.
+    """
+
+    title_prefix = "Vista combinada:"
+    view_class = MergedLogView
+
+    def __init__(self, root, sources, ssh_manager, on_back, settings=None):
+        settings = settings or {}
+        self.sources = sources
+        self.labels = [source_label(source) for source in sources]
+        self.merger = LogMerger(
+            len(sources), settings.get("reorder_window", REORDER_WINDOW)
+        )
+        self.classifiers = [
+            SeverityClassifier(source["service"].get("severity_patterns"))
+            for source in sources
+        ]
+        self.channels = {}
+        self._source_bytes = {}  # origen -> (recibidos, leídos en el servidor)
+        self._finished = set()
+        service = {
+            "name": ", ".join(self.labels),
+            "max_lines": settings.get("max_lines", DEFAULT_MAX_LINES),
+            "server_filter": settings.get("server_filter", False),
+        }
+        super().__init__(root, None, service, ssh_manager, on_back)
+
+    def setup_ui(self):
+        super().setup_ui()
+        self.sources_ring = array("H", [NO_SOURCE]) * self.buffer.capacity
+        self.log_text.sources = self.sources_ring
+        for index, label in enumerate(self.labels):
+            tag = f"source{index}"
+            self.log_text.tag_config(tag, foreground=SOURCE_COLORS[index % len(SOURCE_COLORS)])
+            self.log_text.prefixes.append((f"[{label}]", tag))
+
+    def open_stream(self, generation, initial):
+        previous, self.channels = self.channels, {}
+        for channel in previous.values():
+            channel.close()
+        self._source_bytes = {}
+        self._finished = set()
+        self.merger.restart()
+        for index in range(len(self.sources)):
+            threading.Thread(
+                target=self.fetch_source, args=(generation, index, initial), daemon=True
+            ).start()
+
+    def fetch_source(self, generation, index, initial):
+        """
+        Abre el log de un origen y deja su lectura al StreamReader compartido.
+        """
+        source, label = self.sources[index], self.labels[index]
+        try:
+            command = source_command(source, initial)
+            if self.server_filter:
+                command = self.filter.remote_command(command)
+            stdin, stdout, stderr = self.ssh_manager.open_stream(source["server"], command)
+            channel = stdout.channel
+            if generation != self._stream_generation or self.closed:
+                channel.close()
+                return
+            self.channels[index] = self.ssh_manager.stream_reader.add(
+                channel,
+                lambda lines, size: self.receive_source(generation, index, lines, size),
+                lambda: self.source_closed(generation, index),
+            )
+        except Exception as e:
+            if generation != self._stream_generation:
+                return
+            logger.error(f"No se pudo leer el stream de {label}: {e}")
+            message = f"Error al obtener los logs: {e}"
+            self.merger.push(index, [(message, (message, "error", index))])
+            self.source_closed(generation, index)
+
+    def receive_source(self, generation, index, lines, size):
+        """
+        Pasa un trozo de líneas de un origen, ya clasificadas, al LogMerger.
+        """
+        if generation != self._stream_generation:
+            return
+        classify = self.classifiers[index].classify
+        received, remote = self._source_bytes.get(index, (0, 0))
+        received += size
+        entries = []
+        for line in lines:
+            if line.startswith(CONTROL_PREFIX):
+                received -= len(line.encode()) + 1
+                if line.startswith(REMOTE_STATS_PREFIX):
+                    remote = int(line[len(REMOTE_STATS_PREFIX):])
+                continue
+            entries.append((line, (line, classify(line), index)))
+        self._source_bytes[index] = (received, remote)
+        if remote:
+            counts = list(self._source_bytes.values())
+            self._stream_received_bytes = sum(count[0] for count in counts)
+            self._stream_remote_bytes = sum(count[1] for count in counts)
+        self.merger.push(index, entries)
+
+    def source_closed(self, generation, index):
+        if generation == self._stream_generation:
+            # Un origen terminado no debe retener a los demás
+            self.merger.finish(index)
+            if not self.closed:
+                self.root.after(0, self.source_ended, generation, index)
+
+    def source_ended(self, generation, index):
+        if generation != self._stream_generation or self.closed:
+            return
+        logger.info(f"El stream de {self.labels[index]} ha terminado")
+        self._finished.add(index)
+        if len(self._finished) == len(self.sources):
+            self.on_stream_end(generation)
+
+    def drain_queue(self):
+        ready = self.merger.pop_ready()
+        if ready and self.frame.winfo_exists():
+            # Directamente al búfer (no por la cola) para anotar el origen
+            # de cada secuencia; el exceso se descarta como en la cola
+            excess = len(ready) - self.queue.max_depth
+            if excess > 0:
+                ready = ready[excess:]
+                self.queue.dropped += excess
+            sources, capacity = self.sources_ring, self.buffer.capacity
+            seq = self.buffer.next_seq
+            for line, tag, index in ready:
+                sources[seq % capacity] = index
+                seq += 1
+            self.add_items([(line, tag) for line, tag, index in ready])
+        super().drain_queue()
+
+    def status_details(self):
+        details = [
+            f"Orígenes: {len(self.sources) - len(self._finished)}/{len(self.sources)}",
+            f"Reordenando: {len(self.merger)}",
+        ]
+        if self.merger.late:
+            details.append(f"Fuera de orden: {self.merger.late}")
+        return details
+
+    def close_stream(self):
+        super().close_stream()
+        for channel in list(self.channels.values()):
+            channel.close()
+
+
+class MergedSourcesScreen(BaseScreen):
+    """
+    Pantalla para elegir los logs, de cualquier servidor, que se combinan.
+    """
+
+    def __init__(self, root, servers, ssh_manager, on_back, settings=None, selected=()):
+        super().__init__(root)
+        self.servers = servers
+        self.ssh_manager = ssh_manager
+        self.on_back = on_back
+        self.settings = settings
+        self.selected = set(selected)  # Orígenes marcados la última vez
+        self.choices = []  # (origen, variable de su casilla)
+
+        self.setup_ui()
+
+    def setup_ui(self):
+        """
+        Configura los elementos de la interfaz de usuario.
+        """
+        self.frame = ctk.CTkFrame(self.root)
+        self.frame.pack(fill="both", expand=True, padx=20, pady=20)
+
+        title = ctk.CTkLabel(
+            self.frame,
+            text="Vista combinada de logs",
+            font=("Helvetica", 18, "bold"),
+        )
+        title.pack(pady=10)
+
+        subtitle = ctk.CTkLabel(
+            self.frame,
+            text="Seleccione los logs que se mostrarán intercalados por hora:",
+            font=("Helvetica", 14),
+        )
+        subtitle.pack(pady=5)
+
+        sources_frame = ctk.CTkScrollableFrame(self.frame)
+        sources_frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        for server in self.servers:
+            server_label = ctk.CTkLabel(
+                sources_frame, text=server["name"], font=("Helvetica", 14, "bold")
+            )
+            server_label.pack(anchor="w", pady=(10, 2))
+            for service in server.get("services", []):
+                for kind in ("file", "journal"):
+                    if kind == "file" and not service.get("log_path"):
+                        continue
+                    source = {"server": server, "service": service, "kind": kind}
+                    detail = service["log_path"] if kind == "file" else "journalctl"
+                    variable = tk.BooleanVar(value=source_label(source) in self.selected)
+                    check = ctk.CTkCheckBox(
+                        sources_frame,
+                        text=f"{service['name']} · {detail}",
+                        variable=variable,
+                    )
+                    check.pack(anchor="w", padx=20, pady=2)
+                    self.choices.append((source, variable))
+
+        self.message_label = ctk.CTkLabel(self.frame, text="", text_color="orange")
+        self.message_label.pack()
+
+        open_btn = ctk.CTkButton(
+            self.frame,
+            text="Abrir vista combinada",
+            command=self.open_merged,
+            font=("Helvetica", 14),
+        )
+        open_btn.pack(pady=5, fill="x")
+
+        back_btn = ctk.CTkButton(
+            self.frame,
+            text="Volver",
+            command=self.on_back,
+            font=("Helvetica", 14),
+        )
+        back_btn.pack(pady=20)
+
+    def open_merged(self):
+        """
+        Abre el visor combinado con los logs marcados.
+        """
+        sources = [source for source, variable in self.choices if variable.get()]
+        if not sources:
+            self.message_label.configure(text="Seleccione al menos un log")
+            return
+        selected = {source_label(source) for source in sources}
+        MergedLogViewer(
+            self.root,
+            sources,
+            self.ssh_manager,
+            lambda: MergedSourcesScreen(
+                self.root, self.servers, self.ssh_manager, self.on_back, self.settings, selected
+            ),
+            self.settings,
+        )
@@ -22,10 +22,14 @@ class ServerSelectionScreen(BaseScreen):
     Pantalla para seleccionar un servidor al cual conectar.
     """
 
-    def __init__(self, root, servers, on_server_selected):
+    def __init__(
+        self, root, servers, on_server_selected, on_fleet_selected=None, on_merged_selected=None
+    ):
         super().__init__(root)
         self.servers = servers
         self.on_server_selected = on_server_selected
+        self.on_fleet_selected = on_fleet_selected
+        self.on_merged_selected = on_merged_selected
         self.setup_ui()
 
     def setup_ui(self):
@@ -42,6 +46,24 @@ class ServerSelectionScreen(BaseScreen):
         )
         title.pack(pady=20)
 
+        if self.on_fleet_selected is not None:
+            fleet_btn = ctk.CTkButton(
+                self.frame,
+                text="Vista de flota",
+                command=self.on_fleet_selected,
+                font=("Helvetica", 14, "bold"),
+            )
+            fleet_btn.pack(pady=10, padx=20, fill="x")
+
+        if self.on_merged_selected is not None:
+            merged_btn = ctk.CTkButton(
+                self.frame,
+                text="Vista combinada de logs",
+                command=self.on_merged_selected,
+                font=("Helvetica", 14, "bold"),
+            )
+            merged_btn.pack(pady=10, padx=20, fill="x")
+
         for server in self.servers:
             btn = ctk.CTkButton(
                 self.frame,
@@ -12,12 +12,13 @@
 # -----
 # Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
 ###
-import threading
-import time
 import customtkinter as ctk
 from screens.base_screen import BaseScreen
 from loguru import logger
-from utils.system_info import SystemInfo
+from utils.metrics_store import sparkline
+from utils.metrics_stream import MetricsStreamer
+from utils.scheduler import bind_destroy
+from utils.system_info import SYSTEM_INFO_COMMAND, SystemInfo
 
 
 class ServerStatusScreen(BaseScreen):
@@ -25,14 +26,26 @@ class ServerStatusScreen(BaseScreen):
     Pantalla que muestra el estado después de conectar a un servidor.
     """
 
-    def __init__(self, root, server, ssh_manager, on_services_button_clicked):
+    def __init__(
+        self,
+        root,
+        server,
+        ssh_manager,
+        scheduler,
+        metrics_store,
+        on_services_button_clicked,
+    ):
         super().__init__(root)
         self.server = server
         self.ssh_manager = ssh_manager
+        self.scheduler = scheduler
+        self.metrics_store = metrics_store
         self.on_services_button_clicked = on_services_button_clicked
 
         self.status_label = None
         self.services_btn = None
+        # Recuerda la muestra anterior para calcular el uso de CPU
+        self.system_info = SystemInfo()
 
         self.setup_ui()
         self.connect_ssh()
@@ -58,6 +71,15 @@ class ServerStatusScreen(BaseScreen):
         )
         self.status_label.pack(pady=10)
 
+        # Historial reciente de carga, CPU y memoria
+        self.history_label = ctk.CTkLabel(
+            self.frame,
+            text="",
+            font=("Courier", 13),
+            justify="left",
+        )
+        self.history_label.pack(pady=10)
+
         self.services_btn = ctk.CTkButton(
             self.frame,
             text="Servicios",
@@ -72,55 +94,134 @@ class ServerStatusScreen(BaseScreen):
         Inicia la conexión SSH al servidor.
         """
         self.ssh_manager.connect(
-            self.server, on_success=self.on_ssh_connected, on_failure=self.on_ssh_failed
+            self.server,
+            on_success=lambda: self.root.after(0, self.on_ssh_connected),
+            on_failure=lambda: self.root.after(0, self.on_ssh_failed),
         )
 
     def on_ssh_connected(self):
         """
         Callback cuando la conexión SSH es exitosa.
         """
+        if not self.frame.winfo_exists():
+            return
         self.status_label.configure(text=f"Conectado a {self.server['name']}")
         self.services_btn.configure(state="normal")
-        self.start_system_status_thread()
+        if self.server.get("metrics_stream"):
+            self.start_metrics_stream()
+        else:
+            self.start_system_status_job()
 
     def on_ssh_failed(self):
         """
         Callback cuando la conexión SSH falla.
         """
+        if not self.frame.winfo_exists():
+            return
         self.status_label.configure(text=f"No se pudo conectar a {self.server['name']}")
         self.services_btn.configure(state="disabled")
 
-    def start_system_status_thread(self):
+    def start_system_status_job(self):
         """
-        Inicia un hilo para actualizar el estado del sistema periódicamente.
+        Programa la actualización periódica del estado del sistema.
+
+        El trabajo se comparte con otras pestañas del mismo servidor y se
+        cancela al destruir la pantalla.
         """
-        threading.Thread(target=self.update_system_status, daemon=True).start()
+        self.scheduler.schedule(
+            ("system_status", self.server["name"]),
+            self.fetch_system_status,
+            lambda result: self.root.after(0, self.show_system_status, result),
+            metric="system_status",
+            on_error=lambda e: logger.error(
+                f"No se pudo obtener el estado del sistema: {e}"
+            ),
+            owner=self.frame,
+        )
 
-    def update_system_status(self):
+    def start_metrics_stream(self):
         """
-        Actualiza la información del estado del sistema periódicamente.
+        Recibe las métricas por un único canal continuo en lugar de sondear.
         """
-        while True:
-            stdin, stdout, stderr = self.ssh_manager.execute_command(
-                "cat /proc/uptime; cat /proc/meminfo; cat /proc/loadavg"
+        streamer = MetricsStreamer(
+            self.ssh_manager,
+            self.server,
+            on_sample=lambda state: self.root.after(
+                0,
+                self.show_system_status,
+                (
+                    self.record_sample(
+                        self.system_info.update(SystemInfo.from_sampler_state(state))
+                    ),
+                    self.ssh_manager.channel_occupancy(self.server),
+                ),
+            ),
+            interval=self.server.get("sample_interval", 1.0),
+        )
+        bind_destroy(self.frame, streamer.stop)
+        streamer.start()
+
+    def fetch_system_status(self):
+        """
+        Obtiene el estado del sistema del servidor (se ejecuta en un hilo de trabajo).
+        """
+        exit_status, output, error = self.ssh_manager.run_command(
+            self.server, SYSTEM_INFO_COMMAND
+        )
+        return self.record_sample(self.system_info.sample(output)), self.ssh_manager.channel_occupancy(self.server)
+
+    def record_sample(self, info):
+        """
+        Guarda la muestra en el historial de métricas del servidor.
+        """
+        self.metrics_store.record(self.server["name"], info)
+        return info
+
+    def show_history(self, seconds=600, width=60):
+        """
+        Dibuja las sparklines de los últimos `seconds` segundos.
+        """
+        name = self.server["name"]
+        lines = []
+        for label, metric, low, high, unit in (
+            ("Carga 1m", "load_1", 0, None, ""),
+            ("CPU", "cpu", 0, 100, " %"),
+            ("Memoria", "mem_percent", 0, 100, " %"),
+        ):
+            times, values = self.metrics_store.series(name, metric, seconds)
+            values = [value for value in values if value == value]
+            if not values:
+                continue
+            lines.append(
+                f"{label:<9}{sparkline(values, width, low, high):<{width}} {values[-1]:.2f}{unit}"
             )
-            if stdout:
-                output = stdout.read().decode()
-                system_info = SystemInfo.parse_system_info(output)
-
-                formatted_output = (
-                    f"{'Información del Sistema':^40}\n"
-                    f"{'-'*40}\n"
-                    f"{'Memoria Total':<15}: {system_info['total_memory']}\n"
-                    f"{'Memoria Usada':<15}: {system_info['used_memory']}\n"
-                    f"{'Memoria Libre':<15}: {system_info['free_memory']}\n"
-                    f"{'Promedio de Carga':<15}: 1min={system_info['load_average']['1min']}, "
-                    f"5min={system_info['load_average']['5min']}, "
-                    f"15min={system_info['load_average']['15min']}\n"
-                    f"{'-'*40}"
-                )
-                if self.status_label.winfo_exists():
-                    self.status_label.configure(text=formatted_output)
-            else:
-                logger.error("No se pudo obtener el estado del sistema.")
-            time.sleep(5)  # Actualizar cada 5 segundos
+        if lines and self.history_label.winfo_exists():
+            self.history_label.configure(
+                text=f"Últimos {seconds // 60} min\n" + "\n".join(lines)
+            )
+
+    def show_system_status(self, result):
+        """
+        Muestra el estado del sistema en la etiqueta.
+        """
+        info, occupancy = result
+        system_info = SystemInfo.format_system_info(info)
+        formatted_output = (
+            f"{'Información del Sistema':^40}\n"
+            f"{'-'*40}\n"
+            f"{'Memoria Total':<15}: {system_info['total_memory']}\n"
+            f"{'Memoria Usada':<15}: {system_info['used_memory']}\n"
+            f"{'Memoria Libre':<15}: {system_info['free_memory']}\n"
+            f"{'Promedio de Carga':<15}: 1min={system_info['load_average']['1min']}, "
+            f"5min={system_info['load_average']['5min']}, "
+            f"15min={system_info['load_average']['15min']}\n"
+            f"{'Uso de CPU':<15}: {system_info['cpu']}\n"
+            f"{'Canales SSH':<15}: "
+            f"cortos {occupancy['short_in_use']}/{occupancy['short_limit']} "
+            f"(en cola {occupancy['short_waiting']}), "
+            f"streaming {occupancy['streams_in_use']}/{occupancy['stream_limit']}\n"
+            f"{'-'*40}"
+        )
+        if self.status_label.winfo_exists():
+            self.status_label.configure(text=formatted_output)
+            self.show_history()
@@ -12,10 +12,9 @@
 # -----
 # Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
 ###
+import threading
 import customtkinter as ctk
 from screens.base_screen import BaseScreen
-from screens.journal_viewer import JournalViewer
-from screens.log_viewer import LogViewer
 from loguru import logger
 
 
@@ -24,11 +23,13 @@ class ServiceSubmenuScreen(BaseScreen):
     Pantalla que muestra las opciones para un servicio seleccionado.
     """
 
-    def __init__(self, root, service, ssh_manager, on_back):
+    def __init__(self, root, server, service, ssh_manager, on_back, spool=None):
         super().__init__(root)
+        self.server = server
         self.service = service
         self.ssh_manager = ssh_manager
         self.on_back = on_back
+        self.spool = spool  # LogSpool opcional donde se guardan los logs vistos
 
         self.setup_ui()
 
@@ -54,6 +55,14 @@ class ServiceSubmenuScreen(BaseScreen):
         )
         btn_logs.pack(pady=5, fill="x")
 
+        btn_archive = ctk.CTkButton(
+            self.frame,
+            text="Ver Histórico",
+            command=self.view_archive,
+            font=("Helvetica", 14),
+        )
+        btn_archive.pack(pady=5, fill="x")
+
         btn_journalctl = ctk.CTkButton(
             self.frame,
             text="Ver Journalctl",
@@ -98,31 +107,66 @@ class ServiceSubmenuScreen(BaseScreen):
         """
         Abre el visor de logs para los logs del servicio.
         """
-        LogViewer(self.root, self.service, self.ssh_manager, self.on_back)
+        # Los visores se cargan la primera vez que se abren
+        from screens.log_viewer import LogViewer
+
+        LogViewer(
+            self.root, self.server, self.service, self.ssh_manager, self.on_back, self.spool
+        )
+
+    def view_archive(self):
+        """
+        Abre el histórico del log del servicio, incluidas sus rotaciones.
+        """
+        from screens.archive_viewer import ArchiveLogViewer
+
+        ArchiveLogViewer(self.root, self.server, self.service, self.ssh_manager, self.on_back)
 
     def view_journalctl(self):
         """
         Abre el visor de journalctl para los logs del servicio.
         """
-        JournalViewer(self.root, self.service, self.ssh_manager, self.on_back)
+        from screens.journal_viewer import JournalViewer
+
+        JournalViewer(
+            self.root, self.server, self.service, self.ssh_manager, self.on_back, self.spool
+        )
+
+    def run_systemctl(self, action):
+        """
+        Ejecuta una acción de systemctl sobre el servicio en segundo plano.
+        """
+
+        def threaded_action():
+            command = f'echo {self.server["password"]} | sudo -S systemctl {action} {self.service["name"]}'
+            try:
+                # Canal propio: la sesión de shell descarta stderr
+                exit_status, output, error = self.ssh_manager.run_command(
+                    self.server, command, session=False
+                )
+                if exit_status != 0:
+                    logger.error(
+                        f"systemctl {action} {self.service['name']} falló: {error.strip()}"
+                    )
+            except Exception as e:
+                logger.error(f"No se pudo ejecutar systemctl {action}: {e}")
+
+        threading.Thread(target=threaded_action, daemon=True).start()
 
     def restart_service(self):
         """
         Reinicia el servicio.
         """
-        command = f'echo {self.ssh_manager.current_server["password"]} | sudo -S systemctl restart {self.service["name"]}'
-        self.ssh_manager.execute_command(command)
+        self.run_systemctl("restart")
 
     def stop_service(self):
         """
         Detiene el servicio.
         """
-        command = f'echo {self.ssh_manager.current_server["password"]} | sudo -S systemctl stop {self.service["name"]}'
-        self.ssh_manager.execute_command(command)
+        self.run_systemctl("stop")
 
     def start_service(self):
         """
         Inicia el servicio.
         """
-        command = f'echo {self.ssh_manager.current_server["password"]} | sudo -S systemctl start {self.service["name"]}'
-        self.ssh_manager.execute_command(command)
+        self.run_systemctl("start")
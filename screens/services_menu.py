@@ -12,11 +12,12 @@
 # -----
 # Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
 ###
-import threading
-import time
 import customtkinter as ctk
 from screens.base_screen import BaseScreen
 from loguru import logger
+from services.unit_events import UnitEventTracker
+from services.unit_status import UnitStatusCollector, describe_unit
+from utils.scheduler import bind_destroy
 
 
 class ServicesMenuScreen(BaseScreen):
@@ -24,14 +25,22 @@ class ServicesMenuScreen(BaseScreen):
     Pantalla que muestra la lista de servicios del servidor.
     """
 
-    def __init__(self, root, server, ssh_manager, on_service_selected, on_back):
+    def __init__(
+        self, root, server, ssh_manager, scheduler, on_service_selected, on_back
+    ):
         super().__init__(root)
         self.server = server
         self.ssh_manager = ssh_manager
+        self.scheduler = scheduler
         self.on_service_selected = on_service_selected
         self.on_back = on_back
+        self.status_labels = {}
 
         self.setup_ui()
+        if self.server.get("unit_events"):
+            self.start_event_tracking()
+        else:
+            self.start_status_job()
 
     def setup_ui(self):
         """
@@ -56,11 +65,7 @@ class ServicesMenuScreen(BaseScreen):
                 fg_color="red",
             )
             service_status_label.pack(pady=5)
-            threading.Thread(
-                target=self.update_service_status,
-                args=(service, service_status_label),
-                daemon=True,
-            ).start()
+            self.status_labels[service_name] = service_status_label
 
             btn = ctk.CTkButton(
                 self.frame,
@@ -78,28 +83,62 @@ class ServicesMenuScreen(BaseScreen):
         )
         back_btn.pack(pady=20)
 
-    def update_service_status(self, service, label):
+    def start_status_job(self):
         """
-        Actualiza el estado de un servicio periódicamente.
+        Programa la consulta periódica del estado de todos los servicios.
         """
-        while True:
-            try:
-                stdin, stdout, stderr = self.ssh_manager.execute_command(
-                    f"systemctl is-active {service['name']}"
-                )
-                status = stdout.read().decode().strip()
-                if status == "active":
-                    if label.winfo_exists():
-                        label.configure(
-                            fg_color="green", text=f"{service['name']}: Activo"
-                        )
-                else:
-                    if label.winfo_exists():
-                        label.configure(
-                            fg_color="red", text=f"{service['name']}: Inactivo"
-                        )
-            except Exception as e:
-                logger.error(
-                    f"No se pudo actualizar el estado del servicio {service['name']}: {e}"
-                )
-            time.sleep(5)
+        units = list(self.status_labels)
+        collector = UnitStatusCollector(self.ssh_manager, self.server, units)
+        self.scheduler.schedule(
+            ("service_status", self.server["name"], tuple(units)),
+            collector.poll,
+            lambda states: self.root.after(0, self.apply_service_states, states),
+            metric="service_status",
+            on_error=self.on_status_error,
+            owner=self.frame,
+        )
+
+    def on_status_error(self, error):
+        """
+        Registra el fallo de la consulta y lo muestra en las etiquetas.
+        """
+        logger.error(
+            f"No se pudo actualizar el estado de los servicios de {self.server['name']}: {error}"
+        )
+        self.root.after(0, self.apply_service_error, error)
+
+    def start_event_tracking(self):
+        """
+        Sigue el estado de los servicios por eventos D-Bus en lugar de sondear.
+        """
+        tracker = UnitEventTracker(
+            self.ssh_manager,
+            self.server,
+            list(self.status_labels),
+            on_update=lambda states: self.root.after(
+                0, self.apply_service_states, states
+            ),
+        )
+        bind_destroy(self.frame, tracker.stop)
+        tracker.start()
+
+    def apply_service_states(self, states):
+        """
+        Reparte la tabla de estados entre las etiquetas de los servicios.
+        """
+        for name, label in self.status_labels.items():
+            state = states.get(name)
+            if state is None or not label.winfo_exists():
+                continue
+            label.configure(
+                fg_color="green" if state["active_state"] == "active" else "red",
+                text=describe_unit(name, state),
+            )
+
+    def apply_service_error(self, error):
+        """
+        Marca todas las etiquetas como erróneas.
+        """
+        for name, label in self.status_labels.items():
+            if label.winfo_exists():
+                label.configure(fg_color="gray", text=f"{name}: Error ({error})")
@@ -0,0 +1,660 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: stream_viewer.py
+# Project: SSH-Sentinel
+# File Created: Sunday, 18th October 2026 4:10:05 pm
+# Author: Daniel Rodríguez Cabrera (daniel8rc@gmail.com)
+# Version: 1.0.0
+# -----
+# Last Modified: Sunday, 18th October 2026 4:10:05 pm
+# Modified By: Daniel Rodríguez Cabrera
+# -----
+# Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
+###
+import bisect
+import queue
+import re
+import threading
+import customtkinter as ctk
+from screens.base_screen import BaseScreen
+from loguru import logger
+from screens.log_view import VirtualLogView
+from utils.line_queue import LineQueue
+from utils.log_buffer import DEFAULT_MAX_LINES, LogBuffer
+from utils.log_filter import (
+    CONTROL_PREFIX,
+    FILTER_MODES,
+    REMOTE_STATS_PREFIX,
+    FilterRule,
+    LogFilter,
+)
+from utils.log_index import TokenIndex
+from utils.log_pager import ScrollbackBuffer
+from utils.log_severity import SeverityClassifier, SeverityStats
+from utils.scheduler import bind_destroy
+from utils.system_info import SystemInfo
+import tkinter as tk  # Importamos tkinter para usar Listbox
+
+# Intervalo entre vaciados de la cola (ms): como mucho un redibujado por fotograma
+DRAIN_INTERVAL_MS = 30
+
+# Espera tras el último cambio de filtros antes de reiniciar el stream remoto (ms)
+RESTART_DELAY_MS = 500
+
+
+class StreamViewer(BaseScreen):
+    """
+    Base de los visores que muestran la salida continua de un comando remoto.
+
+    El canal lo lee el StreamReader compartido del SSHConnectionManager, que
+    entrega las líneas por trozos: se clasifican y se dejan en una LineQueue
+    con una sola operación por trozo. La interfaz vacía la cola cada
+    DRAIN_INTERVAL_MS con una única inserción en el búfer y un único
+    redibujado, sin importar cuántas líneas lleguen.
+
+    El búfer guarda todas las líneas; el filtro activo decide qué secuencias
+    se muestran (`rows`), de modo que al cambiarlo se vuelve a filtrar todo el
+    historial en segundo plano.
+
+    Las líneas se indexan en un hilo aparte según llegan (TokenIndex) para
+    buscar en todo el historial sin recorrerlo.
+
+    Con un LogSpool, lo recibido se guarda también en disco: al reabrir el
+    visor se muestra al momento lo guardado y el stream continúa desde el
+    punto de reanudación que aporta la subclase (`resume_point`).
+
+    Con el filtrado en el servidor activado, los filtros se aplican también
+    en origen con awk y el stream se reinicia al cambiarlos; el filtro local
+    se sigue aplicando, así que el resultado es el mismo con menos tráfico.
+    """
+
+    title_prefix = "Logs de"
+    view_class = VirtualLogView
+
+    def __init__(self, root, server, service, ssh_manager, on_back, spool=None):
+        super().__init__(root)
+        self.server = server
+        self.service = service
+        self.ssh_manager = ssh_manager
+        self.on_back = on_back
+
+        source = self.spool_key()
+        self.spool_stream = spool.open(server["name"], source) if spool and source else None
+        self.restored_lines = 0
+        # Punto de reanudación guardado la última vez (lo interpreta la subclase)
+        self.resume_state = self.spool_stream.resume if self.spool_stream else None
+        # Punto de reanudación de la última línea entregada al spool
+        self._spool_resume = self.resume_state
+
+        self.font_size = 14
+        # Memoria acotada: solo se conservan las últimas `max_lines` líneas
+        self.buffer = LogBuffer(service.get("max_lines", DEFAULT_MAX_LINES))
+        self.queue = LineQueue(service.get("max_queue", 50_000))
+        self.classifier = SeverityClassifier(service.get("severity_patterns"))
+        self.severity = SeverityStats()
+        self.index = TokenIndex(self.buffer)
+        # Lo que muestra la vista: el búfer y, si la subclase lo añade, el historial
+        self.scrollback = ScrollbackBuffer(self.buffer)
+        self._index_queue = queue.SimpleQueue()
+        self.search_hits = []
+        self._hit_position = -1
+
+        self.filter = LogFilter()
+        self.rows = None  # Secuencias que pasan el filtro; None = sin filtro
+        self._filter_generation = 0
+        self._pending_rows = None  # Filas nuevas mientras se refiltra el historial
+        self.current_filters = []  # Lista de FilterRule activos
+
+        self.server_filter = bool(service.get("server_filter", False))
+        self._stream_generation = 0
+        self._restart_job = None
+        # Bytes leídos en origen y recibidos por los streams filtrados en el
+        # servidor: acumulado de los ya cerrados y parcial del actual
+        self.remote_bytes = self.received_bytes = 0
+        self._stream_remote_bytes = self._stream_received_bytes = 0
+        self.stream_bytes = 0  # Bytes de log recibidos por el stream actual
+        self.stream_filtered = False  # El stream actual se filtra en el servidor
+        # Conversión opcional de cada línea recibida (None = descartarla)
+        self.transform = None
+
+        self.channel = None
+        self.closed = False
+        self.stream_ended = False  # El comando remoto terminó por su cuenta
+
+        self.setup_ui()
+        # Cerrar el canal al salir del visor termina la lectura y libera la plaza
+        bind_destroy(self.frame, self.close_stream)
+        threading.Thread(target=self.run_indexer, daemon=True).start()
+        if self.spool_stream is not None:
+            self.restore_spool()
+        self.start_stream(initial=True)
+        self.root.after(DRAIN_INTERVAL_MS, self.drain_queue)
+
+    def setup_ui(self):
+        """
+        Configura los elementos de la interfaz de usuario.
+        """
+        self.frame = ctk.CTkFrame(self.root)
+        self.frame.pack(fill="both", expand=True, padx=20, pady=20)
+
+        title = ctk.CTkLabel(
+            self.frame,
+            text=f"{self.title_prefix} {self.service['name']}",
+            font=("Helvetica", 18, "bold"),
+        )
+        title.pack(pady=10)
+
+        self.severity_label = ctk.CTkLabel(self.frame, text="", font=("Helvetica", 13))
+        self.severity_label.pack()
+
+        self.status_label = ctk.CTkLabel(self.frame, text="", font=("Helvetica", 12))
+        self.status_label.pack()
+
+        # Área de texto: solo se dibujan las líneas visibles del búfer
+        log_text_frame = ctk.CTkFrame(self.frame)
+        log_text_frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        self.log_text = self.view_class(
+            log_text_frame, self.scrollback, self.font_size, on_top=self.on_view_top
+        )
+        self.log_text.pack(fill="both", expand=True)
+
+        # Configuración de resaltado de texto, una etiqueta por severidad
+        self.log_text.tag_config("critical", foreground="magenta")
+        self.log_text.tag_config("error", foreground="red")
+        self.log_text.tag_config("warning", foreground="orange")
+        self.log_text.tag_config("info", foreground="blue")
+        self.log_text.tag_config("debug", foreground="gray")
+        self.log_text.tag_config(VirtualLogView.MARK_TAG, background="#5a5a00")
+
+        self.setup_controls()
+
+    def setup_controls(self):
+        """
+        Controles bajo el área de texto; las subclases añaden los suyos.
+        """
+        self.setup_search_controls()
+        self.setup_filter_controls()
+
+        back_btn = ctk.CTkButton(
+            self.frame,
+            text="Volver",
+            command=self.on_back,
+            font=("Helvetica", 14),
+        )
+        back_btn.pack(pady=20)
+
+    def setup_search_controls(self):
+        """
+        Búsqueda en el historial con saltos al resultado anterior y siguiente.
+        """
+        search_frame = ctk.CTkFrame(self.frame)
+        search_frame.pack(pady=5)
+
+        search_label = ctk.CTkLabel(search_frame, text="Buscar:")
+        search_label.pack(side="left", padx=5)
+
+        self.search_entry = ctk.CTkEntry(
+            search_frame, width=260, placeholder_text="términos, prefijo*"
+        )
+        self.search_entry.pack(side="left", padx=5)
+        self.search_entry.bind("<Return>", lambda event: self.search())
+
+        search_button = ctk.CTkButton(search_frame, text="Buscar", command=self.search)
+        search_button.pack(side="left", padx=5)
+
+        previous_button = ctk.CTkButton(
+            search_frame, text="Anterior", width=80, command=lambda: self.jump_to_hit(-1)
+        )
+        previous_button.pack(side="left", padx=5)
+
+        next_button = ctk.CTkButton(
+            search_frame, text="Siguiente", width=80, command=lambda: self.jump_to_hit(1)
+        )
+        next_button.pack(side="left", padx=5)
+
+        self.search_label = ctk.CTkLabel(search_frame, text="")
+        self.search_label.pack(side="left", padx=5)
+
+    def search(self):
+        """
+        Busca en el índice las líneas con todos los términos y salta a la última.
+        """
+        hits = self.index.search(self.search_entry.get())
+        if self.rows is not None:
+            # Solo cuentan las líneas que deja ver el filtro
+            visible = set(self.rows)
+            hits = [seq for seq in hits if seq in visible]
+        self.search_hits = hits
+        self._hit_position = len(hits)
+        if hits:
+            self.jump_to_hit(-1)
+        else:
+            self.log_text.mark(None)
+            self.search_label.configure(text="Sin resultados")
+
+    def jump_to_hit(self, step):
+        """
+        Muestra el resultado anterior (-1) o siguiente (1) de la búsqueda.
+        """
+        # Los resultados desalojados del búfer ya no se pueden mostrar
+        evicted = bisect.bisect_left(self.search_hits, self.buffer.first_seq)
+        if evicted:
+            del self.search_hits[:evicted]
+            self._hit_position -= evicted
+        if not self.search_hits:
+            return
+        position = min(max(self._hit_position + step, 0), len(self.search_hits) - 1)
+        self._hit_position = position
+        seq = self.search_hits[position]
+        self.log_text.mark(seq)
+        # Unas líneas de contexto por encima del resultado
+        self.log_text.scroll_to(seq)
+        self.log_text.scroll(-min(3, self.log_text.index_of(seq)))
+        self.search_label.configure(text=f"{position + 1} de {len(self.search_hits)}")
+
+    def run_indexer(self):
+        """
+        Hilo que indexa las líneas recibidas hasta que se cierra el visor.
+        """
+        while True:
+            batch = self._index_queue.get()
+            if batch is None:
+                return
+            self.index.add(*batch)
+
+    def setup_filter_controls(self):
+        """
+        Entrada y lista de filtros, y la opción de filtrar en el servidor.
+        """
+        # Frame para los filtros
+        filter_frame = ctk.CTkFrame(self.frame)
+        filter_frame.pack(pady=10)
+
+        filter_label = ctk.CTkLabel(filter_frame, text="Agregar filtro:")
+        filter_label.pack(side="left", padx=5)
+
+        self.filter_entry = ctk.CTkEntry(filter_frame, width=200)
+        self.filter_entry.pack(side="left", padx=5)
+        self.filter_entry.bind("<Return>", lambda event: self.add_filter())
+
+        self.filter_mode = ctk.CTkOptionMenu(
+            filter_frame, values=list(FILTER_MODES.values()), width=140
+        )
+        self.filter_mode.pack(side="left", padx=5)
+
+        add_filter_button = ctk.CTkButton(
+            filter_frame, text="Agregar", command=self.add_filter
+        )
+        add_filter_button.pack(side="left", padx=5)
+
+        # Listbox para mostrar los filtros actuales
+        self.filter_listbox = tk.Listbox(filter_frame, height=5)
+        self.filter_listbox.pack(side="left", padx=5)
+
+        remove_filter_button = ctk.CTkButton(
+            filter_frame, text="Eliminar Seleccionado", command=self.remove_filter
+        )
+        remove_filter_button.pack(side="left", padx=5)
+
+        self.server_filter_var = tk.BooleanVar(value=self.server_filter)
+        server_filter_check = ctk.CTkCheckBox(
+            filter_frame,
+            text="Filtrar en el servidor",
+            variable=self.server_filter_var,
+            command=self.toggle_server_filter,
+        )
+        server_filter_check.pack(side="left", padx=5)
+
+    def add_filter(self):
+        """
+        Agrega un filtro a la lista de filtros actuales.
+        """
+        filter_text = self.filter_entry.get().strip()
+        if filter_text:
+            label = self.filter_mode.get()
+            mode = next(m for m, text in FILTER_MODES.items() if text == label)
+            rules = self.current_filters + [FilterRule(filter_text, mode)]
+            try:
+                log_filter = LogFilter(rules)
+            except re.error as e:
+                logger.warning(f"Filtro no válido '{filter_text}': {e}")
+                self.status_label.configure(text=f"Expresión regular no válida: {e}")
+                return
+            self.current_filters = rules
+            self.filter_listbox.insert('end', f"{label}: {filter_text}")
+            self.filter_entry.delete(0, 'end')
+            self.set_filter(log_filter)
+
+    def remove_filter(self):
+        """
+        Elimina el filtro seleccionado de la lista.
+        """
+        selected_indices = self.filter_listbox.curselection()
+        for index in reversed(selected_indices):
+            self.current_filters.pop(index)
+            self.filter_listbox.delete(index)
+        if selected_indices:
+            self.set_filter(LogFilter(self.current_filters))
+
+    def toggle_server_filter(self):
+        self.server_filter = self.server_filter_var.get()
+        if self.filter.active:
+            self.schedule_restart()
+
+    def source_command(self, initial):
+        """
+        Comando remoto que produce las líneas. `initial` es False al
+        reiniciarlo, para no repetir las últimas líneas ya recibidas.
+        """
+        raise NotImplementedError
+
+    def build_command(self, initial=True):
+        source = self.source_command(initial)
+        command = self.filter.remote_command(source) if self.server_filter else source
+        self.stream_filtered = command != source
+        return command
+
+    def spool_key(self):
+        """
+        Origen del stream para el spool en disco (None = no se guarda).
+        """
+        return None
+
+    def resume_point(self):
+        """
+        Desde dónde continuar el stream al reabrir el visor, o None. Se llama
+        desde el hilo de lectura tras cada trozo, y debe describir el punto
+        justo después de sus líneas.
+        """
+        return None
+
+    def spool_resume(self, marks):
+        """
+        Punto de reanudación que se guarda con las líneas recogidas de la cola.
+
+        Es la marca del último trozo recogido, no el estado actual del
+        stream, que ya puede ir por delante. Si la cola ha descartado líneas
+        el spool tiene un hueco y no se guarda ninguno.
+        """
+        if marks:
+            self._spool_resume = marks[-1]
+        return None if self.queue.dropped else self._spool_resume
+
+    def restore_spool(self):
+        """
+        Muestra las líneas guardadas en el spool la última vez.
+        """
+        items = self.spool_stream.tail(self.buffer.capacity - 1)
+        if not items:
+            return
+        self.restored_lines = len(items)
+        first = self.buffer.extend(items)
+        self.buffer.append("── Reanudado desde el spool local ──", "debug")
+        self._index_queue.put((first, [line for line, tag in items]))
+        self.log_text.render()
+        logger.info(f"{self.service['name']}: {len(items)} líneas recuperadas del spool")
+
+    def on_view_top(self):
+        """
+        La vista ha llegado a su primera línea; las subclases con historial
+        cargan aquí la parte anterior.
+        """
+
+    def classify(self, line):
+        """
+        Etiqueta de resaltado de una línea (se llama desde el hilo de lectura).
+        """
+        return self.classifier.classify(line)
+
+    def drain_queue(self):
+        """
+        Pasa al búfer todo lo recibido desde el último fotograma y redibuja una vez.
+        """
+        if not self.frame.winfo_exists():
+            return
+        items, marks = self.queue.drain_marked()
+        self.add_items(items, marks)
+        self.update_status()
+        self.root.after(DRAIN_INTERVAL_MS, self.drain_queue)
+
+    def add_items(self, items, marks=()):
+        """
+        Añade líneas [(línea, etiqueta)] al búfer, al índice, al spool y a la vista.
+        """
+        self.severity.add(tag for line, tag in items)
+        if items:
+            first = self.buffer.extend(items)
+            self._index_queue.put((first, [line for line, tag in items]))
+            if self.spool_stream is not None:
+                self.spool_stream.append(items, self.spool_resume(marks))
+            if self.rows is not None:
+                self.add_rows(max(first, self.buffer.first_seq), self.buffer.next_seq)
+            self.log_text.render()
+
+    def add_rows(self, start, end):
+        """
+        Añade a las filas visibles las secuencias nuevas que pasan el filtro.
+        """
+        new_rows = self.filter.select(self.buffer, start, end)
+        # Las filas desalojadas del búfer se recortan por la izquierda
+        evicted = bisect.bisect_left(self.rows, self.buffer.first_seq)
+        if evicted:
+            del self.rows[:evicted]
+        self.rows.extend(new_rows)
+        if self._pending_rows is not None:
+            self._pending_rows.extend(new_rows)
+
+    def set_filter(self, log_filter):
+        """
+        Cambia el filtro y vuelve a filtrar el historial sin bloquear la interfaz.
+
+        Las líneas que llegan mientras tanto ya se filtran con el filtro nuevo
+        y se unen al resultado cuando termina.
+        """
+        self.filter = log_filter
+        self._filter_generation += 1
+        if not log_filter.active:
+            self.rows = self._pending_rows = None
+            self.log_text.set_rows(None)
+            if self.server_filter:
+                self.schedule_restart()
+            return
+
+        generation = self._filter_generation
+        end = self.buffer.next_seq
+        if self.rows is None:
+            self.rows = []
+            self.log_text.set_rows(self.rows)
+        self._pending_rows = []
+
+        def refilter():
+            rows = log_filter.select(self.buffer, self.buffer.first_seq, end)
+            self.root.after(0, self.apply_filtered_rows, generation, rows)
+
+        threading.Thread(target=refilter, daemon=True).start()
+        self.update_status()
+        if self.server_filter:
+            self.schedule_restart()
+
+    def apply_filtered_rows(self, generation, rows):
+        if generation != self._filter_generation or not self.frame.winfo_exists():
+            return  # El filtro cambió otra vez antes de terminar
+        rows.extend(self._pending_rows)
+        self.rows, self._pending_rows = rows, None
+        self.log_text.set_rows(self.rows)
+        self.update_status()
+
+    def clear_lines(self):
+        """
+        Vacía el visor (búfer, índice, contadores y búsqueda) sin cerrar el stream.
+        """
+        items, marks = self.queue.drain_marked()
+        if self.spool_stream is not None and items:
+            # El spool guarda el stream, no la vista: no debe quedar un hueco
+            self.spool_stream.append(items, self.spool_resume(marks))
+        self.buffer.clear()
+        self.index.clear()
+        self.severity = SeverityStats()
+        self.search_hits = []
+        if self.rows is not None:
+            # La vista comparte la lista de filas: se vacía en su sitio
+            del self.rows[:]
+        if self._pending_rows is not None:
+            del self._pending_rows[:]
+        self.log_text.render()
+
+    def update_status(self):
+        shown = len(self.buffer) if self.rows is None else len(self.rows)
+        text = (
+            f"Líneas: {shown}/{len(self.buffer)} · En cola: {len(self.queue)} · "
+            f"Descartadas: {self.queue.dropped}"
+        )
+        if self._pending_rows is not None:
+            text += " · Filtrando historial..."
+        for detail in self.status_details():
+            text += f" · {detail}"
+        remote = self.remote_bytes + self._stream_remote_bytes
+        if remote:
+            received = self.received_bytes + self._stream_received_bytes
+            saved = max(remote - received, 0)
+            text += (
+                f" · Recibido: {SystemInfo.format_bytes(received)}"
+                f" · Ahorro: {SystemInfo.format_bytes(saved)} ({100 * saved / remote:.0f} %)"
+            )
+        self.status_label.configure(text=text)
+        self.severity_label.configure(text=self.severity.summary())
+
+    def control_line(self, line):
+        """
+        Línea de control del comando remoto (se llama desde el hilo de lectura).
+        """
+
+    def on_stream_end(self, generation):
+        """
+        El comando remoto terminó sin que el visor lo cerrara.
+        """
+        if generation != self._stream_generation or self.closed:
+            return
+        self.stream_ended = True
+        logger.info(f"El stream de {self.service['name']} ha terminado")
+
+    def status_details(self):
+        """
+        Datos adicionales de la barra de estado.
+        """
+        return []
+
+    def close_stream(self):
+        """
+        Cierra el canal remoto del visor.
+        """
+        self.closed = True
+        self._index_queue.put(None)
+        if self.channel is not None:
+            self.channel.close()
+        if self.spool_stream is not None:
+            # Lo que aún no se había mostrado también se guarda
+            items, marks = self.queue.drain_marked()
+            self.spool_stream.close(items, self.spool_resume(marks))
+
+    def schedule_restart(self):
+        """
+        Reinicia el stream remoto cuando los filtros dejan de cambiar.
+        """
+        if self._restart_job is not None:
+            self.root.after_cancel(self._restart_job)
+        self._restart_job = self.root.after(RESTART_DELAY_MS, self.restart_stream)
+
+    def restart_stream(self):
+        self._restart_job = None
+        if self.closed or not self.frame.winfo_exists():
+            return
+        logger.info(f"Reiniciando el stream de {self.service['name']} con los filtros nuevos")
+        self.start_stream(initial=False)
+
+    def start_stream(self, initial):
+        """
+        Abre un stream nuevo; el anterior, si lo hay, se cierra.
+        """
+        self._stream_generation += 1
+        self.stream_ended = False
+        self.stream_bytes = 0
+        previous, self.channel = self.channel, None
+        if previous is not None:
+            previous.close()
+        self.remote_bytes += self._stream_remote_bytes
+        self.received_bytes += self._stream_received_bytes
+        self._stream_remote_bytes = self._stream_received_bytes = 0
+        self.open_stream(self._stream_generation, initial)
+
+    def open_stream(self, generation, initial):
+        """
+        Lanza el hilo que lee el stream; las subclases con varios orígenes
+        lanzan uno por origen.
+        """
+        threading.Thread(
+            target=self.fetch_stream, args=(generation, initial), daemon=True
+        ).start()
+
+    def fetch_stream(self, generation, initial):
+        """
+        Abre el comando remoto y deja su lectura al StreamReader compartido.
+
+        El comando se construye en este hilo porque puede necesitar consultar
+        antes el servidor (p. ej. el tamaño del fichero).
+        """
+        try:
+            command = self.build_command(initial)
+            stdin, stdout, stderr = self.ssh_manager.open_stream(self.server, command)
+            channel = stdout.channel
+            if generation != self._stream_generation or self.closed:
+                channel.close()
+                return
+            self.channel = self.ssh_manager.stream_reader.add(
+                channel,
+                lambda lines, size: self.receive_lines(generation, lines, size),
+                lambda: self.stream_closed(generation),
+            )
+        except Exception as e:
+            if generation != self._stream_generation:
+                return  # Stream sustituido por otro
+            logger.error(f"No se pudo leer el stream de {self.service['name']}: {e}")
+            self.queue.put((f"Error al obtener los logs: {e}", "error"))
+            self.stream_closed(generation)
+
+    def receive_lines(self, generation, lines, size):
+        """
+        Clasifica y encola un trozo de líneas del stream (desde el hilo del StreamReader).
+        """
+        if generation != self._stream_generation:
+            return  # Restos de un stream ya sustituido
+        self.stream_bytes += size
+        transform, classify = self.transform, self.classify
+        items = []
+        for line in lines:
+            if line.startswith(CONTROL_PREFIX):
+                # Las líneas de control no forman parte del log
+                self.stream_bytes -= len(line.encode()) + 1
+                if line.startswith(REMOTE_STATS_PREFIX):
+                    # Solo los streams filtrados en el servidor envían estas líneas
+                    self._stream_received_bytes = self.stream_bytes
+                    self._stream_remote_bytes = int(line[len(REMOTE_STATS_PREFIX):])
+                else:
+                    self.control_line(line)
+                continue
+            if transform is not None:
+                line = transform(line)
+                if line is None:
+                    continue
+            items.append((line, classify(line)))
+        if self.spool_stream is None:
+            self.queue.put_many(items)
+        else:
+            # El punto de reanudación viaja con las líneas a las que sigue
+            self.queue.put_many(items, self.resume_point())
+
+    def stream_closed(self, generation):
+        if generation == self._stream_generation and not self.closed:
+            self.root.after(0, self.on_stream_end, generation)
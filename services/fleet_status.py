@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: fleet_status.py
+# Project: SSH-Sentinel
+# File Created: Sunday, 18th October 2026 1:48:09 pm
+# Author: Daniel Rodríguez Cabrera (daniel8rc@gmail.com)
+# Version: 1.0.0
+# -----
+# Last Modified: Sunday, 18th October 2026 1:48:09 pm
+# Modified By: Daniel Rodríguez Cabrera
+# -----
+# Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
+###
+import re
+import threading
+import time
+from loguru import logger
+from utils.system_info import SYSTEM_INFO_COMMAND, SystemInfo
+
+# Un único comando por servidor: métricas del sistema y unidades fallidas.
+# Si systemctl no está disponible la línea failed_units no aparece.
+FLEET_STATUS_COMMAND = (
+    SYSTEM_INFO_COMMAND
+    + "; units=$(systemctl --failed --no-legend --plain 2>/dev/null)"
+    + " && echo \"failed_units $(printf '%s' \"$units\" | grep -c .)\""
+)
+
+_FAILED_UNITS_RE = re.compile(r"^failed_units (\d+)$", re.MULTILINE)
+
+
+def parse_failed_units(output):
+    """
+    Número de unidades fallidas en la salida de FLEET_STATUS_COMMAND (None si no consta).
+    """
+    match = _FAILED_UNITS_RE.search(output)
+    return int(match.group(1)) if match else None
+
+
+def unreachable_snapshot(server, error):
+    """
+    Estado de un servidor al que no se ha podido llegar.
+    """
+    return {
+        "server": server["name"],
+        "host": server.get("host"),
+        "timestamp": time.time(),
+        "reachable": False,
+        "error": str(error),
+    }
+
+
+class FleetStatusCollector:
+    """
+    Obtiene una instantánea del estado de cada servidor de la flota.
+
+    Cada consulta cuesta un solo comando por servidor. Los servidores que
+    están esperando para reconectar tras un fallo se marcan como
+    inaccesibles sin intentar conectar, para no ocupar un hilo esperando.
+    """
+
+    def __init__(self, ssh_manager, metrics_store=None, timeout=15):
+        self.ssh_manager = ssh_manager
+        self.metrics_store = metrics_store
+        self.timeout = timeout
+        # Una instancia de SystemInfo por servidor para el cálculo de CPU
+        self._system_info = {}
+        self._lock = threading.Lock()
+
+    def _system_info_for(self, name):
+        with self._lock:
+            system_info = self._system_info.get(name)
+            if system_info is None:
+                system_info = self._system_info[name] = SystemInfo()
+            return system_info
+
+    def collect(self, server):
+        """
+        Instantánea (diccionario serializable a JSON) del estado de un servidor.
+        """
+        retry_in = self.ssh_manager.retry_delay(server)
+        if retry_in > 0:
+            return unreachable_snapshot(server, f"Reintento en {retry_in:.0f}s")
+
+        started = time.monotonic()
+        try:
+            _, output, _ = self.ssh_manager.run_command(
+                server, FLEET_STATUS_COMMAND, timeout=self.timeout
+            )
+        except Exception as e:
+            logger.warning(f"Servidor {server['name']} inaccesible: {e}")
+            return unreachable_snapshot(server, e)
+        latency = time.monotonic() - started
+
+        info = self._system_info_for(server["name"]).sample(output)
+        if info is None:
+            return unreachable_snapshot(server, "Respuesta no válida")
+        if self.metrics_store is not None:
+            self.metrics_store.record(server["name"], info)
+
+        total = info["total_memory"]
+        cpu = info["cpu_percent"]
+        return {
+            "server": server["name"],
+            "host": server.get("host"),
+            "timestamp": time.time(),
+            "reachable": True,
+            "error": None,
+            "latency_ms": round(latency * 1000, 1),
+            "uptime": info["uptime"],
+            "load_1": info["load_average"]["1min"],
+            "load_5": info["load_average"]["5min"],
+            "load_15": info["load_average"]["15min"],
+            "cpu_percent": None if cpu is None else round(cpu, 1),
+            "mem_total": total,
+            "mem_used": info["used_memory"],
+            "mem_percent": round(100.0 * info["used_memory"] / total, 1) if total else None,
+            "failed_units": parse_failed_units(output),
+        }
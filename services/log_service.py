@@ -16,12 +16,11 @@ import os
 import threading
 import json
 import time
-import urwid
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
 from services.journal_service import JournalService
 from services.service_status import ServiceStatus
-import curses
+# watchdog y curses solo los necesita el visor de terminal: se importan al usarlo
+
+
 class LogService:
     def __init__(self, log_path):
         self.log_path = log_path
@@ -32,8 +31,10 @@ class LogService:
     def view_logs(self):
         self.stop_log_display = False
         filter_text = ""
+        import curses
+        from watchdog.observers import Observer
 
-        log_handler = LogUpdateHandler(self)
+        log_handler = log_update_handler_class()(self)
         observer = Observer()
         observer.schedule(log_handler, path=os.path.dirname(self.log_path), recursive=False)
         observer.start()
@@ -46,6 +47,8 @@ class LogService:
             observer.join()
 
     def curses_log_view(self, stdscr, filter_text, observer):
+        import curses
+
         curses.curs_set(0)
         stdscr.clear()
 
@@ -89,14 +92,28 @@ class LogService:
             if not self.filtered_lines or self.filtered_lines and new_line.lower().find(self.filtered_lines[0].lower()) != -1:
                 self.filtered_lines.append(new_line)
 
-class LogUpdateHandler(FileSystemEventHandler):
-    def __init__(self, log_service):
-        self.log_service = log_service
-
-    def on_modified(self, event):
-        if event.src_path == self.log_service.log_path:
-            with open(self.log_service.log_path, 'r') as log_file:
-                lines = log_file.readlines()
-                new_lines = lines[len(self.log_service.log_lines):]
-                for line in new_lines:
-                    self.log_service.update_logs(line.strip())
\ No newline at end of file
+
+def log_update_handler_class():
+    """
+    Crea (una sola vez) la clase LogUpdateHandler, que hereda de watchdog.
+    """
+    global LogUpdateHandler
+    if LogUpdateHandler is None:
+        from watchdog.events import FileSystemEventHandler
+
+        class LogUpdateHandler(FileSystemEventHandler):
+            def __init__(self, log_service):
+                self.log_service = log_service
+
+            def on_modified(self, event):
+                if event.src_path == self.log_service.log_path:
+                    with open(self.log_service.log_path, 'r') as log_file:
+                        lines = log_file.readlines()
+                        new_lines = lines[len(self.log_service.log_lines):]
+                        for line in new_lines:
+                            self.log_service.update_logs(line.strip())
+
+    return LogUpdateHandler
+
+
+LogUpdateHandler = None
\ No newline at end of file
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: unit_events.py
+# Project: SSH-Sentinel
+# File Created: Sunday, 18th October 2026 10:21:37 am
+# Author: Daniel Rodríguez Cabrera (daniel8rc@gmail.com)
+# Version: 1.0.0
+# -----
+# Last Modified: Sunday, 18th October 2026 10:21:37 am
+# Modified By: Daniel Rodríguez Cabrera
+# -----
+# Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
+###
+import json
+import socket
+import string
+import threading
+import time
+from loguru import logger
+from services.unit_status import UnitStatusCollector, unit_id
+
+UNIT_PATH_PREFIX = "/org/freedesktop/systemd1/unit/"
+
+MONITOR_COMMAND = (
+    "busctl monitor --system --json=short --match "
+    "\"type='signal',sender='org.freedesktop.systemd1',"
+    "interface='org.freedesktop.DBus.Properties',member='PropertiesChanged'\""
+)
+
+_PATH_SAFE = set(string.ascii_letters + string.digits)
+
+# Propiedades de org.freedesktop.systemd1.Unit que se trasladan a la tabla de estados
+_EVENT_PROPERTIES = {
+    "ActiveState": "active_state",
+    "SubState": "sub_state",
+}
+
+
+def unit_object_path(name):
+    """
+    Ruta D-Bus de una unidad ("nginx.service" -> ".../unit/nginx_2eservice").
+    """
+    escaped = "".join(
+        char if char in _PATH_SAFE else f"_{ord(char):02x}" for char in unit_id(name)
+    )
+    return UNIT_PATH_PREFIX + escaped
+
+
+def parse_properties_changed(line):
+    """
+    Extrae (ruta, {propiedad: valor}) de una señal PropertiesChanged de busctl.
+    """
+    try:
+        message = json.loads(line)
+        interface, changed = message["payload"]["data"][:2]
+    except (ValueError, KeyError, TypeError):
+        return None, {}
+    if interface != "org.freedesktop.systemd1.Unit":
+        return None, {}
+    values = {}
+    for prop, value in changed.items():
+        if isinstance(value, dict) and "data" in value:
+            values[prop] = value["data"]
+    return message.get("path"), values
+
+
+class UnitEventTracker:
+    """
+    Seguimiento del estado de las unidades por eventos D-Bus.
+
+    Mantiene un único `busctl monitor` remoto por servidor con las señales
+    PropertiesChanged de systemd y aplica cambios incrementales sobre la
+    tabla de estados. La consulta completa con systemctl show solo se repite
+    al arrancar, cada `resync_interval` segundos y, mientras el flujo de
+    eventos no esté disponible (busctl suele requerir root), cada
+    `poll_interval` segundos.
+    """
+
+    def __init__(
+        self,
+        ssh_manager,
+        server,
+        units,
+        on_update,
+        resync_interval=300,
+        poll_interval=5,
+        retry_interval=30,
+    ):
+        self.ssh_manager = ssh_manager
+        self.server = server
+        self.collector = UnitStatusCollector(ssh_manager, server, units)
+        self.on_update = on_update
+        self.resync_interval = resync_interval
+        self.poll_interval = poll_interval
+        self.retry_interval = retry_interval
+        self.paths = {unit_object_path(unit): unit for unit in units}
+
+        self.streaming = False
+        self._stop = threading.Event()
+        self._channel = None
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._channel is not None:
+            self._channel.close()
+
+    def resync(self):
+        """
+        Consulta completa del estado de todas las unidades.
+        """
+        try:
+            self.on_update(dict(self.collector.poll()))
+            return True
+        except Exception as e:
+            logger.error(f"No se pudo sincronizar el estado en {self.server['name']}: {e}")
+            return False
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.resync()
+            try:
+                self._follow_events()
+            except Exception as e:
+                logger.warning(f"Eventos D-Bus no disponibles en {self.server['name']}: {e}")
+            self.streaming = False
+            # Modo sondeo hasta el siguiente intento de suscripción
+            retry_at = time.monotonic() + self.retry_interval
+            while not self._stop.is_set() and time.monotonic() < retry_at:
+                if self._stop.wait(self.poll_interval):
+                    break
+                self.resync()
+
+    def _follow_events(self):
+        stdin, stdout, stderr = self.ssh_manager.open_stream(self.server, MONITOR_COMMAND)
+        self._channel = stdout.channel
+        self._channel.settimeout(1.0)
+        self.streaming = True
+        carry = b""
+        next_resync = time.monotonic() + self.resync_interval
+        try:
+            while not self._stop.is_set():
+                if time.monotonic() >= next_resync:
+                    self.resync()
+                    next_resync = time.monotonic() + self.resync_interval
+                try:
+                    data = self._channel.recv(65536)
+                except socket.timeout:
+                    continue
+                if not data:
+                    error = stderr.read().decode(errors="replace").strip()
+                    raise ConnectionError(error or "busctl monitor terminó")
+                lines = (carry + data).split(b"\n")
+                carry = lines.pop()
+                updates = self._apply_events(lines)
+                if updates:
+                    self.on_update(updates)
+        finally:
+            self._channel.close()
+
+    def _apply_events(self, lines):
+        """
+        Aplica las señales recibidas y devuelve los estados de las unidades modificadas.
+        """
+        updates = {}
+        for line in lines:
+            path, values = parse_properties_changed(line)
+            unit = self.paths.get(path)
+            if unit is None or unit not in self.collector.states:
+                continue
+            state = self.collector.states[unit]
+            for prop, key in _EVENT_PROPERTIES.items():
+                if prop in values:
+                    state[key] = values[prop]
+            if values.get("ActiveEnterTimestampMonotonic"):
+                # La unidad acaba de (re)activarse
+                state["uptime"] = 0.0
+                state["main_pid"] = None
+            if values:
+                updates[unit] = dict(state)
+        return updates
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: unit_status.py
+# Project: SSH-Sentinel
+# File Created: Sunday, 18th October 2026 9:58:02 am
+# Author: Daniel Rodríguez Cabrera (daniel8rc@gmail.com)
+# Version: 1.0.0
+# -----
+# Last Modified: Sunday, 18th October 2026 9:58:02 am
+# Modified By: Daniel Rodríguez Cabrera
+# -----
+# Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
+###
+import shlex
+from loguru import logger
+
+UNIT_PROPERTIES = (
+    "Id",
+    "ActiveState",
+    "SubState",
+    "ActiveEnterTimestamp",
+    "ActiveEnterTimestampMonotonic",
+    "MainPID",
+    "MemoryCurrent",
+)
+
+UNIT_SUFFIXES = (
+    ".service",
+    ".socket",
+    ".timer",
+    ".target",
+    ".mount",
+    ".path",
+    ".slice",
+    ".scope",
+)
+
+# systemd usa UINT64_MAX para "sin dato"
+_UINT64_MAX = 2**64 - 1
+
+
+def unit_id(name):
+    """
+    Nombre completo de la unidad ("nginx" -> "nginx.service").
+    """
+    return name if name.endswith(UNIT_SUFFIXES) else f"{name}.service"
+
+
+def build_show_command(units):
+    """
+    Comando único que consulta el estado de todas las unidades (y el uptime del host).
+    """
+    names = " ".join(shlex.quote(unit_id(unit)) for unit in units)
+    return f"cat /proc/uptime; systemctl show -p {','.join(UNIT_PROPERTIES)} -- {names}"
+
+
+def _to_int(value):
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return None
+    return None if value == _UINT64_MAX else value
+
+
+def parse_systemctl_show(output, units):
+    """
+    Convierte la salida de build_show_command en una tabla {unidad: estado}.
+    """
+    lines = output.split("\n")
+    host_uptime = None
+    if lines and lines[0] and "=" not in lines[0]:
+        try:
+            host_uptime = float(lines.pop(0).split()[0])
+        except (IndexError, ValueError):
+            pass
+
+    # Los bloques de cada unidad van separados por una línea vacía
+    blocks = []
+    current = {}
+    for line in lines:
+        if not line.strip():
+            if current:
+                blocks.append(current)
+                current = {}
+            continue
+        key, _, value = line.partition("=")
+        current[key] = value
+    if current:
+        blocks.append(current)
+
+    by_id = {block.get("Id"): block for block in blocks}
+    table = {}
+    for position, unit in enumerate(units):
+        block = by_id.get(unit_id(unit))
+        if block is None and position < len(blocks):
+            block = blocks[position]
+        if block is None:
+            continue
+
+        active_since = _to_int(block.get("ActiveEnterTimestampMonotonic"))
+        uptime = None
+        if host_uptime is not None and active_since:
+            uptime = max(host_uptime - active_since / 1_000_000, 0)
+
+        table[unit] = {
+            "id": block.get("Id", unit_id(unit)),
+            "active_state": block.get("ActiveState", "unknown"),
+            "sub_state": block.get("SubState", ""),
+            "active_since": block.get("ActiveEnterTimestamp", ""),
+            "uptime": uptime,
+            "main_pid": _to_int(block.get("MainPID")) or None,
+            "memory": _to_int(block.get("MemoryCurrent")),
+        }
+    return table
+
+
+def format_duration(seconds):
+    """
+    Duración legible ("3d 4h", "2h 5m", "45s").
+    """
+    seconds = int(seconds)
+    days, rest = divmod(seconds, 86400)
+    hours, rest = divmod(rest, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if days:
+        return f"{days}d {hours}h"
+    if hours:
+        return f"{hours}h {minutes}m"
+    if minutes:
+        return f"{minutes}m {seconds}s"
+    return f"{seconds}s"
+
+
+def describe_unit(name, state):
+    """
+    Texto para la etiqueta de estado de una unidad.
+    """
+    if state["active_state"] != "active":
+        return f"{name}: Inactivo ({state['active_state']}/{state['sub_state']})"
+    details = [state["sub_state"]]
+    if state["uptime"] is not None:
+        details.append(format_duration(state["uptime"]))
+    if state["memory"] is not None:
+        details.append(f"{state['memory'] / 1_048_576:.1f} MB")
+    return f"{name}: Activo ({' · '.join(details)})"
+
+
+class UnitStatusCollector:
+    """
+    Consulta el estado de todas las unidades de un servidor en un único comando.
+    """
+
+    def __init__(self, ssh_manager, server, units):
+        self.ssh_manager = ssh_manager
+        self.server = server
+        self.units = list(units)
+        self.command = build_show_command(self.units)
+        self.states = {}
+
+    def poll(self):
+        """
+        Ejecuta la consulta y devuelve la tabla de estados actualizada.
+        """
+        exit_status, output, error = self.ssh_manager.run_command(
+            self.server, self.command
+        )
+        if not output.strip():
+            raise RuntimeError(error.strip() or "systemctl show no devolvió datos")
+        self.states = parse_systemctl_show(output, self.units)
+        missing = set(self.units) - set(self.states)
+        if missing:
+            logger.warning(f"Unidades sin estado en {self.server['name']}: {missing}")
+        return self.states
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: access_log.py
+# Project: SSH-Sentinel
+# File Created: Sunday, 18th October 2026 11:20:47 pm
+# Author: Daniel Rodríguez Cabrera (daniel8rc@gmail.com)
+# Version: 1.0.0
+# -----
+# Last Modified: Sunday, 18th October 2026 11:20:47 pm
+# Modified By: Daniel Rodríguez Cabrera
+# -----
+# Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
+###
+import bisect
+import json
+import re
+import threading
+import time
+from array import array
+from collections import Counter, deque
+from functools import lru_cache, partial
+
+# Ventana de las estadísticas (s) y tramo final con el que se calcula el ritmo
+WINDOW = 60
+RATE_WINDOW = 10
+
+# Límites (s) de los tramos del histograma de latencias: 0 y luego
+# crecimiento geométrico del 15 % desde 0,5 ms hasta 2 min, así que los
+# percentiles tienen un error relativo de pocos puntos. El tramo 0 cuenta
+# las peticiones sin latencia en el log.
+LATENCY_BOUNDS = [0.0]
+while LATENCY_BOUNDS[-1] < 120:
+    LATENCY_BOUNDS.append(max(LATENCY_BOUNDS[-1] * 1.15, 0.0005))
+_NO_LATENCY = -1.0
+_latency_bucket = partial(bisect.bisect_right, LATENCY_BOUNDS)
+
+# Formato common/combined de nginx y Apache y lo que se añada después del
+# User-Agent ($request_time, urt=..., etc.), que es lo único donde se busca la
+# latencia: el User-Agent trae números de versión ("Safari/537.36") que no lo
+# son. La cadena de consulta no forma parte de la ruta.
+_QUOTED = r'"[^"\\\n]*(?:\\.[^"\\\n]*)*"'
+_ACCESS_LINE = re.compile(
+    r'^\S+ \S+ \S+ \[[^\]\n]*\] "[A-Z]+ ([^\s?"]*)[^"\n]*" ([1-5]\d\d) (\d+|-)'
+    rf'(?: {_QUOTED} {_QUOTED})?([^\n]*)$',
+    re.MULTILINE,
+)
+_UPSTREAM_TIME = re.compile(r'(?:urt|upstream_response_time|upstream_time)="?(\d+(?:\.\d+)?)')
+_REQUEST_TIME = re.compile(r'(?:\brt|request_time)="?(\d+(?:\.\d+)?)')
+_TRAILING_TIME = re.compile(r'(?:^|\s)"?(\d+\.\d+)"?\s*$')
+_NUMBER = re.compile(r"\s*(\d+(?:\.\d+)?)")
+
+# Segmentos de ruta que son identificadores (números, hashes, UUID): se
+# agrupan para que el top de rutas no se llene de variantes de la misma
+_ID_SEGMENT = re.compile(r"/(?:\d+|[0-9a-fA-F]{16,}|[0-9a-fA-F-]{36})(?=/|$)", re.MULTILINE)
+
+_JSON_STATUS = ("status", "status_code", "response_status")
+_JSON_PATH = ("request_uri", "uri", "path", "url", "request")
+_JSON_BYTES = ("body_bytes_sent", "bytes_sent", "bytes", "size", "response_size")
+_JSON_TIME = ("upstream_response_time", "upstream_time", "request_time", "duration", "latency")
+
+
+class AccessColumns:
+    """
+    Un lote de peticiones en columnas: estado, ruta, bytes y latencia (s).
+    """
+
+    def __init__(self):
+        self.statuses = array("H")
+        self.paths = []
+        self.sizes = array("Q")
+        self.latencies = array("d")  # _NO_LATENCY si el log no la incluye
+        self.unparsed = 0
+
+    def __len__(self):
+        return len(self.statuses)
+
+
+@lru_cache(maxsize=16)
+def _named_latency(field):
+    """
+    Expresión que extrae el campo `field=valor` (o `field: valor`) de una línea.
+    """
+    return re.compile(rf'(?:^|[\s,;"]){re.escape(field)}[=:]\s*"?(\d+(?:\.\d+)?)')
+
+
+def _first_number(value):
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = _NUMBER.match(str(value))
+    return float(match.group(1)) if match else None
+
+
+def _parse_json(line, columns, latency_field=None):
+    try:
+        entry = json.loads(line)
+    except ValueError:
+        return False
+    if not isinstance(entry, dict):
+        return False
+    status = next((entry[key] for key in _JSON_STATUS if key in entry), None)
+    path = next((entry[key] for key in _JSON_PATH if key in entry), None)
+    try:
+        status = int(status)
+    except (TypeError, ValueError):
+        return False
+    if not 100 <= status <= 599:
+        return False
+    parts = str(path or "").split()
+    # "request" trae la línea completa: "GET /x HTTP/1.1"
+    path = parts[1] if len(parts) > 1 else (parts[0] if parts else "")
+    size = next((entry[key] for key in _JSON_BYTES if key in entry), 0)
+    latency = None
+    for key in (latency_field,) if latency_field else _JSON_TIME:
+        if key in entry:
+            latency = _first_number(entry[key])
+            if latency is not None:
+                break
+    columns.statuses.append(status)
+    columns.paths.append(path.split("?", 1)[0])
+    columns.sizes.append(max(int(_first_number(size) or 0), 0))
+    columns.latencies.append(_NO_LATENCY if latency is None else latency)
+    return True
+
+
+def parse_access_lines(lines, latency_field=None):
+    """
+    Convierte líneas de un log de acceso (common/combined o JSON) en AccessColumns.
+
+    Las líneas de texto se analizan juntas: una sola pasada de la expresión
+    regular sobre el lote entero y las columnas se llenan desde el resultado.
+    La latencia es `latency_field` (campo `nombre=valor` o clave JSON) si se
+    indica; si no, upstream/request time o un número decimal suelto al final
+    de la línea, siempre después del User-Agent. Sin nada de eso, no hay latencia.
+    """
+    columns = AccessColumns()
+    text_lines = [line for line in lines if not line.startswith("{")]
+    if text_lines:
+        matches = _ACCESS_LINE.findall("\n".join(text_lines))
+        columns.unparsed += len(text_lines) - len(matches)
+        if matches:
+            paths, statuses, sizes, rests = zip(*matches)
+            columns.statuses.extend(map(int, statuses))
+            # "-" (sin cuerpo) como 0, sustituido en todo el lote de una vez
+            columns.sizes.extend(map(int, "\n".join(sizes).replace("-", "0").split("\n")))
+            columns.paths.extend(paths)
+            named = _named_latency(latency_field).search if latency_field else None
+            for rest in rests:
+                if not rest:
+                    match = None
+                elif named is not None:
+                    match = named(rest)
+                else:
+                    match = (
+                        _UPSTREAM_TIME.search(rest)
+                        or _REQUEST_TIME.search(rest)
+                        or _TRAILING_TIME.search(rest)
+                    )
+                columns.latencies.append(float(match.group(1)) if match else _NO_LATENCY)
+    for line in lines:
+        if line.startswith("{") and not _parse_json(line, columns, latency_field):
+            columns.unparsed += 1
+    if columns.paths:
+        # Normalización de todas las rutas del lote en una sola sustitución
+        columns.paths = _ID_SEGMENT.sub("/:id", "\n".join(columns.paths)).split("\n")
+    return columns
+
+
+class _Second:
+    """
+    Agregados de un segundo.
+    """
+
+    def __init__(self, second):
+        self.second = second
+        self.requests = 0
+        self.bytes = 0
+        self.statuses = Counter()
+        self.paths = Counter()
+        self.latencies = [0] * (len(LATENCY_BOUNDS) + 1)
+
+
+class AccessStats:
+    """
+    Estadísticas de un log de acceso sobre una ventana deslizante.
+
+    Cada lote de AccessColumns se agrega de una vez en el segundo en curso
+    (Counter sobre las columnas y un histograma de latencias con tramos
+    fijos), y a la vez en los totales de la ventana; cuando un segundo sale
+    de la ventana se resta entero. Así consultar las estadísticas no
+    depende del número de peticiones, y los percentiles salen del
+    histograma sin guardar cada latencia. `add` se llama desde el hilo de
+    lectura y `snapshot` desde la interfaz.
+    """
+
+    def __init__(self, window=WINDOW, rate_window=RATE_WINDOW, top=10):
+        self.window = window
+        self.rate_window = min(rate_window, window)
+        self.top = top
+        self.unparsed = 0
+        self._seconds = deque()
+        self._total = _Second(None)
+        self._started = None
+        self._lock = threading.Lock()
+
+    def add(self, columns, now=None):
+        now = time.time() if now is None else now
+        second = int(now)
+        with self._lock:
+            self.unparsed += columns.unparsed
+            if self._started is None:
+                self._started = now
+            self._expire(second)
+            if not len(columns):
+                return
+            if not self._seconds or self._seconds[-1].second != second:
+                self._seconds.append(_Second(second))
+            current, total = self._seconds[-1], self._total
+            statuses = Counter(columns.statuses)
+            paths = Counter(columns.paths)
+            latencies = Counter(map(_latency_bucket, columns.latencies))
+            size = sum(columns.sizes)
+            for bucket in (current, total):
+                bucket.requests += len(columns)
+                bucket.bytes += size
+                bucket.statuses.update(statuses)
+                bucket.paths.update(paths)
+                for index, count in latencies.items():
+                    bucket.latencies[index] += count
+
+    def _expire(self, second):
+        total = self._total
+        while self._seconds and self._seconds[0].second <= second - self.window:
+            old = self._seconds.popleft()
+            total.requests -= old.requests
+            total.bytes -= old.bytes
+            for counter, removed in ((total.statuses, old.statuses), (total.paths, old.paths)):
+                for key, count in removed.items():
+                    remaining = counter[key] - count
+                    if remaining > 0:
+                        counter[key] = remaining
+                    else:
+                        del counter[key]
+            total.latencies = [a - b for a, b in zip(total.latencies, old.latencies)]
+
+    def snapshot(self, now=None):
+        """
+        Resumen de la ventana: ritmo, estados, rutas más pedidas y percentiles.
+        """
+        now = time.time() if now is None else now
+        second = int(now)
+        with self._lock:
+            self._expire(second)
+            total = self._total
+            recent = sum(
+                bucket.requests
+                for bucket in self._seconds
+                if bucket.second > second - self.rate_window
+            )
+            elapsed = now - self._started if self._started is not None else 0.0
+            span = min(max(elapsed, 1.0), self.window)
+            rate_span = min(max(elapsed, 1.0), self.rate_window)
+            latencies = list(total.latencies)
+            return {
+                "requests": total.requests,
+                "rate": recent / rate_span,
+                "bytes_rate": total.bytes / span,
+                "statuses": sorted(total.statuses.items()),
+                "classes": _status_classes(total.statuses, total.requests),
+                "top_paths": total.paths.most_common(self.top),
+                "percentiles": {
+                    q: percentile(latencies, q) for q in (0.5, 0.95, 0.99)
+                },
+                "unparsed": self.unparsed,
+            }
+
+
+def _status_classes(statuses, requests):
+    """
+    Porcentaje de peticiones de cada clase (2xx, 3xx, 4xx, 5xx).
+    """
+    classes = Counter()
+    for status, count in statuses.items():
+        classes[f"{status // 100}xx"] += count
+    return {name: 100 * count / requests for name, count in sorted(classes.items())} if requests else {}
+
+
+def percentile(histogram, q):
+    """
+    Percentil `q` (0-1) de un histograma de LATENCY_BOUNDS, interpolando
+    dentro del tramo. None si no hay latencias.
+    """
+    measured = sum(histogram) - histogram[0]
+    if not measured:
+        return None
+    target = q * measured
+    seen = 0
+    for index in range(1, len(histogram)):
+        count = histogram[index]
+        if count and seen + count >= target:
+            low = LATENCY_BOUNDS[index - 1]
+            high = LATENCY_BOUNDS[index] if index < len(LATENCY_BOUNDS) else low
+            return low + (high - low) * (target - seen) / count
+        seen += count
+    return LATENCY_BOUNDS[-1]
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: channel_scheduler.py
+# Project: SSH-Sentinel
+# File Created: Sunday, 18th October 2026 9:02:11 am
+# Author: Daniel Rodríguez Cabrera (daniel8rc@gmail.com)
+# Version: 1.0.0
+# -----
+# Last Modified: Sunday, 18th October 2026 9:02:11 am
+# Modified By: Daniel Rodríguez Cabrera
+# -----
+# Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
+###
+import collections
+import threading
+import time
+
+
+class FairSemaphore:
+    """
+    Semáforo FIFO: los hilos obtienen el permiso en el orden en que lo piden.
+    """
+
+    def __init__(self, value):
+        self.value = value
+        self.in_use = 0
+        self._cond = threading.Condition()
+        self._queue = collections.deque()
+
+    @property
+    def waiting(self):
+        return len(self._queue)
+
+    def acquire(self, timeout=None):
+        """
+        Espera turno. Devuelve False si vence el timeout.
+        """
+        ticket = object()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._queue.append(ticket)
+            try:
+                while self._queue[0] is not ticket or self.in_use >= self.value:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._cond.wait(remaining)
+                self.in_use += 1
+                return True
+            finally:
+                self._queue.remove(ticket)
+                # El siguiente de la cola puede estar esperando a quedar primero
+                self._cond.notify_all()
+
+    def release(self):
+        with self._cond:
+            self.in_use = max(self.in_use - 1, 0)
+            self._cond.notify_all()
+
+
+class ChannelScheduler:
+    """
+    Limita los canales concurrentes sobre un transporte SSH.
+
+    sshd rechaza los canales que superan MaxSessions (10 por defecto), así que
+    el presupuesto se reparte entre comandos cortos, que esperan en un
+    semáforo justo, y canales de streaming de larga duración (tail -f,
+    journalctl -f...), que tienen sus propias plazas.
+    """
+
+    def __init__(self, max_sessions=10, stream_slots=4):
+        self.max_sessions = max_sessions
+        self.stream_slots = min(stream_slots, max_sessions - 1)
+        self.short = FairSemaphore(max_sessions - self.stream_slots)
+        self._streams = set()
+        self._reserved = 0
+        self._stream_cond = threading.Condition()
+
+    def _purge_streams(self):
+        self._streams = {channel for channel in self._streams if not channel.closed}
+
+    def acquire_short(self, timeout=None):
+        return self.short.acquire(timeout)
+
+    def release_short(self):
+        self.short.release()
+
+    def acquire_stream(self, timeout=None):
+        """
+        Reserva una plaza de streaming. Las plazas se liberan solas al cerrarse el canal.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._stream_cond:
+            while True:
+                self._purge_streams()
+                if len(self._streams) + self._reserved < self.stream_slots:
+                    self._reserved += 1
+                    return True
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                # Los canales no avisan al cerrarse: se vuelve a comprobar periódicamente
+                self._stream_cond.wait(0.5 if remaining is None else min(remaining, 0.5))
+
+    def register_stream(self, channel):
+        """
+        Asocia el canal abierto a la plaza reservada con acquire_stream.
+        """
+        with self._stream_cond:
+            self._reserved -= 1
+            self._streams.add(channel)
+
+    def cancel_stream(self):
+        """
+        Devuelve una plaza reservada cuyo canal no llegó a abrirse.
+        """
+        with self._stream_cond:
+            self._reserved -= 1
+            self._stream_cond.notify_all()
+
+    def occupancy(self):
+        """
+        Ocupación actual de canales.
+        """
+        with self._stream_cond:
+            self._purge_streams()
+            streams = len(self._streams) + self._reserved
+        return {
+            "short_in_use": self.short.in_use,
+            "short_waiting": self.short.waiting,
+            "short_limit": self.short.value,
+            "streams_in_use": streams,
+            "stream_limit": self.stream_slots,
+            "max_sessions": self.max_sessions,
+        }
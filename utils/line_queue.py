@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: line_queue.py
+# Project: SSH-Sentinel
+# File Created: Sunday, 18th October 2026 4:02:37 pm
+# Author: Daniel Rodríguez Cabrera (daniel8rc@gmail.com)
+# Version: 1.0.0
+# -----
+# Last Modified: Sunday, 18th October 2026 4:02:37 pm
+# Modified By: Daniel Rodríguez Cabrera
+# -----
+# Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
+###
+import threading
+from collections import deque
+
+_UNMARKED = object()
+
+
+class LineQueue:
+    """
+    Cola acotada entre el hilo lector de un stream y el bucle de Tk.
+
+    El lector añade líneas sin bloquear; la interfaz las recoge todas de una
+    vez en cada fotograma. Si la interfaz no da abasto se descartan las más
+    antiguas y se cuentan, para que la memoria no crezca sin límite.
+
+    Cada lote puede llevar una marca (p. ej. el punto del stream justo
+    después de sus líneas), que se recoge junto con ellas en drain_marked.
+    """
+
+    def __init__(self, max_depth=50_000):
+        self.max_depth = max_depth
+        self.received = 0
+        self.dropped = 0
+        self._items = deque()
+        self._marks = []  # Marcas de los lotes aún no recogidos
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def put(self, item):
+        self.put_many((item,))
+
+    def put_many(self, items, mark=_UNMARKED):
+        with self._lock:
+            self._items.extend(items)
+            self.received += len(items)
+            if mark is not _UNMARKED:
+                self._marks.append(mark)
+            excess = len(self._items) - self.max_depth
+            if excess > 0:
+                for _ in range(excess):
+                    self._items.popleft()
+                self.dropped += excess
+
+    def drain(self):
+        """
+        Devuelve y vacía todo lo pendiente.
+        """
+        return self.drain_marked()[0]
+
+    def drain_marked(self):
+        """
+        Devuelve y vacía todo lo pendiente, junto con las marcas de esos lotes
+        en orden.
+        """
+        with self._lock:
+            items, self._items = self._items, deque()
+            marks, self._marks = self._marks, []
+        return items, marks
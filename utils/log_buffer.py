@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: log_buffer.py
+# Project: SSH-Sentinel
+# File Created: Sunday, 18th October 2026 3:26:10 pm
+# Author: Daniel Rodríguez Cabrera (daniel8rc@gmail.com)
+# Version: 1.0.0
+# -----
+# Last Modified: Sunday, 18th October 2026 3:26:10 pm
+# Modified By: Daniel Rodríguez Cabrera
+# -----
+# Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
+###
+
+# Número máximo de líneas por visor si el servicio no indica otro
+DEFAULT_MAX_LINES = 100_000
+
+
+class LogBuffer:
+    """
+    Búfer circular de líneas de log con número de secuencia.
+
+    Cada línea recibe un número de secuencia creciente que no cambia aunque
+    se desalojen las anteriores, así que sirve de referencia estable para
+    vistas, filtros e índices. Añadir es O(1) y la memoria está acotada por
+    `capacity`: al llenarse se descarta la línea más antigua.
+    """
+
+    def __init__(self, capacity=DEFAULT_MAX_LINES):
+        self.capacity = capacity
+        self._lines = [None] * capacity
+        self._tags = [None] * capacity
+        self.first_seq = 0  # Secuencia de la línea más antigua conservada
+        self.next_seq = 0  # Secuencia que recibirá la próxima línea
+
+    def __len__(self):
+        return self.next_seq - self.first_seq
+
+    def __contains__(self, seq):
+        return self.first_seq <= seq < self.next_seq
+
+    def append(self, line, tag=None):
+        """
+        Añade una línea (sin salto final) y devuelve su secuencia.
+        """
+        seq = self.next_seq
+        position = seq % self.capacity
+        if seq - self.first_seq == self.capacity:
+            self.first_seq += 1
+        self._lines[position] = line
+        self._tags[position] = tag
+        self.next_seq = seq + 1
+        return seq
+
+    def extend(self, items):
+        """
+        Añade varias líneas [(línea, etiqueta)] y devuelve la secuencia de la primera.
+        """
+        first = self.next_seq
+        for line, tag in items:
+            self.append(line, tag)
+        return first
+
+    def get(self, seq):
+        """
+        (línea, etiqueta) de una secuencia, o None si ya no está en el búfer.
+        """
+        if not self.first_seq <= seq < self.next_seq:
+            return None
+        position = seq % self.capacity
+        return self._lines[position], self._tags[position]
+
+    def lines(self, start, end):
+        """
+        Lista de las líneas con secuencia en [start, end), recortada al búfer.
+        """
+        start, end = max(start, self.first_seq), min(end, self.next_seq)
+        if start >= end:
+            return []
+        first, last = start % self.capacity, (end - 1) % self.capacity + 1
+        if first < last:
+            return self._lines[first:last]
+        return self._lines[first:] + self._lines[:last]
+
+    def clear(self):
+        self._lines = [None] * self.capacity
+        self._tags = [None] * self.capacity
+        self.first_seq = self.next_seq
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: log_filter.py
+# Project: SSH-Sentinel
+# File Created: Sunday, 18th October 2026 4:38:21 pm
+# Author: Daniel Rodríguez Cabrera (daniel8rc@gmail.com)
+# Version: 1.0.0
+# -----
+# Last Modified: Sunday, 18th October 2026 4:38:21 pm
+# Modified By: Daniel Rodríguez Cabrera
+# -----
+# Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
+###
+import bisect
+import itertools
+import re
+import shlex
+from collections import namedtuple
+
+# Modos de filtro: texto o expresión regular, para incluir o excluir líneas
+FILTER_MODES = {
+    "include": "Contiene",
+    "exclude": "No contiene",
+    "regex": "Regex",
+    "exclude_regex": "Regex (excluir)",
+}
+
+FilterRule = namedtuple("FilterRule", ("pattern", "mode"))
+
+# Las líneas que empiezan por este carácter son de control, no de log
+CONTROL_PREFIX = "\x1e"
+
+# Línea de control del filtro remoto con los bytes leídos en origen
+REMOTE_STATS_PREFIX = CONTROL_PREFIX + "SSHS "
+
+# Filtro remoto en awk: recibe los patrones (ERE en minúsculas) por variables
+# de entorno, compara cada línea en minúsculas una sola vez y cada 200 líneas
+# de entrada informa de los bytes leídos para calcular el ahorro. Las líneas
+# de control del propio comando pasan sin filtrar.
+_REMOTE_FILTER_AWK = r"""
+/^\036/ { print; fflush(); next }
+{
+    bytes += length($0) + 1
+    l = tolower($0)
+    keep = (ENVIRON["SSHS_INC"] == "") || (l ~ ENVIRON["SSHS_INC"])
+    if (keep && ENVIRON["SSHS_EXC"] != "" && l ~ ENVIRON["SSHS_EXC"]) keep = 0
+    if (keep) print
+    if (NR % 200 == 0) printf "\036SSHS %d\n", bytes
+    if (keep || NR % 200 == 0) fflush()
+}
+END { printf "\036SSHS %d\n", bytes }
+"""
+
+# Equivalencias en ERE de las clases de Python más habituales, fuera y
+# dentro de una expresión entre corchetes. \w no tiene: en Python incluye
+# letras no ASCII (ñ, á...) y en awk no hay clase que las admita siempre
+_ERE_CLASSES = {"d": "[0-9]", "s": "[[:space:]]"}
+_ERE_BRACKET_CLASSES = {"d": "[:digit:]", "s": "[:space:]"}
+# Escapes de metacaracteres que ERE entiende igual fuera de corchetes
+_ERE_META = frozenset(".\\^$|()[]{}*+?")
+# Dentro de corchetes estos ya son literales y el escape sobra; el resto
+# (\\, \], \-, \^...) no se interpreta igual en todos los awk
+_ERE_BRACKET_LITERALS = frozenset(".$|(){}*+?")
+
+
+def _ere_escape(text):
+    return re.sub(r"([\\^$.|?*+()\[\]{}])", r"\\\1", text.lower())
+
+
+def _to_ere(pattern):
+    """
+    Traduce una expresión regular de Python a ERE de awk, o None si no es posible.
+
+    Recorre el patrón teniendo en cuenta los escapes y las expresiones entre
+    corchetes; cualquier construcción sin equivalente seguro devuelve None,
+    porque el filtro remoto nunca debe descartar lo que el local acepta.
+    """
+    out = []
+    in_bracket = False
+    quantifier = False  # El carácter anterior era un cuantificador
+    i, length = 0, len(pattern)
+    while i < length:
+        char = pattern[i]
+        quantified, quantifier = quantifier, False
+        if char == "\\":
+            if i + 1 == length:
+                return None
+            escaped = pattern[i + 1]
+            i += 2
+            if in_bracket:
+                if escaped in _ERE_BRACKET_CLASSES:
+                    out.append(_ERE_BRACKET_CLASSES[escaped])
+                elif escaped in _ERE_BRACKET_LITERALS:
+                    out.append(escaped)
+                else:
+                    return None
+            elif escaped in _ERE_CLASSES:
+                out.append(_ERE_CLASSES[escaped])
+            elif escaped in _ERE_META:
+                out.append("\\" + escaped)
+            else:
+                return None
+            continue
+        i += 1
+        if in_bracket:
+            if char == "[":
+                return None  # [[:clase:]] no significa lo mismo en Python
+            in_bracket = char != "]"
+        elif char == "[":
+            in_bracket = True
+            # "^" y "]" al principio forman parte de la expresión
+            if pattern.startswith("^", i):
+                char += "^"
+                i += 1
+            if pattern.startswith("]", i):
+                char += "]"
+                i += 1
+        elif char == "(" and pattern.startswith("?", i):
+            return None
+        elif char == "{":
+            return None  # El mawk de Debian y Ubuntu no admite {m,n}
+        elif char in "*+?":
+            if quantified:
+                return None  # Perezoso (+?) o posesivo (*+): ERE no los tiene
+            quantifier = True
+        # Las líneas se comparan en minúsculas
+        out.append(char.lower())
+    return None if in_bracket else "".join(out)
+
+
+def _combine(patterns, flags=0):
+    return re.compile("|".join(patterns), flags) if patterns else None
+
+
+class LogFilter:
+    """
+    Conjunto de filtros compilado en un único patrón por tipo.
+
+    Los filtros de texto se comparan sin distinguir mayúsculas contra la
+    línea en minúsculas, que se calcula una sola vez por línea; los de
+    expresión regular usan re.IGNORECASE sobre la línea original. Una línea
+    pasa si coincide con algún filtro de inclusión (o no hay ninguno) y con
+    ninguno de exclusión. Un patrón no válido lanza re.error al crear el filtro.
+    """
+
+    def __init__(self, rules=()):
+        self.rules = tuple(FilterRule(*rule) for rule in rules)
+        by_mode = {mode: [] for mode in FILTER_MODES}
+        for rule in self.rules:
+            by_mode[rule.mode].append(rule.pattern)
+
+        self._include_text = _combine([re.escape(p.lower()) for p in by_mode["include"]])
+        self._exclude_text = _combine([re.escape(p.lower()) for p in by_mode["exclude"]])
+        self._include_regex = _combine(
+            [f"(?:{p})" for p in by_mode["regex"]], re.IGNORECASE
+        )
+        self._exclude_regex = _combine(
+            [f"(?:{p})" for p in by_mode["exclude_regex"]], re.IGNORECASE
+        )
+        self._has_include = bool(by_mode["include"] or by_mode["regex"])
+        self._needs_lower = bool(by_mode["include"] or by_mode["exclude"])
+
+    @property
+    def active(self):
+        return bool(self.rules)
+
+    def matches(self, line):
+        """
+        Indica si la línea pasa el filtro.
+        """
+        lower = line.lower() if self._needs_lower else line
+        if self._has_include and not (
+            (self._include_text is not None and self._include_text.search(lower))
+            or (self._include_regex is not None and self._include_regex.search(line))
+        ):
+            return False
+        if self._exclude_text is not None and self._exclude_text.search(lower):
+            return False
+        if self._exclude_regex is not None and self._exclude_regex.search(line):
+            return False
+        return True
+
+    def remote_patterns(self):
+        """
+        Patrones ERE (inclusión, exclusión) para filtrar en el servidor.
+
+        El filtro remoto solo descarta lo que el local también descartaría:
+        si alguna expresión de inclusión no se puede traducir a ERE no se
+        filtran inclusiones en el servidor, y las exclusiones que no se
+        pueden traducir se aplican solo en local.
+        """
+        include = [_ere_escape(r.pattern) for r in self.rules if r.mode == "include"]
+        exclude = [_ere_escape(r.pattern) for r in self.rules if r.mode == "exclude"]
+        for rule in self.rules:
+            if rule.mode in ("regex", "exclude_regex"):
+                translated = _to_ere(rule.pattern)
+                if rule.mode == "exclude_regex":
+                    if translated is not None:
+                        exclude.append(f"({translated})")
+                elif translated is None:
+                    include = None
+                elif include is not None:
+                    include.append(f"({translated})")
+        return "|".join(include or ()), "|".join(exclude)
+
+    def remote_command(self, command):
+        """
+        `command` seguido del filtro remoto, o tal cual si no hay nada que filtrar.
+        """
+        include, exclude = self.remote_patterns()
+        if not include and not exclude:
+            return command
+        return (
+            f"{command} | SSHS_INC={shlex.quote(include)} SSHS_EXC={shlex.quote(exclude)} "
+            f"awk {shlex.quote(_REMOTE_FILTER_AWK)}"
+        )
+
+    def select(self, buffer, start, end):
+        """
+        Secuencias de [start, end) del búfer que pasan el filtro.
+        """
+        start = max(start, buffer.first_seq)
+        lines = buffer.lines(start, end)
+        rows = list(itertools.compress(itertools.count(start), map(self.matches, lines)))
+        # Las líneas desalojadas mientras se recorría el búfer no cuentan
+        return rows[bisect.bisect_left(rows, buffer.first_seq):]
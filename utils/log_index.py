@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: log_index.py
+# Project: SSH-Sentinel
+# File Created: Sunday, 18th October 2026 5:58:12 pm
+# Author: Daniel Rodríguez Cabrera (daniel8rc@gmail.com)
+# Version: 1.0.0
+# -----
+# Last Modified: Sunday, 18th October 2026 5:58:12 pm
+# Modified By: Daniel Rodríguez Cabrera
+# -----
+# Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
+###
+import bisect
+import itertools
+import re
+import sys
+import threading
+from collections import deque
+
+# Palabras, IPs, IDs de petición, rutas... (sin la puntuación de los extremos)
+_TOKEN = re.compile(r"\w[\w.:\-/@]*\w|\w")
+
+# Mayor que cualquier carácter: [prefijo, prefijo + _MAX_CHAR) acota un prefijo
+_MAX_CHAR = "\U0010ffff"
+
+
+def tokenize(line):
+    """
+    Términos distintos de una línea, en minúsculas.
+    """
+    return set(_TOKEN.findall(line.lower()))
+
+
+def parse_query(query):
+    """
+    Términos de una consulta: lista de (término, es_prefijo).
+
+    Cada palabra se trocea igual que las líneas; un `*` final convierte su
+    último término en una búsqueda por prefijo, que conserva la puntuación
+    final (`10.0.3.*` no debe encontrar 10.0.30.1).
+    """
+    terms = []
+    for word in query.lower().split():
+        prefix = word.endswith("*")
+        word = word.rstrip("*")
+        matches = list(_TOKEN.finditer(word))
+        terms.extend((match.group(), False) for match in matches[:-1])
+        if matches:
+            last = matches[-1]
+            terms.append((word[last.start():] if prefix else last.group(), prefix))
+    return terms
+
+
+def _intersect(a, b):
+    """
+    Intersección de dos listas ordenadas de secuencias.
+    """
+    if len(a) > len(b):
+        a, b = b, a
+    b_set = set(b)
+    return [seq for seq in a if seq in b_set]
+
+
+class TokenIndex:
+    """
+    Índice invertido de las líneas de un LogBuffer.
+
+    Se alimenta con las líneas según llegan y desaloja a la vez que el búfer,
+    así que su tamaño está acotado por la capacidad de este. Cada término
+    apunta a la lista ordenada de secuencias que lo contienen. Para buscar
+    por prefijo se mantiene además el vocabulario ordenado, que se completa
+    con los términos nuevos solo al consultar: ordenar una lista ya ordenada
+    más un tramo nuevo es casi lineal, y luego basta una bisección.
+
+    Indexar cuesta unas decenas de microsegundos por línea, así que se hace
+    desde un hilo aparte; `add` y `search` se sincronizan con un cerrojo.
+    """
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self._postings = {}  # término -> deque de secuencias crecientes
+        self._vocabulary = []  # Términos ordenados (puede haber desalojados)
+        self._new_terms = []  # Términos añadidos desde la última ordenación
+        self._evicted_terms = 0
+        self._line_tokens = deque()  # términos de cada línea indexada, en orden
+        self.first_seq = buffer.next_seq  # Secuencia de la línea más antigua indexada
+        self.next_seq = self.first_seq  # Secuencia de la próxima línea a indexar
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._postings)
+
+    def add(self, start, lines):
+        """
+        Indexa `lines`, cuya primera línea tiene la secuencia `start`.
+        """
+        with self._lock:
+            if not self._line_tokens:
+                self.first_seq = start
+            postings, new_terms = self._postings, self._new_terms
+            seq = start
+            for line in lines:
+                # Los términos se internan para no duplicar cadenas entre líneas
+                tokens = tuple(sys.intern(token) for token in tokenize(line))
+                for token in tokens:
+                    posting = postings.get(token)
+                    if posting is None:
+                        postings[token] = posting = deque()
+                        new_terms.append(token)
+                    posting.append(seq)
+                self._line_tokens.append(tokens)
+                seq += 1
+            self.next_seq = seq
+            self._evict()
+
+    def _evict(self):
+        """
+        Olvida las líneas que el búfer ya ha desalojado.
+        """
+        postings = self._postings
+        while self._line_tokens and self.first_seq < self.buffer.first_seq:
+            for token in self._line_tokens.popleft():
+                posting = postings[token]
+                posting.popleft()  # Es la secuencia más antigua del término
+                if not posting:
+                    del postings[token]
+                    self._evicted_terms += 1
+            self.first_seq += 1
+
+    def clear(self):
+        with self._lock:
+            self._postings.clear()
+            self._vocabulary.clear()
+            self._new_terms.clear()
+            self._evicted_terms = 0
+            self._line_tokens.clear()
+            self.first_seq = self.next_seq = self.buffer.next_seq
+
+    def _sorted_vocabulary(self):
+        vocabulary = self._vocabulary
+        if self._evicted_terms > len(vocabulary) // 2:
+            vocabulary[:] = [t for t in dict.fromkeys(vocabulary) if t in self._postings]
+            self._evicted_terms = 0
+        if self._new_terms:
+            self._new_terms.sort()
+            vocabulary.extend(self._new_terms)
+            vocabulary.sort()
+            self._new_terms.clear()
+        return vocabulary
+
+    def _term(self, term, prefix=False):
+        """
+        Secuencias de un término, o de todos los que empiezan por él.
+        """
+        if not prefix:
+            return list(self._postings.get(term, ()))
+        vocabulary = self._sorted_vocabulary()
+        low = bisect.bisect_left(vocabulary, term)
+        high = bisect.bisect_left(vocabulary, term + _MAX_CHAR, low)
+        # Un término desalojado y vuelto a añadir puede aparecer dos veces
+        tokens = dict.fromkeys(vocabulary[low:high])
+        lists = [self._postings[token] for token in tokens if token in self._postings]
+        if len(lists) == 1:
+            return list(lists[0])
+        # Una línea puede contener varios términos con el mismo prefijo
+        return sorted(set(itertools.chain.from_iterable(lists)))
+
+    def search(self, query):
+        """
+        Secuencias ordenadas de las líneas que contienen todos los términos
+        de la consulta (separados por espacios, `abc*` para prefijos).
+        """
+        terms = parse_query(query)
+        if not terms:
+            return []
+        rows = None
+        with self._lock:
+            # Los términos exactos suelen ser los más selectivos: van primero
+            for term, prefix in sorted(terms, key=lambda t: t[1]):
+                term_rows = self._term(term, prefix)
+                rows = term_rows if rows is None else _intersect(rows, term_rows)
+                if not rows:
+                    return []
+        # El índice puede ir algo por detrás de los desalojos del búfer
+        return rows[bisect.bisect_left(rows, self.buffer.first_seq):]
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: log_merge.py
+# Project: SSH-Sentinel
+# File Created: Sunday, 18th October 2026 9:12:40 pm
+# Author: Daniel Rodríguez Cabrera (daniel8rc@gmail.com)
+# Version: 1.0.0
+# -----
+# Last Modified: Sunday, 18th October 2026 9:12:40 pm
+# Modified By: Daniel Rodríguez Cabrera
+# -----
+# Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
+###
+import calendar
+import heapq
+import itertools
+import re
+import threading
+import time
+from collections import deque
+
+# Segundos que se retiene cada línea esperando a otras anteriores de los
+# demás orígenes (desfase de relojes y latencia de la red)
+REORDER_WINDOW = 1.0
+
+_MONTHS = {
+    name: number
+    for number, name in enumerate(
+        ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"),
+        start=1,
+    )
+}
+
+# Formatos de marca de tiempo: (patrón, se busca en los primeros N caracteres
+# o None si debe estar al principio de la línea)
+_FORMATS = (
+    # ISO 8601: journalctl -o short-iso-precise, logs de aplicaciones y JSON
+    (
+        re.compile(
+            r"(?P<year>\d{4})-(?P<month>\d{2})-(?P<day>\d{2})[T ]"
+            r"(?P<time>\d{2}:\d{2}:\d{2})(?:[.,](?P<frac>\d+))?"
+            r"(?P<tz>Z|[+-]\d{2}:?\d{2})?"
+        ),
+        100,
+    ),
+    # syslog (RFC 3164): Oct 18 21:12:40, sin año ni zona
+    (
+        re.compile(
+            r"(?P<month>[A-Z][a-z]{2}) {1,2}(?P<day>\d{1,2}) "
+            r"(?P<time>\d{2}:\d{2}:\d{2})(?:\.(?P<frac>\d+))?"
+        ),
+        None,
+    ),
+    # Log de errores de nginx: 2026/10/18 21:12:40
+    (
+        re.compile(
+            r"(?P<year>\d{4})/(?P<month>\d{2})/(?P<day>\d{2}) (?P<time>\d{2}:\d{2}:\d{2})"
+        ),
+        None,
+    ),
+    # Common/combined log format: [18/Oct/2026:21:12:40 +0200]
+    (
+        re.compile(
+            r"\[(?P<day>\d{2})/(?P<month>[A-Z][a-z]{2})/(?P<year>\d{4}):"
+            r"(?P<time>\d{2}:\d{2}:\d{2}) (?P<tz>[+-]\d{4})\]"
+        ),
+        200,
+    ),
+)
+
+
+class TimestampParser:
+    """
+    Extrae la marca de tiempo (segundos epoch) de las líneas de un origen.
+
+    Un mismo origen casi siempre usa un único formato, así que se prueba
+    primero el último que funcionó. La conversión a epoch se guarda por
+    segundo: las líneas del mismo segundo solo cuestan la expresión regular.
+    Las marcas sin zona horaria se toman como hora local y las de syslog,
+    sin año, como del año en curso (o del anterior si quedarían en el futuro).
+    """
+
+    def __init__(self):
+        self._formats = list(_FORMATS)
+        self._seconds = {}
+
+    def parse(self, line):
+        """
+        Instante de la línea o None si no tiene una marca reconocible.
+        """
+        for position, (pattern, window) in enumerate(self._formats):
+            if window is None:
+                match = pattern.match(line)
+            else:
+                match = pattern.search(line, 0, window)
+            if match is not None:
+                if position:
+                    # El formato que funciona pasa a probarse primero
+                    self._formats.insert(0, self._formats.pop(position))
+                return self._convert(match)
+        return None
+
+    def _convert(self, match):
+        fields = match.groupdict()
+        key = (fields.get("year"), fields["month"], fields["day"], fields["time"], fields.get("tz"))
+        seconds = self._seconds.get(key)
+        if seconds is None:
+            if len(self._seconds) > 4096:
+                self._seconds.clear()
+            seconds = self._seconds[key] = _to_epoch(*key)
+        frac = fields.get("frac")
+        return seconds + int(frac) / 10 ** len(frac) if frac else seconds
+
+
+def _to_epoch(year, month, day, clock, tz):
+    month = int(month) if month.isdigit() else _MONTHS.get(month.lower(), 1)
+    hour, minute, second = map(int, clock.split(":"))
+    if year is None:
+        now = time.time()
+        year = time.localtime(now).tm_year
+        seconds = time.mktime((year, month, int(day), hour, minute, second, 0, 0, -1))
+        if seconds > now + 86400:
+            # Diciembre leído en enero
+            seconds = time.mktime((year - 1, month, int(day), hour, minute, second, 0, 0, -1))
+        return seconds
+    fields = (int(year), month, int(day), hour, minute, second, 0, 0, -1)
+    if tz is None:
+        return time.mktime(fields)
+    offset = 0
+    if tz != "Z":
+        digits = tz[1:].replace(":", "")
+        offset = int(digits[:2]) * 3600 + int(digits[2:]) * 60
+        if tz[0] == "-":
+            offset = -offset
+    return calendar.timegm(fields) - offset
+
+
+class LogMerger:
+    """
+    Mezcla por marca de tiempo las líneas de varios orígenes (k-way merge).
+
+    Cada origen tiene su cola, ordenada por construcción: una línea sin
+    marca, o con una anterior a la de la línea previa del mismo origen,
+    hereda la de esta. Un montículo con la cabeza de cada cola da la línea
+    más antigua. Esa línea sale en cuanto todos los orígenes vivos tienen
+    algo pendiente (ya nada puede adelantarla) o cuando lleva `window`
+    segundos esperando; así un origen callado no detiene a los demás y las
+    líneas que llegan algo tarde aún se colocan en su sitio.
+
+    `push` se llama desde los hilos lectores y `pop_ready` desde la interfaz.
+    """
+
+    def __init__(self, sources, window=REORDER_WINDOW):
+        self.window = window
+        self.late = 0  # Líneas que llegaron después de otras más recientes ya mostradas
+        self._queues = [deque() for _ in range(sources)]
+        self._parsers = [TimestampParser() for _ in range(sources)]
+        self._last = [None] * sources  # Último instante de cada origen
+        self._active = [True] * sources
+        self._waiting = sources  # Orígenes vivos sin nada pendiente
+        self._heap = []  # (instante, orden, origen) de la cabeza de cada cola
+        self._order = itertools.count()
+        self._released = float("-inf")  # Instante de la última línea entregada
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return sum(len(queue) for queue in self._queues)
+
+    def push(self, source, lines, now=None):
+        """
+        Añade líneas de un origen: [(texto del que leer la marca, dato a entregar)].
+        """
+        now = time.monotonic() if now is None else now
+        parser = self._parsers[source]
+        entries = []
+        last = self._last[source]
+        for line, payload in lines:
+            stamp = parser.parse(line)
+            if stamp is None or (last is not None and stamp < last):
+                stamp = last if last is not None else time.time()
+            last = stamp
+            entries.append((stamp, now, payload))
+        if not entries:
+            return
+        with self._lock:
+            self._last[source] = last
+            queue = self._queues[source]
+            if not queue:
+                first = entries[0][0]
+                heapq.heappush(self._heap, (first, next(self._order), source))
+                if self._active[source]:
+                    self._waiting -= 1
+            queue.extend(entries)
+
+    def finish(self, source):
+        """
+        El origen ya no enviará más líneas: no hay que esperarle.
+        """
+        with self._lock:
+            if self._active[source]:
+                self._active[source] = False
+                if not self._queues[source]:
+                    self._waiting -= 1
+
+    def restart(self):
+        """
+        Vuelve a esperar a todos los orígenes (p. ej. al reabrir sus streams).
+        """
+        with self._lock:
+            for source, active in enumerate(self._active):
+                if not active:
+                    self._active[source] = True
+                    if not self._queues[source]:
+                        self._waiting += 1
+
+    def pop_ready(self, now=None, flush=False):
+        """
+        Datos de las líneas que ya pueden mostrarse, en orden; con `flush`, todas.
+        """
+        now = time.monotonic() if now is None else now
+        deadline = now - self.window
+        ready = []
+        with self._lock:
+            heap, queues = self._heap, self._queues
+            while heap:
+                stamp, order, source = heap[0]
+                queue = queues[source]
+                if self._waiting and not flush and queue[0][1] > deadline:
+                    break
+                payload = queue.popleft()[2]
+                ready.append(payload)
+                if stamp < self._released:
+                    self.late += 1
+                else:
+                    self._released = stamp
+                if queue:
+                    heapq.heapreplace(heap, (queue[0][0], order, source))
+                else:
+                    heapq.heappop(heap)
+                    if self._active[source]:
+                        self._waiting += 1
+        return ready
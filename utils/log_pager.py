@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: log_pager.py
+# Project: SSH-Sentinel
+# File Created: Sunday, 18th October 2026 6:47:30 pm
+# Author: Daniel Rodríguez Cabrera (daniel8rc@gmail.com)
+# Version: 1.0.0
+# -----
+# Last Modified: Sunday, 18th October 2026 6:47:30 pm
+# Modified By: Daniel Rodríguez Cabrera
+# -----
+# Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
+###
+import bisect
+import shlex
+import threading
+from collections import OrderedDict
+from loguru import logger
+
+# Bytes que se piden al servidor en cada página del historial
+PAGE_SIZE = 256 * 1024
+
+# Páginas que se conservan en memoria; las demás se vuelven a pedir al verlas
+CACHE_PAGES = 64
+
+# Una línea más larga que esto se corta para no pedir páginas sin fin
+MAX_PAGE_SIZE = 8 * PAGE_SIZE
+
+# Texto de las líneas cuya página se está volviendo a leer
+PLACEHOLDER = "…"
+
+# Descarta la primera línea (cortada) y antes escribe cuántos bytes ocupaba,
+# con su salto de línea: con LC_ALL=C, length() cuenta bytes y no caracteres
+_DROP_FIRST_AWK = "NR == 1 { print length($0) + 1; next } { print }"
+
+
+class RemoteLogPager:
+    """
+    Lectura bajo demanda de la parte de un fichero remoto anterior al tail.
+
+    El historial se lee hacia atrás desde `end_offset` en páginas que
+    terminan y empiezan en un salto de línea: se piden PAGE_SIZE bytes con
+    `tail -c +N | head -c L` (tail salta directamente al desplazamiento) y
+    se descarta la primera línea, que suele estar cortada; su longitud en
+    bytes, medida en el servidor (el texto recibido ya está decodificado y
+    no sirve para contar bytes), fija dónde empieza la página. Cada página
+    recuerda su rango exacto y su número de líneas, así que puede
+    desalojarse de la caché (LRU) y volver a leerse más tarde sin que cambie
+    la numeración.
+
+    Las líneas del historial tienen secuencias negativas: -1 es la última
+    antes de `end_offset` y siguen hacia atrás, de modo que encajan justo
+    debajo de las del LogBuffer del stream en vivo, que empiezan en 0.
+    """
+
+    def __init__(
+        self,
+        ssh_manager,
+        server,
+        path,
+        end_offset,
+        classify=None,
+        page_size=PAGE_SIZE,
+        cache_pages=CACHE_PAGES,
+    ):
+        self.ssh_manager = ssh_manager
+        self.server = server
+        self.path = path
+        self.end_offset = end_offset
+        self.classify = classify or (lambda line: None)
+        self.page_size = page_size
+        self.cache_pages = cache_pages
+        # Páginas de la más reciente a la más antigua: (inicio, fin) en bytes
+        self._ranges = []
+        # Líneas acumuladas hasta el final de cada página (creciente)
+        self._depths = []
+        self._cache = OrderedDict()  # página -> [(línea, etiqueta)]
+        self._lock = threading.Lock()
+
+    @property
+    def line_count(self):
+        return self._depths[-1] if self._depths else 0
+
+    @property
+    def first_seq(self):
+        return -self.line_count
+
+    @property
+    def start_offset(self):
+        """
+        Desplazamiento del primer byte ya paginado.
+        """
+        return self._ranges[-1][0] if self._ranges else self.end_offset
+
+    @property
+    def exhausted(self):
+        return self.start_offset == 0
+
+    def page_of(self, seq):
+        """
+        Página que contiene una secuencia negativa del historial.
+        """
+        return bisect.bisect_left(self._depths, -seq)
+
+    def get(self, seq):
+        """
+        (línea, etiqueta) de la secuencia, o None si su página no está en caché.
+        """
+        with self._lock:
+            page = self.page_of(seq)
+            lines = self._cache.get(page)
+            if lines is None:
+                return None
+            self._cache.move_to_end(page)
+            previous = self._depths[page - 1] if page else 0
+            return lines[len(lines) - (-seq - previous)]
+
+    def _read(self, start, end, drop_first):
+        """
+        Lee las líneas de [start, end) del fichero remoto.
+
+        Devuelve (texto, bytes descartados al principio): con `drop_first`
+        se quita la primera línea y se informa de su tamaño; si no, 0.
+        """
+        command = f"tail -c +{start + 1} {shlex.quote(self.path)} | head -c {end - start}"
+        if drop_first:
+            command += f" | LC_ALL=C awk {shlex.quote(_DROP_FIRST_AWK)}"
+        exit_status, output, error = self.ssh_manager.run_command(self.server, command)
+        if exit_status != 0:
+            raise RuntimeError(error.strip() or f"código de salida {exit_status}")
+        if not drop_first:
+            return output, 0
+        dropped, _, output = output.partition("\n")
+        return output, int(dropped or 0)
+
+    def _store(self, page, lines):
+        self._cache[page] = lines
+        self._cache.move_to_end(page)
+        while len(self._cache) > self.cache_pages:
+            self._cache.popitem(last=False)
+
+    def fetch_older(self):
+        """
+        Lee la página anterior a la más antigua cargada (bloquea: llamar
+        desde un hilo). Devuelve el número de líneas nuevas.
+        """
+        end = self.start_offset
+        if end == 0:
+            return 0
+        size = self.page_size
+        while True:
+            start = max(end - size, 0)
+            output, dropped = self._read(start, end, drop_first=start > 0)
+            if output or start == 0:
+                break
+            if size >= MAX_PAGE_SIZE:
+                # Una sola línea enorme: se muestra cortada
+                output, dropped = self._read(start, end, drop_first=False)
+                break
+            size *= 2
+        # Lo descartado (la línea cortada) marca el inicio real de la página
+        start += dropped
+        lines = [(line, self.classify(line)) for line in output.splitlines()]
+        with self._lock:
+            self._ranges.append((start, end))
+            self._depths.append(self.line_count + len(lines))
+            self._store(len(self._ranges) - 1, lines)
+        logger.debug(
+            f"Historial de {self.path}: {len(lines)} líneas de los bytes {start}-{end}"
+        )
+        return len(lines)
+
+    def load_page(self, page):
+        """
+        Vuelve a leer una página desalojada de la caché (bloquea).
+        """
+        start, end = self._ranges[page]
+        output, _ = self._read(start, end, drop_first=False)
+        lines = [(line, self.classify(line)) for line in output.splitlines()]
+        previous = self._depths[page - 1] if page else 0
+        expected = self._depths[page] - previous
+        # Si el fichero cambió la numeración se mantiene: se recorta o se rellena
+        lines = lines[:expected] + [(PLACEHOLDER, None)] * (expected - len(lines))
+        with self._lock:
+            self._store(page, lines)
+
+
+class ScrollbackBuffer:
+    """
+    Vista de solo lectura que une el historial paginado y el búfer en vivo.
+
+    Ofrece la misma interfaz que LogBuffer para VirtualLogView. El historial
+    solo se muestra mientras el búfer en vivo conserve su primera línea; si
+    ya ha desalojado alguna, ambos dejarían de ser contiguos.
+    `on_missing(page)` se llama al pedir una línea cuya página no está en
+    caché, que mientras tanto se muestra como PLACEHOLDER.
+    """
+
+    def __init__(self, buffer, pager=None, on_missing=None):
+        self.buffer = buffer
+        self.pager = pager
+        self.on_missing = on_missing
+
+    @property
+    def history_visible(self):
+        return self.pager is not None and self.buffer.first_seq == 0
+
+    @property
+    def first_seq(self):
+        if self.history_visible:
+            return self.pager.first_seq
+        return self.buffer.first_seq
+
+    @property
+    def next_seq(self):
+        return self.buffer.next_seq
+
+    def __len__(self):
+        return self.next_seq - self.first_seq
+
+    def get(self, seq):
+        if seq >= 0 or not self.history_visible:
+            return self.buffer.get(seq)
+        if seq < self.pager.first_seq:
+            return None
+        entry = self.pager.get(seq)
+        if entry is None:
+            if self.on_missing is not None:
+                self.on_missing(self.pager.page_of(seq))
+            return PLACEHOLDER, None
+        return entry
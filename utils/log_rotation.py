@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: log_rotation.py
+# Project: SSH-Sentinel
+# File Created: Sunday, 18th October 2026 7:34:08 pm
+# Author: Daniel Rodríguez Cabrera (daniel8rc@gmail.com)
+# Version: 1.0.0
+# -----
+# Last Modified: Sunday, 18th October 2026 7:34:08 pm
+# Modified By: Daniel Rodríguez Cabrera
+# -----
+# Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
+###
+import shlex
+
+# Línea de control que precede al contenido de cada fichero del histórico
+FILE_MARKER_PREFIX = "\x1eSSHS_FILE "
+
+# Recorre el juego de rotación de "$p" (p.1, p.2.gz, p-20261017.gz...) del
+# más antiguo al más reciente según la fecha de modificación, que sirve tanto
+# para la numeración de logrotate como para dateext, y vuelca cada fichero
+# descomprimido en orden. Antes de cada uno emite una línea de control con su
+# posición y nombre. La salida es continua: las primeras líneas llegan en
+# cuanto empieza a descomprimirse el fichero más antiguo.
+_ARCHIVE_SCRIPT = r"""
+files=$(ls -1dtr -- "$p" "$p".* "$p"-* 2>/dev/null | grep -v -e '\.lock$' -e '\.tmp$')
+n=$(printf '%s\n' "$files" | grep -c .)
+i=0
+printf '%s\n' "$files" | while IFS= read -r f; do
+    [ -n "$f" ] || continue
+    i=$((i + 1))
+    printf '\036SSHS_FILE %d %d %s\n' "$i" "$n" "$f"
+    case "$f" in
+        *.gz|*.Z) gzip -cdf -- "$f" ;;
+        *.bz2) bzip2 -cd -- "$f" ;;
+        *.xz) xz -cd -- "$f" ;;
+        *.zst) zstd -cdq -- "$f" ;;
+        *) cat -- "$f" ;;
+    esac
+done
+"""
+
+
+def archive_command(path):
+    """
+    Comando que emite, en orden cronológico, todo el juego de rotación de `path`.
+    """
+    return f"p={shlex.quote(path)}; {_ARCHIVE_SCRIPT.strip()}"
+
+
+def parse_file_marker(line):
+    """
+    (posición, total, fichero) de una línea de control del histórico, o None.
+    """
+    if not line.startswith(FILE_MARKER_PREFIX):
+        return None
+    try:
+        index, total, path = line[len(FILE_MARKER_PREFIX):].rstrip("\n").split(" ", 2)
+        return int(index), int(total), path
+    except ValueError:
+        return None
+
+
+def stat_command(path):
+    """
+    Comando que imprime el inodo y el tamaño del fichero al que apunta `path`.
+    """
+    return f"stat -Lc '%i %s' {shlex.quote(path)}"
+
+
+def parse_stat(output):
+    """
+    (inodo, tamaño) de la salida de stat_command, o None.
+    """
+    try:
+        inode, size = output.split()
+        return int(inode), int(size)
+    except ValueError:
+        return None
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: log_severity.py
+# Project: SSH-Sentinel
+# File Created: Sunday, 18th October 2026 5:21:44 pm
+# Author: Daniel Rodríguez Cabrera (daniel8rc@gmail.com)
+# Version: 1.0.0
+# -----
+# Last Modified: Sunday, 18th October 2026 5:21:44 pm
+# Modified By: Daniel Rodríguez Cabrera
+# -----
+# Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
+###
+import re
+import time
+from collections import deque
+from loguru import logger
+
+# Niveles de severidad, de mayor a menor
+LEVELS = ("critical", "error", "warning", "info", "debug")
+
+LEVEL_LABELS = {
+    "critical": "Críticos",
+    "error": "Errores",
+    "warning": "Avisos",
+    "info": "Info",
+    "debug": "Debug",
+}
+
+# Palabras (en minúsculas) que identifican cada nivel, en el texto o en el
+# campo "level" de los logs JSON
+_LEVEL_WORDS = {
+    "critical": "critical", "crit": "critical", "emerg": "critical",
+    "emergency": "critical", "alert": "critical", "fatal": "critical",
+    "panic": "critical",
+    "error": "error", "err": "error",
+    "warn": "warning", "warning": "warning",
+    "info": "info", "information": "info", "notice": "info",
+    "debug": "debug", "trace": "debug",
+}
+
+# Una palabra de nivel cuenta solo entera y fuera de rutas y nombres de
+# fichero: ni "forewarned" ni "emergency_contact" ni "/static/error.png".
+# Antes no puede ir una letra, "/", "." ni "-", y después tampoco una letra,
+# "/" ni "-", ni un "." seguido de letra (el punto final de una frase sí vale).
+_WORD_END = r"(?![\w/-]|\.\w)"
+
+
+def _word(literal, suffix=""):
+    # El lookbehind va tras el literal para que la alternativa siga empezando por él
+    return rf"{literal}(?<![\w/.-]{literal}){suffix}{_WORD_END}"
+
+
+# Todas las alternativas empiezan por un literal y no tienen grupos: así re
+# descarta de golpe las posiciones que no pueden empezar una coincidencia y la
+# búsqueda es varias veces más rápida. El nivel se deduce del texto encontrado.
+_BUILTIN_PATTERN = "|".join((
+    r'"(?:level|severity|lvl)"\s*:\s*"[a-z]+"',  # JSON: "level": "warn"
+    _word("crit", "(?:ical)?"), _word("emerg", "(?:ency)?"), _word("alert"),
+    _word("fatal"), _word("panic"),
+    _word("err", "(?:or)?"),  # También [error] de nginx
+    _word("warn", "(?:ing)?"), _word("info", "(?:rmation)?"), _word("notice"),
+    _word("debug"), _word("trace"),
+))
+
+_JSON_RANK = len(LEVELS)  # El campo JSON pesa más que las palabras sueltas
+_CUSTOM_RANK = _JSON_RANK + 1
+
+
+class SeverityClassifier:
+    """
+    Clasifica líneas de log por severidad con un único patrón precompilado.
+
+    La línea se pasa a minúsculas una sola vez y se recorre una sola vez.
+    Si coinciden varias cosas gana, por este orden: un patrón propio del
+    servicio, el campo "level" de un log JSON y la palabra de mayor
+    severidad. Los patrones propios vienen de la clave `severity_patterns`
+    del servicio ({nivel: [regex, ...]}) y se comparan con la línea en
+    minúsculas; los que no son válidos se ignoran con un aviso.
+    """
+
+    def __init__(self, custom_patterns=None):
+        groups = []
+        self._custom_levels = {}
+        for level, patterns in (custom_patterns or {}).items():
+            if level not in LEVELS:
+                logger.warning(f"Nivel de severidad desconocido en severity_patterns: {level}")
+                continue
+            for pattern in patterns:
+                name = f"custom{len(groups)}"
+                group = f"(?P<{name}>{pattern})"
+                try:
+                    # Se prueba ya unido a los demás: hay patrones válidos
+                    # por separado que no lo son dentro del conjunto (p. ej. "(?i)x")
+                    re.compile("|".join(groups + [group, _BUILTIN_PATTERN]))
+                except re.error as e:
+                    logger.warning(f"Patrón de severidad no válido '{pattern}': {e}")
+                    continue
+                groups.append(group)
+                self._custom_levels[name] = level
+        self._pattern = re.compile("|".join(groups + [_BUILTIN_PATTERN]))
+
+    def classify(self, line):
+        """
+        Nivel de la línea ("critical", "error", ...) o None si no tiene.
+        """
+        best, best_rank = None, -1
+        for match in self._pattern.finditer(line.lower()):
+            if match.lastgroup is not None:
+                return self._custom_levels[match.lastgroup]
+            text = match.group()
+            if text[0] == '"':
+                level = _LEVEL_WORDS.get(text.rsplit('"', 2)[1])
+                rank = _JSON_RANK
+            else:
+                level = _LEVEL_WORDS.get(text)
+                rank = len(LEVELS) - LEVELS.index(level) - 1 if level else -1
+            if level is not None and rank > best_rank:
+                best, best_rank = level, rank
+        return best
+
+
+class SeverityStats:
+    """
+    Contadores por severidad y ritmo de líneas por segundo de un stream.
+
+    Se actualizan con cada lote de líneas que entra en el visor, así que no
+    hace falta volver a recorrer el búfer para mostrarlos.
+    """
+
+    def __init__(self, window=10.0):
+        self.window = window
+        self.counts = dict.fromkeys(LEVELS, 0)
+        self.total = 0
+        self._samples = deque()  # (instante, total acumulado)
+
+    def add(self, levels, now=None):
+        """
+        Cuenta un lote de niveles (None = sin nivel).
+        """
+        now = time.monotonic() if now is None else now
+        counts = self.counts
+        for level in levels:
+            self.total += 1
+            if level is not None:
+                counts[level] += 1
+        self._samples.append((now, self.total))
+        while len(self._samples) > 1 and now - self._samples[0][0] > self.window:
+            self._samples.popleft()
+
+    def rate(self):
+        """
+        Líneas por segundo en la ventana reciente.
+        """
+        if len(self._samples) < 2:
+            return 0.0
+        (start, first), (end, last) = self._samples[0], self._samples[-1]
+        return (last - first) / (end - start) if end > start else 0.0
+
+    def summary(self):
+        parts = [f"{LEVEL_LABELS[level]}: {self.counts[level]}" for level in LEVELS]
+        parts.append(f"{self.rate():.1f} líneas/s")
+        return " · ".join(parts)
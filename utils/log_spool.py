@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: log_spool.py
+# Project: SSH-Sentinel
+# File Created: Sunday, 18th October 2026 8:31:15 pm
+# Author: Daniel Rodríguez Cabrera (daniel8rc@gmail.com)
+# Version: 1.0.0
+# -----
+# Last Modified: Sunday, 18th October 2026 8:31:15 pm
+# Modified By: Daniel Rodríguez Cabrera
+# -----
+# Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
+###
+import hashlib
+import json
+import mmap
+import os
+import queue
+import re
+import threading
+import time
+from array import array
+from loguru import logger
+
+# Tamaño a partir del cual se empieza un segmento nuevo
+SEGMENT_BYTES = 4 * 1024 * 1024
+
+# Tamaño máximo de todo el spool; se desalojan los segmentos menos usados
+MAX_BYTES = 256 * 1024 * 1024
+
+# El índice de cada segmento guarda la posición de una de cada tantas líneas
+INDEX_STRIDE = 1024
+
+# Cada línea se guarda precedida de un carácter con su etiqueta de severidad
+_TAG_CODES = {
+    None: "-",
+    "critical": "c",
+    "error": "e",
+    "warning": "w",
+    "info": "i",
+    "debug": "d",
+}
+_CODE_TAGS = {code: tag for tag, code in _TAG_CODES.items()}
+
+
+def _stream_dirname(server_name, source):
+    readable = re.sub(r"[^A-Za-z0-9._-]+", "_", f"{server_name}_{source}").strip("_")
+    digest = hashlib.sha1(f"{server_name}\0{source}".encode()).hexdigest()[:10]
+    return f"{readable[:60]}-{digest}"
+
+
+class SpoolStream:
+    """
+    Spool de un stream (servidor y origen del log).
+
+    Los datos son segmentos de solo añadir (`NNNNNNNN.seg`) con una línea por
+    fila y, junto a cada uno, un índice (`.idx`) con la posición de una de
+    cada INDEX_STRIDE líneas para saltar al tramo final sin recorrerlo
+    entero. `meta.json` guarda la lista de segmentos y el punto desde el que
+    reanudar el stream remoto (desplazamiento en el fichero o cursor del
+    journal). Se lee con mmap; solo escribe el hilo del LogSpool.
+    """
+
+    def __init__(self, spool, directory, key):
+        self.spool = spool
+        self.directory = directory
+        self.key = key
+        self.meta = {"key": key, "segments": [], "resume": None}
+        self._file = None  # Segmento abierto para escribir
+        self._index = None  # Su índice
+        # Se han perdido líneas por el camino: ningún punto de reanudación vale
+        self.gap = False
+        path = os.path.join(directory, "meta.json")
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    self.meta.update(json.load(f))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Spool {directory} dañado, se empieza de cero: {e}")
+
+    @property
+    def segments(self):
+        return self.meta["segments"]
+
+    @property
+    def resume(self):
+        """
+        Punto de reanudación guardado por el visor, o None.
+        """
+        return self.meta.get("resume")
+
+    @property
+    def size(self):
+        return sum(segment["bytes"] for segment in self.segments)
+
+    def _path(self, segment, suffix):
+        return os.path.join(self.directory, f"{segment['id']:08d}{suffix}")
+
+    def append(self, items, resume=None):
+        """
+        Encola líneas [(línea, etiqueta)] y el punto de reanudación tras ellas.
+        """
+        self.spool._enqueue(self, list(items), resume)
+
+    def close(self, items=(), resume=None):
+        """
+        Como append, y además cierra el segmento en escritura: el visor ya no lo usa.
+        """
+        self.spool._enqueue(self, list(items), resume, release=True)
+
+    def tail(self, max_lines):
+        """
+        Las últimas `max_lines` líneas guardadas, como [(línea, etiqueta)].
+        """
+        with self.spool._lock:
+            segments = [dict(segment) for segment in self.segments]
+            now = time.time()
+            for segment in self.segments:
+                segment["last_used"] = now
+        chosen, total = [], 0
+        for segment in reversed(segments):
+            if total >= max_lines:
+                break
+            chosen.append(segment)
+            total += segment["lines"]
+        chosen.reverse()
+
+        items = []
+        skip = max(total - max_lines, 0)
+        for segment in chosen:
+            try:
+                items.extend(self._read_segment(segment, skip))
+            except (OSError, ValueError) as e:
+                logger.warning(f"No se pudo leer {self._path(segment, '.seg')}: {e}")
+            skip = 0
+        return items
+
+    def _read_segment(self, segment, skip):
+        if not segment["bytes"]:
+            return []
+        with open(self._path(segment, ".seg"), "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                end = min(segment["bytes"], len(data))
+                position = 0
+                if skip:
+                    # Salto a la línea indexada más cercana y el resto a mano
+                    index = array("Q")
+                    with open(self._path(segment, ".idx"), "rb") as idx:
+                        index.frombytes(idx.read())
+                    stride = min(skip // INDEX_STRIDE, len(index) - 1)
+                    position = index[stride] if stride >= 0 else 0
+                    for _ in range(skip - max(stride, 0) * INDEX_STRIDE):
+                        position = data.find(b"\n", position, end) + 1
+                        if position == 0:
+                            return []
+                text = data[position:end].decode("utf-8", errors="replace")
+        lines = text.split("\n")
+        lines.pop()  # Tras el último salto de línea no hay nada
+        return [(line[1:], _CODE_TAGS.get(line[:1])) for line in lines]
+
+    # --- Escritura (solo desde el hilo del LogSpool) ---
+
+    def _open_segment(self):
+        last = self.segments[-1] if self.segments else None
+        if last is None or last["bytes"] >= self.spool.segment_bytes:
+            self._release()
+            last = {
+                "id": last["id"] + 1 if last else 0,
+                "lines": 0,
+                "bytes": 0,
+                "last_used": time.time(),
+            }
+            self.segments.append(last)
+        if self._file is None:
+            # Lo que hubiera tras el último registro completo (p. ej. tras
+            # un cierre inesperado) se descarta, en los datos y en el índice
+            self._file = open(self._path(last, ".seg"), "ab")
+            self._file.truncate(last["bytes"])
+            self._index = open(self._path(last, ".idx"), "ab")
+            self._index.truncate(-(-last["lines"] // INDEX_STRIDE) * 8)
+        return last
+
+    def _write(self, items, resume):
+        position = 0
+        while position < len(items):
+            segment = self._open_segment()
+            chunk, size, index = [], segment["bytes"], array("Q")
+            lines = segment["lines"]
+            while position < len(items) and size < self.spool.segment_bytes:
+                line, tag = items[position]
+                record = f"{_TAG_CODES.get(tag, '-')}{line}\n".encode("utf-8", errors="replace")
+                if lines % INDEX_STRIDE == 0:
+                    index.append(size)
+                chunk.append(record)
+                size += len(record)
+                lines += 1
+                position += 1
+            self._file.write(b"".join(chunk))
+            self._index.write(index.tobytes())
+            with self.spool._lock:
+                segment["bytes"], segment["lines"] = size, lines
+                segment["last_used"] = time.time()
+        self.meta["resume"] = None if self.gap else resume
+
+    def _sync(self):
+        """
+        Vuelca a disco los datos y meta.json (escritura atómica).
+        """
+        if self._file is not None:
+            self._file.flush()
+            self._index.flush()
+        path = os.path.join(self.directory, "meta.json")
+        with self.spool._lock:
+            content = json.dumps(self.meta)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(path + ".tmp", path)
+
+    def _release(self):
+        if self._file is not None:
+            self._file.close()
+            self._index.close()
+            self._file = self._index = None
+
+    def _evict_oldest(self):
+        """
+        Borra el segmento más antiguo y devuelve los bytes liberados.
+        """
+        with self.spool._lock:
+            segment = self.segments.pop(0)
+        if not self.segments:
+            self._release()
+            self.meta["resume"] = None  # Sin datos no hay desde dónde reanudar
+        for suffix in (".seg", ".idx"):
+            try:
+                os.remove(self._path(segment, suffix))
+            except OSError:
+                pass
+        return segment["bytes"]
+
+
+class LogSpool:
+    """
+    Spool local en disco de los streams de log vistos, uno por (servidor, origen).
+
+    Al reabrir un visor se muestran al momento las últimas líneas guardadas y
+    el stream remoto continúa desde donde se quedó. Las escrituras se hacen
+    desde un hilo propio, como en MetricsHistory, y el tamaño total está
+    acotado por `max_bytes`: cuando se supera se borra, de entre todos los
+    streams, el segmento más antiguo del que lleva más tiempo sin usarse.
+    """
+
+    def __init__(
+        self,
+        path="spool",
+        max_bytes=MAX_BYTES,
+        segment_bytes=SEGMENT_BYTES,
+        flush_interval=1.0,
+        max_queue=10_000,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.segment_bytes = segment_bytes
+        self.flush_interval = flush_interval
+        self.dropped = 0
+
+        os.makedirs(path, exist_ok=True)
+        self._lock = threading.Lock()
+        self._streams = {}
+        for name in os.listdir(path):
+            directory = os.path.join(path, name)
+            if os.path.isfile(os.path.join(directory, "meta.json")):
+                stream = SpoolStream(self, directory, None)
+                self._streams[name] = stream
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    def open(self, server_name, source):
+        """
+        Spool del stream `source` (p. ej. "file:/var/log/syslog") del servidor.
+        """
+        name = _stream_dirname(server_name, source)
+        with self._lock:
+            stream = self._streams.get(name)
+            if stream is None:
+                directory = os.path.join(self.path, name)
+                os.makedirs(directory, exist_ok=True)
+                stream = SpoolStream(self, directory, f"{server_name}\0{source}")
+                self._streams[name] = stream
+            stream.gap = False  # Empieza un visor nuevo con su propio punto de partida
+        return stream
+
+    def close(self):
+        """
+        Escribe lo pendiente y detiene el hilo de escritura.
+        """
+        self._stop.set()
+        self._writer.join(timeout=10)
+
+    def _enqueue(self, stream, items, resume, release=False):
+        try:
+            self._queue.put_nowait((stream, items, resume, release))
+        except queue.Full:
+            self.dropped += len(items)
+            # Lo que se escriba después ya no sigue a lo último guardado
+            stream.gap = True
+
+    def _write_loop(self):
+        dirty = set()
+        deadline = time.monotonic() + self.flush_interval
+        while not (self._stop.is_set() and self._queue.empty()):
+            try:
+                stream, items, resume, release = self._queue.get(
+                    timeout=max(deadline - time.monotonic(), 0.01)
+                )
+                try:
+                    stream._write(items, resume)
+                    if release:
+                        stream._sync()
+                        stream._release()
+                    dirty.add(stream)
+                except OSError as e:
+                    logger.error(f"No se pudo escribir en el spool {stream.directory}: {e}")
+            except queue.Empty:
+                pass
+            if time.monotonic() >= deadline or self._stop.is_set():
+                self._flush(dirty)
+                dirty = set()
+                deadline = time.monotonic() + self.flush_interval
+        self._flush(dirty)
+        for stream in self._streams.values():
+            stream._release()
+
+    def _flush(self, streams):
+        if streams:
+            self._enforce_limit(streams)
+        for stream in streams:
+            try:
+                stream._sync()
+            except OSError as e:
+                logger.error(f"No se pudo guardar el spool {stream.directory}: {e}")
+
+    def _enforce_limit(self, dirty):
+        """
+        Desaloja segmentos hasta quedar por debajo de `max_bytes`.
+        """
+        streams = list(self._streams.values())
+        total = sum(stream.size for stream in streams)
+        emptied = []
+        while total > self.max_bytes:
+            # El segmento en escritura de un visor abierto no se desaloja
+            candidates = [
+                stream
+                for stream in streams
+                if len(stream.segments) > 1 or (stream.segments and stream._file is None)
+            ]
+            if not candidates:
+                break
+            stream = min(candidates, key=lambda s: s.segments[0]["last_used"])
+            total -= stream._evict_oldest()
+            dirty.add(stream)
+            if not stream.segments:
+                emptied.append(stream)
+        for stream in emptied:
+            # Stream vacío: se borra también su directorio
+            name = os.path.basename(stream.directory)
+            try:
+                os.remove(os.path.join(stream.directory, "meta.json"))
+                os.rmdir(stream.directory)
+            except OSError:
+                continue
+            with self._lock:
+                self._streams.pop(name, None)
+            dirty.discard(stream)
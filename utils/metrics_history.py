@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: metrics_history.py
+# Project: SSH-Sentinel
+# File Created: Sunday, 18th October 2026 1:12:40 pm
+# Author: Daniel Rodríguez Cabrera (daniel8rc@gmail.com)
+# Version: 1.0.0
+# -----
+# Last Modified: Sunday, 18th October 2026 1:12:40 pm
+# Modified By: Daniel Rodríguez Cabrera
+# -----
+# Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
+###
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from loguru import logger
+
+PARTITION_PREFIX = "samples_"
+
+
+def partition_name(timestamp):
+    """
+    Tabla diaria (UTC) que guarda las muestras de `timestamp`.
+    """
+    day = datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y%m%d")
+    return PARTITION_PREFIX + day
+
+
+class MetricsHistory:
+    """
+    Persistencia local del historial de métricas en SQLite (modo WAL).
+
+    Las muestras se escriben desde un hilo propio en lotes (una transacción
+    por lote), de modo que quien las genera nunca espera al disco. Los datos
+    se reparten en una tabla por día con clave (server, metric, ts): la
+    retención consiste en borrar tablas enteras y las consultas por rango
+    solo recorren los días implicados, usando el índice de la clave.
+    """
+
+    def __init__(
+        self,
+        path="history.db",
+        retention_days=7,
+        batch_size=2000,
+        flush_interval=1.0,
+        max_queue=100_000,
+    ):
+        self.path = path
+        self.retention_days = retention_days
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self.dropped = 0
+        self.written = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._partitions = set()
+        self._stop = threading.Event()
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def write(self, server_name, timestamp, metrics):
+        """
+        Encola una muestra ({métrica: valor}) sin bloquear.
+        """
+        try:
+            self._queue.put_nowait((server_name, timestamp, metrics))
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        """
+        Escribe lo pendiente y detiene el hilo de escritura.
+        """
+        self._stop.set()
+        self._writer.join(timeout=10)
+
+    def _write_loop(self):
+        connection = self._connect()
+        self._partitions = self._existing_partitions(connection)
+        self._apply_retention(connection)
+        next_retention = time.monotonic() + 3600
+        pending = []
+        deadline = time.monotonic() + self.flush_interval
+        while not (self._stop.is_set() and self._queue.empty()):
+            try:
+                pending.append(self._queue.get(timeout=max(deadline - time.monotonic(), 0.01)))
+            except queue.Empty:
+                pass
+            if len(pending) >= self.batch_size or time.monotonic() >= deadline or self._stop.is_set():
+                if pending:
+                    try:
+                        self._flush(connection, pending)
+                    except sqlite3.Error as e:
+                        logger.error(f"No se pudo guardar el historial de métricas: {e}")
+                    pending = []
+                deadline = time.monotonic() + self.flush_interval
+            if time.monotonic() >= next_retention:
+                self._apply_retention(connection)
+                next_retention = time.monotonic() + 3600
+        if pending:
+            self._flush(connection, pending)
+        connection.close()
+
+    def _existing_partitions(self, connection):
+        rows = connection.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name LIKE ?",
+            (PARTITION_PREFIX + "%",),
+        )
+        return {name for (name,) in rows}
+
+    def _ensure_partition(self, connection, name):
+        if name not in self._partitions:
+            connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {name} ("
+                "server TEXT NOT NULL, metric TEXT NOT NULL, ts REAL NOT NULL, value REAL,"
+                " PRIMARY KEY (server, metric, ts)) WITHOUT ROWID"
+            )
+            self._partitions.add(name)
+
+    def _flush(self, connection, samples):
+        by_partition = {}
+        for server_name, timestamp, metrics in samples:
+            rows = by_partition.setdefault(partition_name(timestamp), [])
+            for metric, value in metrics.items():
+                if value == value:  # NaN = sin dato
+                    rows.append((server_name, metric, timestamp, value))
+        with connection:
+            for name, rows in by_partition.items():
+                self._ensure_partition(connection, name)
+                connection.executemany(
+                    f"INSERT OR REPLACE INTO {name} VALUES (?, ?, ?, ?)", rows
+                )
+                self.written += len(rows)
+
+    def _apply_retention(self, connection):
+        """
+        Elimina las tablas diarias más antiguas que el periodo de retención.
+        """
+        limit = partition_name(
+            (datetime.now(timezone.utc) - timedelta(days=self.retention_days)).timestamp()
+        )
+        for name in sorted(self._partitions):
+            if name < limit:
+                with connection:
+                    connection.execute(f"DROP TABLE IF EXISTS {name}")
+                self._partitions.discard(name)
+                logger.info(f"Historial de métricas: partición {name} eliminada")
+
+    def _partitions_between(self, connection, start, end):
+        first, last = partition_name(start), partition_name(end)
+        return [
+            name
+            for name in sorted(self._existing_partitions(connection))
+            if first <= name <= last
+        ]
+
+    def query(self, server_name, metric, start, end=None):
+        """
+        (marcas de tiempo, valores) de una métrica de un servidor en [start, end].
+        """
+        end = time.time() if end is None else end
+        connection = self._connect()
+        try:
+            times, values = [], []
+            for name in self._partitions_between(connection, start, end):
+                for ts, value in connection.execute(
+                    f"SELECT ts, value FROM {name} "
+                    "WHERE server = ? AND metric = ? AND ts BETWEEN ? AND ? ORDER BY ts",
+                    (server_name, metric, start, end),
+                ):
+                    times.append(ts)
+                    values.append(value)
+            return times, values
+        finally:
+            connection.close()
+
+    def query_samples(self, server_name, start, end=None, resolution=None):
+        """
+        Muestras completas [(ts, {métrica: valor})] de un servidor en [start, end].
+
+        Con `resolution` (segundos) devuelve la media de cada intervalo.
+        """
+        end = time.time() if end is None else end
+        if resolution and resolution > 1:
+            columns = "metric, CAST(ts / :res AS INTEGER) * :res AS bucket, AVG(value)"
+            grouping = " GROUP BY metric, bucket"
+        else:
+            columns, grouping = "metric, ts, value", ""
+        connection = self._connect()
+        try:
+            samples = {}
+            for name in self._partitions_between(connection, start, end):
+                for metric, ts, value in connection.execute(
+                    f"SELECT {columns} FROM {name} "
+                    "WHERE server = :server AND ts BETWEEN :start AND :end" + grouping,
+                    {"server": server_name, "start": start, "end": end, "res": resolution},
+                ):
+                    samples.setdefault(ts, {})[metric] = value
+            return sorted(samples.items())
+        finally:
+            connection.close()
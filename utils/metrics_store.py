@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: metrics_store.py
+# Project: SSH-Sentinel
+# File Created: Sunday, 18th October 2026 12:41:26 pm
+# Author: Daniel Rodríguez Cabrera (daniel8rc@gmail.com)
+# Version: 1.0.0
+# -----
+# Last Modified: Sunday, 18th October 2026 12:41:26 pm
+# Modified By: Daniel Rodríguez Cabrera
+# -----
+# Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
+###
+import bisect
+import threading
+import time
+from array import array
+from loguru import logger
+
+# Métricas que se guardan por servidor (columnas de cada serie)
+METRICS = ("load_1", "load_5", "cpu", "mem_used", "mem_percent")
+
+# (resolución en segundos, capacidad): 1 h a 1 s, 24 h a 1 min y 7 días a 1 h
+DEFAULT_TIERS = ((1, 3600), (60, 1440), (3600, 168))
+
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+
+def metrics_from_info(info):
+    """
+    Valores de METRICS a partir de una muestra de SystemInfo.
+    """
+    total = info.get("total_memory") or 0
+    used = info.get("used_memory") or 0
+    cpu = info.get("cpu_percent")
+    return (
+        info["load_average"]["1min"],
+        info["load_average"]["5min"],
+        float("nan") if cpu is None else cpu,
+        used,
+        100.0 * used / total if total else 0.0,
+    )
+
+
+class RingSeries:
+    """
+    Serie temporal de tamaño fijo con una columna `array` por métrica.
+    """
+
+    def __init__(self, capacity, metrics=METRICS):
+        self.capacity = capacity
+        self.metrics = metrics
+        self.timestamps = array("d", bytes(8 * capacity))
+        self.columns = [array("f", bytes(4 * capacity)) for _ in metrics]
+        self.head = 0  # Próxima posición de escritura
+        self.count = 0
+
+    def append(self, timestamp, values):
+        position = self.head
+        self.timestamps[position] = timestamp
+        for column, value in zip(self.columns, values):
+            column[position] = value
+        self.head = (position + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def _positions(self):
+        start = (self.head - self.count) % self.capacity
+        if start + self.count <= self.capacity:
+            return [(start, start + self.count)]
+        return [(start, self.capacity), (0, self.head)]
+
+    def since(self, timestamp, metric):
+        """
+        (marcas de tiempo, valores) de una métrica a partir de `timestamp`.
+        """
+        index = self.metrics.index(metric)
+        times, values = [], []
+        for start, end in self._positions():
+            times.extend(self.timestamps[start:end])
+            values.extend(self.columns[index][start:end])
+        # Las marcas de tiempo son crecientes: se recorta por la izquierda
+        first = bisect.bisect_left(times, timestamp)
+        return times[first:], values[first:]
+
+    def nbytes(self):
+        return self.timestamps.itemsize * self.capacity + sum(
+            column.itemsize * self.capacity for column in self.columns
+        )
+
+
+class DownsampleTier:
+    """
+    Nivel de resolución fija: acumula las muestras de cada intervalo y guarda su media.
+    """
+
+    def __init__(self, resolution, capacity, metrics=METRICS):
+        self.resolution = resolution
+        self.series = RingSeries(capacity, metrics)
+        self._bucket = None
+        self._sums = [0.0] * len(metrics)
+        self._counts = [0] * len(metrics)
+
+    @property
+    def span(self):
+        return self.resolution * self.series.capacity
+
+    def add(self, timestamp, values):
+        bucket = int(timestamp // self.resolution)
+        if self._bucket is not None and bucket != self._bucket:
+            self._flush()
+        self._bucket = bucket
+        for i, value in enumerate(values):
+            if value == value:  # Ignora NaN (métrica sin dato)
+                self._sums[i] += value
+                self._counts[i] += 1
+
+    def _pending(self):
+        return [
+            total / count if count else float("nan")
+            for total, count in zip(self._sums, self._counts)
+        ]
+
+    def _flush(self):
+        self.series.append(self._bucket * self.resolution, self._pending())
+        self._sums = [0.0] * len(self._sums)
+        self._counts = [0] * len(self._counts)
+
+    def since(self, timestamp, metric):
+        times, values = self.series.since(timestamp, metric)
+        if self._bucket is not None and any(self._counts):
+            # El intervalo en curso también cuenta
+            times.append(self._bucket * self.resolution)
+            values.append(self._pending()[self.series.metrics.index(metric)])
+        return times, values
+
+
+class HostMetrics:
+    """
+    Historial de métricas de un servidor en varios niveles de resolución.
+    """
+
+    def __init__(self, tiers=DEFAULT_TIERS, metrics=METRICS):
+        self.tiers = [DownsampleTier(res, cap, metrics) for res, cap in tiers]
+        self.last_timestamp = None
+
+    def add(self, timestamp, values):
+        for tier in self.tiers:
+            tier.add(timestamp, values)
+        self.last_timestamp = timestamp
+
+    def series(self, metric, seconds, now=None):
+        """
+        Serie de los últimos `seconds` segundos con el nivel más fino que la cubre.
+        """
+        now = time.time() if now is None else now
+        tier = next((t for t in self.tiers if t.span >= seconds), self.tiers[-1])
+        return tier.since(now - seconds, metric)
+
+    def nbytes(self):
+        return sum(tier.series.nbytes() for tier in self.tiers)
+
+
+class MetricsStore:
+    """
+    Almacén en memoria de métricas por servidor con memoria acotada.
+
+    Cada servidor ocupa un tamaño fijo (unos 145 kB con los niveles por
+    defecto), así que 200 servidores durante 24 horas se quedan en ~29 MB.
+    Con un MetricsHistory las muestras se guardan también en disco y el
+    historial de un servidor se recupera de allí la primera vez que aparece.
+    """
+
+    def __init__(self, tiers=DEFAULT_TIERS, history=None):
+        self.tiers = tiers
+        self.history = history
+        self.hosts = {}
+        self._lock = threading.Lock()
+
+    def _load_host(self, server_name, now):
+        """
+        Historial del servidor reconstruido desde disco, un nivel cada vez.
+        """
+        host = HostMetrics(self.tiers)
+        if self.history is None:
+            return host
+        nan = float("nan")
+        try:
+            for tier in host.tiers:
+                # La media por intervalo se calcula en SQLite: cada nivel recibe
+                # como mucho una fila por intervalo en lugar de todas las muestras
+                for timestamp, metrics in self.history.query_samples(
+                    server_name, now - tier.span, now, resolution=tier.resolution
+                ):
+                    tier.add(timestamp, [metrics.get(metric, nan) for metric in METRICS])
+                    host.last_timestamp = timestamp
+        except Exception as e:
+            logger.error(f"No se pudo leer el historial de {server_name}: {e}")
+            return HostMetrics(self.tiers)
+        return host
+
+    def record(self, server_name, info, timestamp=None):
+        """
+        Añade una muestra de SystemInfo al historial del servidor.
+        """
+        if info is None:
+            return
+        timestamp = time.time() if timestamp is None else timestamp
+        values = metrics_from_info(info)
+        if server_name not in self.hosts:
+            # La lectura de disco se hace fuera del cerrojo
+            loaded = self._load_host(server_name, timestamp)
+            with self._lock:
+                self.hosts.setdefault(server_name, loaded)
+        with self._lock:
+            self.hosts[server_name].add(timestamp, values)
+        if self.history is not None:
+            self.history.write(server_name, timestamp, dict(zip(METRICS, values)))
+
+    def series(self, server_name, metric, seconds=600):
+        with self._lock:
+            host = self.hosts.get(server_name)
+            if host is None:
+                return [], []
+            return host.series(metric, seconds)
+
+    def nbytes(self):
+        with self._lock:
+            return sum(host.nbytes() for host in self.hosts.values())
+
+
+def sparkline(values, width=60, low=None, high=None):
+    """
+    Representa los valores como una línea de bloques Unicode de `width` caracteres.
+    """
+    values = [value for value in values if value == value]
+    if not values:
+        return ""
+    if len(values) > width:
+        # Media por tramo para ajustar al ancho disponible
+        step = len(values) / width
+        values = [
+            sum(chunk) / len(chunk)
+            for chunk in (
+                values[int(i * step) : max(int((i + 1) * step), int(i * step) + 1)]
+                for i in range(width)
+            )
+        ]
+    low = min(values) if low is None else low
+    high = max(values) if high is None else high
+    scale = (len(SPARK_CHARS) - 1) / (high - low) if high > low else 0
+    return "".join(
+        SPARK_CHARS[max(0, min(len(SPARK_CHARS) - 1, int((value - low) * scale)))]
+        for value in values
+    )
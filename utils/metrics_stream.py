@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: metrics_stream.py
+# Project: SSH-Sentinel
+# File Created: Sunday, 18th October 2026 11:40:05 am
+# Author: Daniel Rodríguez Cabrera (daniel8rc@gmail.com)
+# Version: 1.0.0
+# -----
+# Last Modified: Sunday, 18th October 2026 11:40:05 am
+# Modified By: Daniel Rodríguez Cabrera
+# -----
+# Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
+###
+import shlex
+import socket
+import threading
+from loguru import logger
+
+# Claves de los registros y su origen en /proc
+METRIC_KEYS = (
+    "up",  # /proc/uptime (segundos)
+    "l1", "l5", "l15", "pr", "pt",  # /proc/loadavg
+    "mt", "mf", "ma", "bu", "ca", "st", "sf",  # /proc/meminfo (kB)
+    "cu", "cn", "cs", "ci", "cw", "cq", "cx", "cst",  # /proc/stat (jiffies)
+)
+
+# Contadores monótonos: se envían como diferencia respecto a la muestra anterior
+COUNTER_KEYS = ("up", "cu", "cn", "cs", "ci", "cw", "cq", "cx", "cst")
+
+MEMINFO_KEYS = {
+    "MemTotal": "mt",
+    "MemFree": "mf",
+    "MemAvailable": "ma",
+    "Buffers": "bu",
+    "Cached": "ca",
+    "SwapTotal": "st",
+    "SwapFree": "sf",
+}
+
+# Programa awk remoto: agrupa cada muestra y emite solo lo que ha cambiado.
+# "#" marca un registro completo (clave=valor) y "@" uno incremental, donde
+# los contadores viajan como clave+delta y el resto solo si cambian.
+_AWK_PROGRAM = r"""
+BEGIN {
+    nk = split("%(keys)s", keys, " ")
+    split("%(counters)s", tmp, " "); for (i in tmp) counter[tmp[i]] = 1
+    %(meminfo)s
+    full = 1
+}
+$0 == "@@" {
+    line = full ? "#" : "@"
+    for (i = 1; i <= nk; i++) {
+        k = keys[i]
+        if (!(k in cur)) continue
+        v = cur[k]
+        if (full) line = line " " k "=" v
+        else if (k in counter) {
+            d = v - prev[k]
+            if (d != 0) line = line " " k "+" (d == int(d) ? d : sprintf("%%.2f", d))
+        }
+        else if (v != prev[k]) line = line " " k "=" v
+        prev[k] = v
+    }
+    print line; fflush()
+    count++; full = (count %% K == 0)
+    n = 0; delete cur
+    next
+}
+{ n++ }
+n == 1 { cur["up"] = $1; next }
+n == 2 { cur["l1"] = $1; cur["l5"] = $2; cur["l15"] = $3
+         split($4, p, "/"); cur["pr"] = p[1]; cur["pt"] = p[2]; next }
+$1 in mem { cur[mem[$1]] = $2; next }
+$1 == "cpu" { cur["cu"] = $2; cur["cn"] = $3; cur["cs"] = $4; cur["ci"] = $5
+              cur["cw"] = $6; cur["cq"] = $7; cur["cx"] = $8; cur["cst"] = $9 }
+"""
+
+
+def build_sampler_command(interval=1.0, keyframe_every=60):
+    """
+    Bucle remoto que muestrea /proc cada `interval` segundos y lo codifica por deltas.
+    """
+    program = _AWK_PROGRAM % {
+        "keys": " ".join(METRIC_KEYS),
+        "counters": " ".join(COUNTER_KEYS),
+        "meminfo": "; ".join(
+            f'mem["{name}:"] = "{key}"' for name, key in MEMINFO_KEYS.items()
+        ),
+    }
+    return (
+        "while :; do cat /proc/uptime /proc/loadavg /proc/meminfo /proc/stat 2>/dev/null; "
+        f"echo @@; sleep {interval}; done | awk -v K={int(keyframe_every)} {shlex.quote(program)}"
+    )
+
+
+class MetricsDecoder:
+    """
+    Reconstruye las muestras completas a partir de los registros delta.
+    """
+
+    def __init__(self):
+        self.state = None
+
+    def feed(self, line):
+        """
+        Procesa un registro y devuelve el estado completo (o None si aún no hay).
+        """
+        kind, _, body = line.strip().partition(" ")
+        if kind == "#":
+            self.state = {}
+        elif kind != "@" or self.state is None:
+            # Registro desconocido o incremental sin un completo previo
+            return None
+
+        for item in body.split():
+            if "+" in item:
+                key, _, delta = item.partition("+")
+                self.state[key] = self.state.get(key, 0) + float(delta)
+            else:
+                key, _, value = item.partition("=")
+                self.state[key] = float(value)
+        return dict(self.state)
+
+
+class MetricsStreamer:
+    """
+    Muestreo continuo de métricas de un servidor sobre un único canal.
+
+    En lugar de abrir un canal por sondeo y reenviar /proc/meminfo entero, un
+    bucle remoto muestrea a la frecuencia configurada y solo envía registros
+    compactos con los valores que han cambiado. Se reconecta solo si el canal
+    se cae.
+    """
+
+    def __init__(
+        self, ssh_manager, server, on_sample, interval=1.0, keyframe_every=60
+    ):
+        self.ssh_manager = ssh_manager
+        self.server = server
+        self.on_sample = on_sample
+        self.command = build_sampler_command(interval, keyframe_every)
+
+        self.bytes_received = 0
+        self.samples = 0
+        self._stop = threading.Event()
+        self._channel = None
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+        if self._channel is not None:
+            self._channel.close()
+
+    @property
+    def bytes_per_sample(self):
+        return self.bytes_received / self.samples if self.samples else 0.0
+
+    def _run(self):
+        delay = 1
+        while not self._stop.is_set():
+            try:
+                self._stream()
+                delay = 1
+            except Exception as e:
+                logger.error(f"Muestreo de métricas interrumpido en {self.server['name']}: {e}")
+            if self._stop.wait(delay):
+                break
+            delay = min(delay * 2, 60)
+
+    def _stream(self):
+        stdin, stdout, stderr = self.ssh_manager.open_stream(self.server, self.command)
+        self._channel = stdout.channel
+        self._channel.settimeout(1.0)
+        decoder = MetricsDecoder()
+        carry = b""
+        try:
+            while not self._stop.is_set():
+                try:
+                    data = self._channel.recv(65536)
+                except socket.timeout:
+                    continue
+                if not data:
+                    return
+                self.bytes_received += len(data)
+                lines = (carry + data).split(b"\n")
+                carry = lines.pop()
+                for line in lines:
+                    state = decoder.feed(line.decode(errors="replace"))
+                    if state is not None:
+                        self.samples += 1
+                        self.on_sample(state)
+        finally:
+            self._channel.close()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: scheduler.py
+# Project: SSH-Sentinel
+# File Created: Sunday, 18th October 2026 10:52:18 am
+# Author: Daniel Rodríguez Cabrera (daniel8rc@gmail.com)
+# Version: 1.0.0
+# -----
+# Last Modified: Sunday, 18th October 2026 10:52:18 am
+# Modified By: Daniel Rodríguez Cabrera
+# -----
+# Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
+###
+import heapq
+import itertools
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from loguru import logger
+
+# Tamaño por defecto de los grupos de hilos con nombre propio
+DEFAULT_POOL_SIZES = {"fleet": 16}
+
+
+def bind_destroy(widget, callback):
+    """
+    Llama a `callback` cuando se destruye el widget (no sus hijos).
+    """
+    import tkinter
+
+    def on_destroy(event):
+        if event.widget is widget:
+            callback()
+
+    # Se usa el bind de tkinter: el de customtkinter lo redirige a su canvas interno
+    tkinter.Misc.bind(widget, "<Destroy>", on_destroy, "+")
+
+
+class Subscription:
+    """
+    Suscripción a un trabajo periódico. Cancelarla no afecta al resto de suscriptores.
+    """
+
+    def __init__(self, scheduler, key, callback, on_error):
+        self.scheduler = scheduler
+        self.key = key
+        self.callback = callback
+        self.on_error = on_error
+        self.cancelled = False
+
+    def cancel(self):
+        if not self.cancelled:
+            self.cancelled = True
+            self.scheduler._unsubscribe(self)
+
+
+class PollJob:
+    """
+    Trabajo periódico compartido por todos los suscriptores con la misma clave.
+    """
+
+    def __init__(self, key, func, interval, jitter, pool):
+        self.key = key
+        self.func = func
+        self.interval = interval
+        self.jitter = jitter
+        self.pool = pool
+        self.subscribers = []
+        self.running = False
+        self.runs = 0
+        self.next_run = 0.0
+
+
+class PollScheduler:
+    """
+    Planificador central de los sondeos periódicos de la aplicación.
+
+    Un único hilo temporizador reparte los trabajos vencidos entre un
+    conjunto acotado de hilos de trabajo. Los trabajos con la misma clave se
+    agrupan (se ejecutan una vez y el resultado llega a todos los
+    suscriptores), cada métrica tiene su propio intervalo, se añade jitter
+    para no sincronizar los sondeos de muchos servidores y los trabajos sin
+    suscriptores desaparecen solos.
+    """
+
+    def __init__(
+        self,
+        max_workers=8,
+        intervals=None,
+        default_interval=5,
+        jitter=0.1,
+        pool_sizes=None,
+    ):
+        self.max_workers = max_workers
+        self.pool_sizes = {**DEFAULT_POOL_SIZES, **(pool_sizes or {})}
+        self.intervals = dict(intervals or {})
+        self.default_interval = default_interval
+        self.jitter = jitter
+
+        self._jobs = {}
+        self._heap = []
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._pools = {}
+        self._timer = threading.Thread(target=self._timer_loop, daemon=True)
+        self._timer.start()
+
+    def interval_for(self, metric):
+        return self.intervals.get(metric, self.default_interval)
+
+    def _get_pool(self, name):
+        pool = self._pools.get(name)
+        if pool is None:
+            size = self.pool_sizes.get(name, self.max_workers)
+            pool = ThreadPoolExecutor(max_workers=size, thread_name_prefix=f"poll-{name}")
+            self._pools[name] = pool
+        return pool
+
+    def schedule(
+        self,
+        key,
+        func,
+        callback,
+        metric=None,
+        interval=None,
+        jitter=None,
+        on_error=None,
+        owner=None,
+        pool="default",
+    ):
+        """
+        Ejecuta `func()` periódicamente y entrega el resultado a `callback`.
+
+        `callback` y `on_error` se llaman desde un hilo de trabajo. Si se
+        indica `owner` (un widget), la suscripción se cancela al destruirlo.
+        """
+        if interval is None:
+            interval = self.interval_for(metric)
+        if jitter is None:
+            jitter = self.jitter
+
+        subscription = Subscription(self, key, callback, on_error)
+        with self._cond:
+            job = self._jobs.get(key)
+            if job is None:
+                job = PollJob(key, func, interval, jitter, pool)
+                self._jobs[key] = job
+                # Primera ejecución inmediata, desplazada un poco para repartir la carga
+                self._push(job, time.monotonic() + random.uniform(0, interval * jitter))
+            else:
+                job.interval = min(job.interval, interval)
+            job.subscribers.append(subscription)
+
+        if owner is not None:
+            bind_destroy(owner, subscription.cancel)
+        return subscription
+
+    def _push(self, job, when):
+        job.next_run = when
+        heapq.heappush(self._heap, (when, next(self._counter), job))
+        self._cond.notify()
+
+    def _unsubscribe(self, subscription):
+        with self._cond:
+            job = self._jobs.get(subscription.key)
+            if job is None:
+                return
+            if subscription in job.subscribers:
+                job.subscribers.remove(subscription)
+            if not job.subscribers:
+                del self._jobs[subscription.key]
+                logger.debug(f"Trabajo {subscription.key} cancelado")
+
+    def _timer_loop(self):
+        while True:
+            with self._cond:
+                while not self._heap or self._heap[0][0] > time.monotonic():
+                    timeout = self._heap[0][0] - time.monotonic() if self._heap else None
+                    self._cond.wait(timeout)
+                when, _, job = heapq.heappop(self._heap)
+                if self._jobs.get(job.key) is not job or when != job.next_run:
+                    continue  # Cancelado o entrada obsoleta
+                if job.running:
+                    # Al terminar la ejecución en curso se vuelve a programar
+                    continue
+                job.running = True
+            self._get_pool(job.pool).submit(self._run_job, job)
+
+    def _run_job(self, job):
+        result, error = None, None
+        try:
+            result = job.func()
+        except Exception as e:
+            error = e
+        finally:
+            with self._cond:
+                job.running = False
+                job.runs += 1
+                subscribers = list(job.subscribers)
+                if self._jobs.get(job.key) is job:
+                    delay = job.interval * (1 + random.uniform(-job.jitter, job.jitter))
+                    self._push(job, time.monotonic() + delay)
+
+        for subscription in subscribers:
+            if subscription.cancelled:
+                continue
+            try:
+                if error is None:
+                    subscription.callback(result)
+                elif subscription.on_error is not None:
+                    subscription.on_error(error)
+            except Exception as e:
+                logger.error(f"Error en el suscriptor de {job.key}: {e}")
+        if error is not None and not any(s.on_error for s in subscribers):
+            logger.error(f"Error en el trabajo {job.key}: {error}")
+
+    def stats(self):
+        """
+        Número de trabajos, suscriptores e hilos activos.
+        """
+        with self._cond:
+            jobs = list(self._jobs.values())
+        return {
+            "jobs": len(jobs),
+            "subscribers": sum(len(job.subscribers) for job in jobs),
+            "running": sum(1 for job in jobs if job.running),
+            "workers": sum(len(pool._threads) for pool in list(self._pools.values())),
+            "threads": threading.active_count(),
+        }
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: shell_session.py
+# Project: SSH-Sentinel
+# File Created: Sunday, 18th October 2026 9:31:40 am
+# Author: Daniel Rodríguez Cabrera (daniel8rc@gmail.com)
+# Version: 1.0.0
+# -----
+# Last Modified: Sunday, 18th October 2026 9:31:40 am
+# Modified By: Daniel Rodríguez Cabrera
+# -----
+# Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
+###
+import collections
+import threading
+import uuid
+from loguru import logger
+
+MARKER_PREFIX = b"__SSHS_"
+
+
+class SessionUnavailable(ConnectionError):
+    """
+    La sesión no acepta comandos: el comando no se ha llegado a enviar.
+    """
+
+
+class PendingCommand:
+    """
+    Comando enviado a la sesión a la espera de su respuesta.
+    """
+
+    def __init__(self, token):
+        self.token = token
+        self.marker = b"\n" + MARKER_PREFIX + token.encode() + b" "
+        self.done = threading.Event()
+        self.output = None
+        self.exit_status = None
+        self.error = None
+
+
+class RemoteShellSession:
+    """
+    Shell remota de larga duración que ejecuta comandos enmarcados.
+
+    Cada comando se envía seguido de un centinela único que imprime su código
+    de salida; el hilo lector separa las respuestas buscando esos centinelas.
+    Los comandos se ejecutan en orden dentro del mismo proceso de shell (sin
+    abrir canal ni lanzar una shell nueva), pueden encadenarse sin esperar a
+    la respuesta anterior y comparten estado (cd, variables). La salida de
+    error se descarta.
+    """
+
+    def __init__(self, stdin, stdout, name=""):
+        self.stdin = stdin
+        self.stdout = stdout
+        self.name = name
+        self.closed = False
+        self._pending = collections.deque()
+        self._write_lock = threading.Lock()
+        self._buffer = b""
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._reader.start()
+
+    @property
+    def channel(self):
+        return self.stdout.channel
+
+    def is_alive(self):
+        return not self.closed and not self.channel.closed
+
+    def run(self, command, timeout=30):
+        """
+        Ejecuta un comando y devuelve (exit_status, stdout).
+
+        Lanza SessionUnavailable si la sesión ya estaba cerrada y el comando
+        no se ha enviado; cualquier otro error llega con el comando ya
+        escrito en la shell, que pudo ejecutarlo.
+        """
+        pending = PendingCommand(uuid.uuid4().hex)
+        framed = (
+            f"{{ {command}\n}} </dev/null 2>/dev/null; "
+            f"printf '\\n%s %d\\n' '{MARKER_PREFIX.decode()}{pending.token}' $?\n"
+        )
+        with self._write_lock:
+            if not self.is_alive():
+                raise SessionUnavailable(f"Sesión de shell cerrada en {self.name}")
+            self._pending.append(pending)
+            self.stdin.write(framed)
+            self.stdin.flush()
+
+        if not pending.done.wait(timeout):
+            # Un comando colgado bloquearía a todos los siguientes
+            self.close()
+            raise TimeoutError(f"Timeout en la sesión de shell de {self.name}: {command}")
+        if pending.error:
+            raise pending.error
+        return pending.exit_status, pending.output.decode(errors="replace")
+
+    def _read_loop(self):
+        try:
+            while True:
+                data = self.channel.recv(65536)
+                if not data:
+                    break
+                self._buffer += data
+                self._dispatch()
+        except Exception as e:
+            logger.error(f"Error leyendo la sesión de shell de {self.name}: {e}")
+        self.close()
+
+    def _dispatch(self):
+        """
+        Resuelve los comandos cuyo centinela ya ha llegado completo.
+        """
+        while self._pending:
+            pending = self._pending[0]
+            # El centinela va precedido de un salto de línea propio
+            start = (b"\n" + self._buffer).find(pending.marker)
+            if start < 0:
+                return
+            end = self._buffer.find(b"\n", start + len(pending.marker) - 1)
+            if end < 0:
+                return
+            status = self._buffer[start + len(pending.marker) - 1 : end]
+            pending.output = self._buffer[: max(start - 1, 0)]
+            pending.exit_status = int(status or -1)
+            self._buffer = self._buffer[end + 1 :]
+            self._pending.popleft()
+            pending.done.set()
+
+    def close(self):
+        """
+        Cierra la sesión y hace fallar los comandos pendientes.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self.channel.close()
+        except Exception:
+            pass
+        while self._pending:
+            pending = self._pending.popleft()
+            pending.error = ConnectionError(f"Sesión de shell cerrada en {self.name}")
+            pending.done.set()
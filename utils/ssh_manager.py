@@ -13,36 +13,238 @@
 # Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
 ###
 import threading
+import time
+import weakref
 from loguru import logger
-import paramiko
+from utils.channel_scheduler import ChannelScheduler
+from utils.shell_session import RemoteShellSession, SessionUnavailable
+from utils.stream_reader import StreamReader
+
+
+class PooledConnection:
+    """
+    Conexión SSH del pool asociada a un servidor.
+    """
+
+    def __init__(self, server, max_sessions=10, stream_slots=4):
+        self.server = server
+        self.client = None
+        self.scheduler = ChannelScheduler(
+            server.get("max_sessions", max_sessions),
+            server.get("stream_slots", stream_slots),
+        )
+        self.lock = threading.Lock()
+        self.last_used = time.monotonic()
+        self.failures = 0
+        self.next_attempt = 0.0
+        # Canales abiertos sobre el transporte (para no desalojar conexiones en uso)
+        self.channels = weakref.WeakSet()
+        self.session = None
+        self.session_lock = threading.Lock()
+
+    @property
+    def transport(self):
+        return self.client.get_transport() if self.client else None
+
+    def is_alive(self):
+        """
+        Comprueba si el transporte sigue activo.
+        """
+        transport = self.transport
+        if transport is None or not transport.is_active():
+            return False
+        try:
+            # Mensaje SSH_MSG_IGNORE: detecta sockets muertos sin abrir canales
+            transport.send_ignore()
+        except Exception:
+            return False
+        return True
+
+    def has_open_channels(self):
+        return any(not channel.closed for channel in list(self.channels))
+
+    def close(self):
+        if self.session:
+            self.session.close()
+            self.session = None
+        if self.client:
+            try:
+                self.client.close()
+            except Exception:
+                pass
+        self.client = None
+        self.channels = weakref.WeakSet()
 
 
 class SSHConnectionManager:
     """
     Clase para manejar las conexiones SSH.
+
+    Mantiene un pool de conexiones por servidor: reutiliza el transporte
+    mientras siga vivo, envía keepalives, desaloja conexiones inactivas y
+    reconecta con backoff exponencial. Los canales de cada transporte se
+    reparten con un ChannelScheduler para no superar MaxSessions de sshd.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        keepalive_interval=30,
+        idle_timeout=600,
+        connect_timeout=10,
+        max_retries=3,
+        backoff_base=1.0,
+        backoff_max=60.0,
+        max_sessions=10,
+        stream_slots=4,
+        session_mode=False,
+    ):
+        self.keepalive_interval = keepalive_interval
+        self.idle_timeout = idle_timeout
+        self.connect_timeout = connect_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_sessions = max_sessions
+        self.stream_slots = stream_slots
+        self.session_mode = session_mode
+
         self.ssh_clients = {}
         self.current_server = None
+        self._lock = threading.Lock()
+        self._janitor = None
+        # Un único hilo lee los canales de streaming de todos los visores
+        self.stream_reader = StreamReader()
+
+    def _get_pooled(self, server):
+        with self._lock:
+            pooled = self.ssh_clients.get(server["name"])
+            if pooled is None:
+                pooled = PooledConnection(
+                    server, self.max_sessions, self.stream_slots
+                )
+                self.ssh_clients[server["name"]] = pooled
+            else:
+                # La configuración puede haberse recargado
+                pooled.server = server
+            return pooled
+
+    def _resolve_server(self, server):
+        """
+        Acepta un diccionario de servidor o su nombre.
+        """
+        if isinstance(server, dict):
+            return server
+        pooled = self.ssh_clients.get(server)
+        if pooled is None:
+            raise KeyError(f"Servidor desconocido: {server}")
+        return pooled.server
+
+    def _open(self, pooled):
+        """
+        Hace un intento de conexión y, si falla, fija el backoff del siguiente.
+
+        Se llama con `pooled.lock` tomado; las esperas las hace get_client fuera.
+        """
+        # paramiko se importa en la primera conexión, no al arrancar la aplicación
+        import paramiko
+
+        server = pooled.server
+        try:
+            logger.info(f"Conectando a {server['name']}...")
+            ssh = paramiko.SSHClient()
+            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            ssh.connect(
+                server["host"],
+                port=server.get("port", 22),
+                username=server["username"],
+                password=server.get("password"),
+                key_filename=server.get("key_filename"),
+                timeout=self.connect_timeout,
+            )
+            ssh.get_transport().set_keepalive(self.keepalive_interval)
+        except Exception:
+            pooled.failures += 1
+            delay = min(
+                self.backoff_base * (2 ** (pooled.failures - 1)), self.backoff_max
+            )
+            pooled.next_attempt = time.monotonic() + delay
+            raise
+        pooled.close()
+        pooled.client = ssh
+        pooled.failures = 0
+        pooled.next_attempt = 0.0
+        pooled.last_used = time.monotonic()
+        logger.info(f"Conectado a {server['name']}")
+        return ssh
+
+    def get_client(self, server):
+        """
+        Devuelve un cliente vivo para el servidor, conectando solo si hace falta.
+
+        Hasta `max_retries` intentos respetando el backoff tras fallos previos.
+        Las esperas se hacen sin el lock de la conexión, así que no bloquean a
+        quien solo consulta su estado; tras cada una se vuelve a comprobar por
+        si otro hilo ya conectó o acaba de fallar (y hay que esperar más).
+        """
+        pooled = self._get_pooled(self._resolve_server(server))
+        attempt, last_error = 0, None
+        while True:
+            wait = pooled.next_attempt - time.monotonic()
+            if wait > 0:
+                logger.debug(f"Esperando {wait:.1f}s antes de reconectar a {pooled.server['name']}")
+                time.sleep(wait)
+            with pooled.lock:
+                if pooled.client is not None and pooled.is_alive():
+                    pooled.last_used = time.monotonic()
+                    return pooled.client
+                if pooled.next_attempt > time.monotonic():
+                    continue  # Otro hilo falló mientras se esperaba
+                if pooled.client is not None:
+                    logger.warning(f"Transporte caído con {pooled.server['name']}, reconectando")
+                attempt += 1
+                try:
+                    client = self._open(pooled)
+                    break
+                except Exception as e:
+                    last_error = e
+                    logger.warning(
+                        f"Intento {attempt}/{self.max_retries} fallido para {pooled.server['name']}: {e}"
+                    )
+            if attempt >= self.max_retries:
+                raise ConnectionError(
+                    f"No se pudo conectar a {pooled.server['name']}: {last_error}"
+                )
+        self._start_janitor()
+        return client
+
+    def is_connected(self, server):
+        """
+        Indica si existe un transporte vivo para el servidor.
+        """
+        name = server["name"] if isinstance(server, dict) else server
+        pooled = self.ssh_clients.get(name)
+        return pooled is not None and pooled.client is not None and pooled.is_alive()
+
+    def retry_delay(self, server):
+        """
+        Segundos que faltan para poder reintentar la conexión tras un fallo (0 si ninguno).
+        """
+        name = server["name"] if isinstance(server, dict) else server
+        pooled = self.ssh_clients.get(name)
+        if pooled is None or self.is_connected(name):
+            return 0.0
+        return max(pooled.next_attempt - time.monotonic(), 0.0)
 
     def connect(self, server, on_success, on_failure):
         """
         Conecta al servidor SSH.
+
+        Si ya existe un transporte vivo lo reutiliza sin repetir el handshake.
         """
 
         def threaded_connect():
             try:
-                logger.info(f"Conectando a {server['name']}...")
-                ssh = paramiko.SSHClient()
-                ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                ssh.connect(
-                    server["host"],
-                    username=server["username"],
-                    password=server["password"],
-                )
-                self.ssh_clients[server["name"]] = ssh
-                logger.info(f"Conectado a {server['name']}")
+                self.get_client(server)
                 self.current_server = server
                 on_success()
             except Exception as e:
@@ -51,13 +253,176 @@ class SSHConnectionManager:
 
         threading.Thread(target=threaded_connect, daemon=True).start()
 
-    def execute_command(self, command):
+    def _exec_command(self, server, command, timeout=None):
         """
-        Ejecuta un comando en el servidor SSH actual.
+        Abre un canal exec sobre el transporte del pool.
         """
-        if self.current_server and self.current_server["name"] in self.ssh_clients:
-            ssh = self.ssh_clients[self.current_server["name"]]
-            return ssh.exec_command(command)
-        else:
-            logger.error("No hay conexión SSH disponible.")
+        import paramiko
+
+        server = self._resolve_server(server)
+        pooled = self._get_pooled(server)
+        client = self.get_client(server)
+        try:
+            stdin, stdout, stderr = client.exec_command(command, timeout=timeout)
+        except paramiko.ChannelException as e:
+            # El servidor rechazó el canal (p. ej. MaxSessions): el transporte sigue vivo
+            logger.error(
+                f"{server['name']} rechazó el canal ({e}); ocupación: {self.channel_occupancy(server)}"
+            )
+            raise
+        except paramiko.SSHException as e:
+            # El transporte murió entre la comprobación y la apertura del canal
+            logger.warning(f"Reintentando comando en {server['name']}: {e}")
+            with pooled.lock:
+                pooled.close()
+            stdin, stdout, stderr = self.get_client(server).exec_command(
+                command, timeout=timeout
+            )
+        pooled.channels.add(stdout.channel)
+        pooled.last_used = time.monotonic()
+        return stdin, stdout, stderr
+
+    def _get_session(self, server):
+        """
+        Devuelve la sesión de shell persistente del servidor, abriéndola si hace falta.
+        """
+        pooled = self._get_pooled(server)
+        with pooled.session_lock:
+            if pooled.session is None or not pooled.session.is_alive():
+                stdin, stdout, stderr = self.open_stream(server, "sh")
+                pooled.session = RemoteShellSession(stdin, stdout, server["name"])
+                logger.info(f"Sesión de shell persistente abierta en {server['name']}")
+            return pooled.session
+
+    def run_command(self, server, command, timeout=30, session=True):
+        """
+        Ejecuta un comando corto y devuelve (exit_status, stdout, stderr) como texto.
+
+        Los comandos cortos comparten un número limitado de canales por
+        transporte y esperan su turno en orden de llegada. En modo sesión se
+        envían a la shell persistente del servidor (stderr siempre vacío) y,
+        si la sesión no se puede abrir o ya estaba cerrada, se recurre a un
+        canal propio. Una vez enviado el comando no se repite por otro canal
+        aunque la sesión caiga. Con `session=False` se usa siempre un canal
+        propio, para acciones que necesitan stderr.
+        """
+        server = self._resolve_server(server)
+        if session and server.get("session_mode", self.session_mode):
+            try:
+                shell = self._get_session(server)
+            except Exception as e:
+                logger.warning(f"No se pudo abrir la sesión de shell en {server['name']}: {e}")
+            else:
+                try:
+                    exit_status, output = shell.run(command, timeout)
+                    return exit_status, output, ""
+                except SessionUnavailable as e:
+                    # El comando no llegó a enviarse: se puede usar otro canal
+                    logger.warning(f"Sesión de shell no disponible en {server['name']}: {e}")
+        scheduler = self._get_pooled(server).scheduler
+        if not scheduler.acquire_short(timeout):
+            raise TimeoutError(
+                f"Sin canales libres en {server['name']}: {scheduler.occupancy()}"
+            )
+        try:
+            stdin, stdout, stderr = self._exec_command(server, command, timeout=timeout)
+            stdin.close()
+            output = stdout.read().decode(errors="replace")
+            error = stderr.read().decode(errors="replace")
+            return stdout.channel.recv_exit_status(), output, error
+        finally:
+            scheduler.release_short()
+
+    def open_stream(self, server, command, timeout=30):
+        """
+        Abre un canal de larga duración (tail -f, journalctl -f...).
+
+        La plaza de streaming queda ocupada hasta que el llamante cierre el canal.
+        """
+        server = self._resolve_server(server)
+        scheduler = self._get_pooled(server).scheduler
+        if not scheduler.acquire_stream(timeout):
+            raise TimeoutError(
+                f"Sin plazas de streaming en {server['name']}: {scheduler.occupancy()}"
+            )
+        try:
+            stdin, stdout, stderr = self._exec_command(server, command)
+        except Exception:
+            scheduler.cancel_stream()
+            raise
+        scheduler.register_stream(stdout.channel)
+        return stdin, stdout, stderr
+
+    def execute_command(self, server, command):
+        """
+        Ejecuta un comando en el servidor indicado reutilizando su transporte.
+
+        El canal queda en manos del llamante, por lo que cuenta como streaming.
+        """
+        try:
+            return self.open_stream(server, command)
+        except Exception as e:
+            logger.error(f"No se pudo ejecutar el comando: {e}")
             return None, None, None
+
+    def channel_occupancy(self, server):
+        """
+        Ocupación de canales del servidor (ver ChannelScheduler.occupancy).
+        """
+        return self._get_pooled(self._resolve_server(server)).scheduler.occupancy()
+
+    def close(self, server):
+        """
+        Cierra la conexión de un servidor y la elimina del pool.
+        """
+        name = server["name"] if isinstance(server, dict) else server
+        with self._lock:
+            pooled = self.ssh_clients.pop(name, None)
+        if pooled:
+            with pooled.lock:
+                pooled.close()
+            logger.info(f"Conexión con {name} cerrada")
+
+    def close_all(self):
+        """
+        Cierra todas las conexiones del pool.
+        """
+        for name in list(self.ssh_clients):
+            self.close(name)
+
+    def evict_idle(self):
+        """
+        Cierra las conexiones sin canales abiertos que llevan demasiado tiempo sin usarse.
+        """
+        now = time.monotonic()
+        for name, pooled in list(self.ssh_clients.items()):
+            if pooled.client is None or not pooled.lock.acquire(blocking=False):
+                continue
+            try:
+                idle = now - pooled.last_used
+                if idle > self.idle_timeout and not pooled.has_open_channels():
+                    logger.info(f"Cerrando conexión inactiva con {name} ({idle:.0f}s)")
+                    pooled.close()
+                elif pooled.has_open_channels():
+                    pooled.last_used = now
+            finally:
+                pooled.lock.release()
+
+    def _start_janitor(self):
+        """
+        Arranca (una sola vez) el hilo que desaloja conexiones inactivas.
+        """
+        with self._lock:
+            if self._janitor is not None:
+                return
+
+            def janitor():
+                while True:
+                    time.sleep(max(self.idle_timeout / 4, 1))
+                    try:
+                        self.evict_idle()
+                    except Exception as e:
+                        logger.error(f"Error al desalojar conexiones inactivas: {e}")
+
+            self._janitor = threading.Thread(target=janitor, daemon=True)
+            self._janitor.start()
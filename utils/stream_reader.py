@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# File: stream_reader.py
+# Project: SSH-Sentinel
+# File Created: Sunday, 18th October 2026 10:31:52 pm
+# Author: Daniel Rodríguez Cabrera (daniel8rc@gmail.com)
+# Version: 1.0.0
+# -----
+# Last Modified: Sunday, 18th October 2026 10:31:52 pm
+# Modified By: Daniel Rodríguez Cabrera
+# -----
+# Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
+###
+import selectors
+import socket
+import threading
+from loguru import logger
+
+# Bytes que se piden en cada recv (el búfer de un canal de paramiko admite
+# hasta su ventana, 2 MiB por defecto)
+CHUNK_SIZE = 256 * 1024
+
+# Lecturas seguidas de un mismo canal antes de atender a los demás
+MAX_READS = 8
+
+# Una "línea" sin salto de línea más larga que esto se entrega cortada
+MAX_LINE_BYTES = 1024 * 1024
+
+
+class ReaderStream:
+    """
+    Canal registrado en un StreamReader.
+
+    Se cierra con `close()`, nunca directamente: paramiko cierra el
+    descriptor que vigila el hilo de lectura al cerrar el canal, así que
+    el cierre lo hace ese hilo después de dejar de vigilarlo.
+    """
+
+    def __init__(self, reader, channel, on_lines, on_close):
+        self.reader = reader
+        self.channel = channel
+        self.on_lines = on_lines
+        self.on_close = on_close
+        self.carry = b""  # Línea incompleta del último trozo
+        self.bytes_received = 0
+        self.registered = False  # Lo vigila el selector
+        self.closed = False
+
+    def close(self):
+        """
+        Deja de leer y cierra el canal (sin llamar a on_close).
+        """
+        if not self.closed:
+            self.closed = True
+            self.reader._request(self)
+
+    def _split(self, data, final=False):
+        """
+        Líneas completas de `data` (junto con lo pendiente) y los bytes que ocupan.
+        """
+        if self.carry:
+            data = self.carry + data
+        cut = len(data) if final else data.rfind(b"\n") + 1
+        if not cut and len(data) > MAX_LINE_BYTES:
+            cut = len(data)
+        self.carry = data[cut:]
+        if not cut:
+            return [], 0
+        lines = data[:cut].decode("utf-8", errors="replace").split("\n")
+        if lines[-1] == "":
+            lines.pop()  # Lo que sigue al último salto de línea
+        return lines, cut
+
+
+class StreamReader:
+    """
+    Lee todos los canales de streaming de los visores desde un único hilo.
+
+    El hilo espera con un selector a que algún canal tenga datos, sin
+    sondeos ni esperas fijas, y pide trozos grandes con recv(): cada trozo
+    se decodifica y se parte en líneas de una vez, guardando la última si
+    está incompleta para unirla al trozo siguiente. `on_lines(lines, size)`
+    recibe las líneas completas (sin el salto de línea) y los bytes que
+    ocupaban; `on_close()` se llama cuando el comando remoto termina o se
+    pierde la conexión. Ambas se ejecutan en el hilo de lectura, así que
+    deben ser rápidas y no tocar la interfaz directamente.
+
+    El hilo se arranca con el primer canal y se queda esperando sin coste
+    mientras no hay ninguno.
+    """
+
+    def __init__(self, chunk_size=CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self._pending = []  # Altas y bajas que debe aplicar el hilo de lectura
+        self._lock = threading.Lock()
+        self._selector = selectors.DefaultSelector()
+        # Un par de sockets (también funciona en Windows) despierta al selector
+        self._wakeup, self._waker = socket.socketpair()
+        self._wakeup.setblocking(False)
+        self._waker.setblocking(False)
+        self._selector.register(self._wakeup, selectors.EVENT_READ)
+        self._thread = None
+        self.streams = 0
+
+    def add(self, channel, on_lines, on_close=None):
+        """
+        Empieza a leer un canal abierto con open_stream. Devuelve su ReaderStream.
+        """
+        stream = ReaderStream(self, channel, on_lines, on_close)
+        self._request(stream)
+        return stream
+
+    def _request(self, stream):
+        with self._lock:
+            self._pending.append(stream)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        try:
+            self._waker.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass  # Ya hay un aviso pendiente
+
+    def _apply_pending(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for stream in pending:
+            if stream.closed:
+                self._drop(stream)
+            elif not stream.registered:
+                try:
+                    # recv no debe bloquear nunca el hilo de lectura
+                    stream.channel.settimeout(0.0)
+                    self._selector.register(stream.channel, selectors.EVENT_READ, stream)
+                    stream.registered = True
+                    self.streams += 1
+                except (OSError, ValueError) as e:
+                    logger.error(f"No se pudo vigilar el canal: {e}")
+                    self._finish(stream)
+
+    def _drop(self, stream):
+        """
+        Deja de vigilar el canal y lo cierra.
+        """
+        if stream.registered:
+            # Antes de cerrar: el canal cierra el descriptor que se vigila
+            stream.registered = False
+            self.streams -= 1
+            try:
+                self._selector.unregister(stream.channel)
+            except (KeyError, ValueError, OSError):
+                pass
+        try:
+            stream.channel.close()
+        except Exception as e:
+            logger.debug(f"Error al cerrar el canal: {e}")
+
+    def _finish(self, stream):
+        """
+        El canal ha terminado: se entrega lo pendiente y se avisa al dueño.
+        """
+        self._drop(stream)
+        if stream.closed:
+            return
+        stream.closed = True
+        try:
+            lines, size = stream._split(b"", final=True)
+            if lines:
+                stream.on_lines(lines, size)
+            if stream.on_close is not None:
+                stream.on_close()
+        except Exception as e:
+            logger.error(f"Error al cerrar un stream: {e}")
+
+    def _run(self):
+        while True:
+            for key, events in self._selector.select():
+                if key.data is None:
+                    try:
+                        while self._wakeup.recv(4096):
+                            pass
+                    except (BlockingIOError, OSError):
+                        pass
+                    continue
+                stream = key.data
+                if not stream.closed:
+                    self._read(stream)
+            self._apply_pending()
+
+    def _read(self, stream):
+        channel = stream.channel
+        # La salida de error comparte el descriptor: si no se vacía, el
+        # selector lo daría siempre por listo
+        while channel.recv_stderr_ready():
+            error = channel.recv_stderr(self.chunk_size)
+            logger.debug(f"stderr del stream: {error.decode(errors='replace').strip()}")
+        for _ in range(MAX_READS):
+            try:
+                data = channel.recv(self.chunk_size)
+            except socket.timeout:
+                return  # Sin más datos por ahora
+            except Exception as e:
+                logger.error(f"Error al leer el stream: {e}")
+                self._finish(stream)
+                return
+            if not data:
+                # Fin del comando remoto o conexión perdida
+                self._finish(stream)
+                return
+            stream.bytes_received += len(data)
+            lines, size = stream._split(data)
+            if lines:
+                try:
+                    stream.on_lines(lines, size)
+                except Exception as e:
+                    logger.error(f"Error al procesar líneas del stream: {e}")
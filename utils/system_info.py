@@ -12,63 +12,171 @@
 # -----
 # Copyright (c) 2024 - 2025 daniel8rc@gmail.com copying, distribution or modification not authorised in writing is prohibited.
 ###
+import re
 from loguru import logger
 
+# Comando de sondeo: solo la primera línea de /proc/stat (CPU agregada)
+SYSTEM_INFO_COMMAND = "cat /proc/uptime /proc/meminfo /proc/loadavg; head -n1 /proc/stat"
+
+# Un único patrón recorre toda la salida de una pasada; cada alternativa
+# reconoce una de las líneas que interesan y el resto se ignoran.
+_SYSTEM_INFO_RE = re.compile(
+    r"^(?:"
+    r"(?P<mem_key>MemTotal|MemFree|MemAvailable|Buffers|Cached|SwapTotal|SwapFree):\s+(?P<mem_value>\d+)"
+    r"|(?P<load1>\d+\.\d+) (?P<load5>\d+\.\d+) (?P<load15>\d+\.\d+) (?P<running>\d+)/(?P<total>\d+) \d+$"
+    r"|(?P<uptime>\d+\.\d+) \d+\.\d+$"
+    r"|cpu +(?P<cpu>\d+(?: \d+){3,9})"
+    r")",
+    re.MULTILINE,
+)
+
+_MEMINFO_FIELDS = {
+    "MemTotal": "total_memory",
+    "MemFree": "unused_memory",
+    "MemAvailable": "free_memory",
+    "Buffers": "buffers",
+    "Cached": "cached",
+    "SwapTotal": "swap_total",
+    "SwapFree": "swap_free",
+}
+
+# Campos de tiempo de CPU de /proc/stat que cuentan como inactividad (idle, iowait)
+_CPU_IDLE_FIELDS = (3, 4)
+
 
 class SystemInfo:
     """
     Clase para parsear y obtener información del sistema desde los comandos SSH.
+
+    El análisis devuelve valores numéricos (memoria en bytes, carga, tiempos
+    de CPU en jiffies); el formateo para mostrar se hace aparte con
+    format_system_info. Una instancia recuerda la muestra anterior para
+    calcular el uso de CPU entre muestras.
     """
 
+    def __init__(self):
+        self.previous_cpu = None
+
     @logger.catch
     @staticmethod
     def parse_system_info(data):
-        import re
-
-        # Diccionario para almacenar las variables
-        variables = {}
-
-        # Procesar línea por línea
-        lines = data.split("\n")
-
-        # Expresión regular para capturar el nombre de la variable y el valor
-        regex = r"([\w\(\)/]+):\s+([\d\.]+)\s*(kB)?"
-
-        for line in lines:
-            # Parsear líneas con formato "Variable: Value kB"
-            match = re.match(regex, line)
-            if match:
-                var_name, value, unit = match.groups()
-                value = float(value)
-
-                # Convertir kB a MB o GB si aplica
-                if unit == "kB":
-                    if value >= 1_048_576:  # Convertir a GB
-                        value = value / 1_048_576
-                        variables[var_name] = f"{value:.2f} GB"
-                    elif value >= 1024:  # Convertir a MB
-                        value = value / 1024
-                        variables[var_name] = f"{value:.2f} MB"
-                    else:
-                        variables[var_name] = f"{value:.2f} kB"
-                else:
-                    variables[var_name] = value
-
-            elif re.match(r"^[\d\.]+\s[\d\.]+\s[\d\.]+\s\d+/\d+\s\d+$", line.strip()):
-                parts = line.split()
-                variables["LoadAvg1"] = float(parts[0])
-                variables["LoadAvg5"] = float(parts[1])
-                variables["LoadAvg15"] = float(parts[2])
-                variables["RunningProcesses"] = parts[3]
-                variables["LastPID"] = int(parts[4])
+        """
+        Analiza la salida de SYSTEM_INFO_COMMAND en una sola pasada.
+        """
+        info = {
+            "uptime": None,
+            "total_memory": 0,
+            "free_memory": 0,
+            "used_memory": 0,
+            "load_average": {"1min": 0.0, "5min": 0.0, "15min": 0.0},
+            "procs_running": 0,
+            "procs_total": 0,
+            "cpu_times": None,
+        }
+        for match in _SYSTEM_INFO_RE.finditer(data):
+            mem_key = match.group("mem_key")
+            if mem_key:
+                info[_MEMINFO_FIELDS[mem_key]] = int(match.group("mem_value")) * 1024
+            elif match.group("load1"):
+                info["load_average"] = {
+                    "1min": float(match.group("load1")),
+                    "5min": float(match.group("load5")),
+                    "15min": float(match.group("load15")),
+                }
+                info["procs_running"] = int(match.group("running"))
+                info["procs_total"] = int(match.group("total"))
+            elif match.group("uptime"):
+                info["uptime"] = float(match.group("uptime"))
+            else:
+                # guest y guest_nice ya están incluidos en user y nice
+                info["cpu_times"] = tuple(map(int, match.group("cpu").split()[:8]))
+
+        info["used_memory"] = max(info["total_memory"] - info["free_memory"], 0)
+        return info
 
+    @staticmethod
+    def from_sampler_state(state):
+        """
+        Construye el mismo resultado que parse_system_info a partir de una
+        muestra del muestreador continuo (memoria en kB, CPU en jiffies).
+        """
+        total = int(state.get("mt", 0)) * 1024
+        available = int(state.get("ma", 0)) * 1024
+        cpu_keys = ("cu", "cn", "cs", "ci", "cw", "cq", "cx", "cst")
         return {
-            "total_memory": variables.get("MemTotal", "0 GB"),
-            "free_memory": variables.get("MemAvailable", "0 GB"),
-            "used_memory": f"{float(variables.get('MemTotal', '0').split()[0]) - float(variables.get('MemAvailable', '0').split()[0]):.2f} GB",
+            "uptime": state.get("up"),
+            "total_memory": total,
+            "free_memory": available,
+            "used_memory": max(total - available, 0),
+            "unused_memory": int(state.get("mf", 0)) * 1024,
+            "buffers": int(state.get("bu", 0)) * 1024,
+            "cached": int(state.get("ca", 0)) * 1024,
+            "swap_total": int(state.get("st", 0)) * 1024,
+            "swap_free": int(state.get("sf", 0)) * 1024,
             "load_average": {
-                "1min": variables.get("LoadAvg1", 0),
-                "5min": variables.get("LoadAvg5", 0),
-                "15min": variables.get("LoadAvg15", 0),
+                "1min": state.get("l1", 0.0),
+                "5min": state.get("l5", 0.0),
+                "15min": state.get("l15", 0.0),
             },
+            "procs_running": int(state.get("pr", 0)),
+            "procs_total": int(state.get("pt", 0)),
+            "cpu_times": (
+                tuple(int(state[key]) for key in cpu_keys)
+                if all(key in state for key in cpu_keys)
+                else None
+            ),
+        }
+
+    @staticmethod
+    def cpu_utilization(previous, current):
+        """
+        Porcentaje de CPU ocupada entre dos lecturas de /proc/stat.
+        """
+        if not previous or not current:
+            return None
+        total = sum(current) - sum(previous)
+        if total <= 0:
+            return None
+        idle = sum(current[i] - previous[i] for i in _CPU_IDLE_FIELDS if i < len(current))
+        return max(0.0, min(100.0, 100.0 * (total - idle) / total))
+
+    def update(self, info):
+        """
+        Añade cpu_percent a una muestra ya analizada usando la muestra anterior.
+        """
+        if info is None:
+            return None
+        info["cpu_percent"] = self.cpu_utilization(self.previous_cpu, info["cpu_times"])
+        self.previous_cpu = info["cpu_times"]
+        return info
+
+    def sample(self, data):
+        """
+        Analiza la salida de SYSTEM_INFO_COMMAND y calcula el uso de CPU.
+        """
+        return self.update(SystemInfo.parse_system_info(data))
+
+    @staticmethod
+    def format_bytes(value):
+        """
+        Formatea una cantidad de bytes con la unidad más adecuada.
+        """
+        for unit in ("B", "kB", "MB", "GB"):
+            if value < 1024:
+                return f"{value:.2f} {unit}"
+            value /= 1024
+        return f"{value:.2f} TB"
+
+    @staticmethod
+    def format_system_info(info):
+        """
+        Versión legible de una muestra para mostrar en pantalla.
+        """
+        cpu = info.get("cpu_percent")
+        return {
+            "total_memory": SystemInfo.format_bytes(info["total_memory"]),
+            "free_memory": SystemInfo.format_bytes(info["free_memory"]),
+            "used_memory": SystemInfo.format_bytes(info["used_memory"]),
+            "load_average": dict(info["load_average"]),
+            "cpu": "N/D" if cpu is None else f"{cpu:.1f} %",
         }